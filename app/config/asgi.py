@@ -0,0 +1,21 @@
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+application = get_asgi_application()
+
+# 많이 사용되는 언어의 lexer 를 워커 시작시 미리 생성 (SNIPPETS_HIGHLIGHT_POOL['PREWARM'])
+from snippets.highlight import prewarm_highlight_pool  # noqa: E402
+
+prewarm_highlight_pool()
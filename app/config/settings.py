@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/2.0/ref/settings/
 """
 
 import os
+import tempfile
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -31,7 +32,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    'snippets',
+    'snippets.apps.SnippetsConfig',
 
     'django.contrib.admin',
     'django.contrib.auth',
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'snippets.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,6 +75,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 
 # Database
@@ -86,6 +89,23 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/2.0/ref/settings/#caches
+# default: 프로세스별 캐시 (하이라이트 토큰, 개수 등 프로세스마다 달라도 되는 값)
+# shared: 모든 워커 프로세스와 management 명령이 함께 사용하는 캐시 (응답 캐시의 무효화, 통계)
+#   여러 서버에서 실행할 때는 Redis, Memcached 등 서버 간에 공유되는 backend 로 변경
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(tempfile.gettempdir(), 'snippets-shared-cache'),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
 
@@ -123,3 +143,92 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/2.0/howto/static-files/
 
 STATIC_URL = '/static/'
+
+
+# Django REST framework
+# JSON 요청/응답은 orjson 이 설치되어 있으면 orjson 으로 처리 (출력은 JSONRenderer 와 같음)
+# (django_view 도 utils.renderers.get_json_renderer(), utils.parsers.get_json_parser() 로 같은 클래스를 사용)
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'utils.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+}
+
+
+# Snippets
+
+# 하이라이트 결과 캐시 (BACKEND: 'locmem', 'django', None)
+SNIPPETS_HIGHLIGHT_CACHE = {
+    'BACKEND': 'locmem',
+    'MAX_BYTES': 16 * 1024 * 1024,
+}
+
+# 재사용할 lexer 인스턴스 수, 워커 시작시 미리 생성할 lexer 수
+SNIPPETS_HIGHLIGHT_POOL = {
+    'MAX_SIZE': 64,
+    'PREWARM': 0,
+}
+
+# True 이면 Snippet 저장시 하이라이트하지 않고 pending 상태로 저장
+# (manage.py highlight_worker 가 백그라운드에서 처리)
+SNIPPETS_HIGHLIGHT_ASYNC = False
+
+# LANGUAGE_CHOICES, STYLE_CHOICES 캐시 파일을 저장할 경로 (None 이면 임시 디렉토리)
+SNIPPETS_CHOICES_CACHE_DIR = None
+
+# False 이면 snippets.models 를 import 할 때 모든 lexer, style 을 읽어서 choices 를 계산 (이전 방식)
+SNIPPETS_CHOICES_LAZY = True
+
+# 목록 count 에 사용할 캐시된 Snippet 개수 (여러 프로세스에서 공유하려면 공유되는 캐시를 사용)
+SNIPPETS_COUNT_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 5,
+}
+
+# SnippetViewSet, UserViewSet 의 list, retrieve 응답 캐시 (생성/수정/삭제시 관련된 응답만 무효화)
+# (무효화와 hit/miss 통계를 모든 프로세스가 공유해야 하므로 LocMemCache 이면 응답을 캐시하지 않음)
+SNIPPETS_RESPONSE_CACHE = {
+    'CACHE_ALIAS': 'shared',
+    'TIMEOUT': 60 * 5,
+}
+
+# 여러 Snippet 을 한 번에 생성/수정/삭제하는 bulk API
+# (트랜잭션당 Snippet 수, 요청당 최대 항목 수, 하이라이트 프로세스 풀 크기, 프로세스 풀을 사용할 최소 항목 수)
+SNIPPETS_BULK = {
+    'BATCH_SIZE': 500,
+    'MAX_ITEMS': 10000,
+    'WORKERS': None,
+    'MIN_PARALLEL': 64,
+}
+
+# Snippet 검색 backend ('fts5', 'database', BaseSearchBackend 를 상속한 클래스 경로, None 이면 DB 에 따라 선택)
+SNIPPETS_SEARCH = {
+    'BACKEND': None,
+}
+
+# SnippetViewSet.highlight 의 HTML 문서와 미리 압축한 gzip, br(brotli 가 설치된 경우) 문서 캐시
+# (압축하지 않을 최소 크기, gzip 압축 레벨, brotli 압축 품질)
+SNIPPETS_HIGHLIGHT_DOCUMENT = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+    'MIN_COMPRESS_SIZE': 512,
+    'GZIP_LEVEL': 9,
+    'BROTLI_QUALITY': 11,
+}
+
+# 요청별 처리 시간(전체, DB 쿼리, serializer, renderer, 하이라이트) 측정
+# (Server-Timing 헤더, route 별 히스토그램: manage.py performance_stats, /snippets/performance/stats.json)
+# (워커 프로세스들의 통계를 합산하고 performance_stats 명령에서 조회하므로 CACHE_ALIAS 는 공유되는 캐시여야 함)
+SNIPPETS_PERFORMANCE = {
+    'ENABLED': False,
+    'CACHE_ALIAS': 'shared',
+    'SERVER_TIMING': True,
+    'BUCKETS': (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+    'FLUSH_INTERVAL': 10,
+}
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# 많이 사용되는 언어의 lexer 를 워커 시작시 미리 생성 (SNIPPETS_HIGHLIGHT_POOL['PREWARM'])
+from snippets.highlight import prewarm_highlight_pool  # noqa: E402
+
+prewarm_highlight_pool()
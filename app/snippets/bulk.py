@@ -0,0 +1,147 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import reset_snippet_counts, update_owner_snippet_counts
+from .models import Snippet
+from .response_cache import invalidate_snippet_owners, invalidate_snippets
+from .search import get_search_backend
+from .worker import HIGHLIGHT_INPUT_FIELDS, highlight_many, highlight_shared
+
+__all__ = (
+    'bulk_create_snippets',
+    'bulk_update_snippets',
+    'bulk_delete_snippets',
+)
+
+DEFAULT_BULK = {
+    # 한 트랜잭션에서 쓰는 Snippet 수
+    'BATCH_SIZE': 500,
+    # 한 요청에 보낼 수 있는 최대 항목 수
+    'MAX_ITEMS': 10000,
+    # 하이라이트 프로세스 풀 크기 (None 이면 CPU 수, 0이면 현재 프로세스에서 처리)
+    # 프로세스 풀은 요청마다 만들지 않고 처음 사용할 때 만든 풀을 계속 사용함
+    'WORKERS': None,
+    # 렌더링할 항목이 이보다 적으면 프로세스 풀을 사용하지 않음
+    'MIN_PARALLEL': 64,
+}
+
+
+def get_bulk_options():
+    options = dict(DEFAULT_BULK)
+    options.update(getattr(settings, 'SNIPPETS_BULK', {}))
+    return options
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def highlight_snippets(snippets, options):
+    """
+    bulk_create, bulk_update 는 Snippet.save() 를 호출하지 않으므로 save() 와 같은 방식으로 하이라이트
+    """
+    if getattr(settings, 'SNIPPETS_HIGHLIGHT_ASYNC', False):
+        for snippet in snippets:
+            snippet.highlight_status = Snippet.HIGHLIGHT_PENDING
+        return
+
+    inputs = [{field: getattr(snippet, field) for field in HIGHLIGHT_INPUT_FIELDS} for snippet in snippets]
+    if options['WORKERS'] == 0 or len(inputs) < options['MIN_PARALLEL']:
+        results = highlight_many(inputs)
+    else:
+        results = highlight_shared(inputs, options['WORKERS'], min_parallel=options['MIN_PARALLEL'])
+    for snippet, (html, failed) in zip(snippets, results):
+        snippet.highlighted = html
+        snippet.highlight_status = Snippet.HIGHLIGHT_FAILED if failed else Snippet.HIGHLIGHT_DONE
+
+
+def bulk_create_snippets(items, owner):
+    """
+    검증된 데이터 list 로 owner 의 Snippet 을 생성
+        BATCH_SIZE 개씩 나누어 각각의 트랜잭션에서 bulk_create
+    :return: 생성된 Snippet list
+    """
+    options = get_bulk_options()
+    snippets = [Snippet(owner=owner, **item) for item in items]
+    highlight_snippets(snippets, options)
+
+    for chunk in chunks(snippets, options['BATCH_SIZE']):
+        with transaction.atomic():
+            Snippet.objects.bulk_create(chunk)
+            # bulk_create 는 signal 을 발생시키지 않으므로 검색 인덱스, 캐시된 개수와 응답을 직접 갱신
+            get_search_backend().index(chunk)
+            update_owner_snippet_counts({owner.pk: len(chunk)})
+            transaction.on_commit(partial(reset_snippet_counts, [owner.pk]))
+            transaction.on_commit(partial(invalidate_snippets, [snippet.pk for snippet in chunk], [owner.pk]))
+            transaction.on_commit(partial(invalidate_snippet_owners, [owner.pk]))
+    return snippets
+
+
+def bulk_update_snippets(items, owner):
+    """
+    (pk, 검증된 데이터) list 로 owner 의 Snippet 을 수정
+        하이라이트 입력(code, language, linenos)이 바뀐 Snippet 만 다시 하이라이트함
+    :return: pk 별 수정된 Snippet (owner 의 Snippet 이 아니거나 없으면 포함되지 않음)
+    """
+    options = get_bulk_options()
+    updated = {}
+    for chunk in chunks(items, options['BATCH_SIZE']):
+        with transaction.atomic():
+            instances = (
+                Snippet.objects
+                .select_for_update()
+                .filter(owner_id=owner.pk)
+                .in_bulk([pk for pk, data in chunk])
+            )
+            fields = {'version', 'modified'}
+            rehighlight = []
+            for pk, data in chunk:
+                snippet = instances.get(pk)
+                if snippet is None:
+                    continue
+                # owner 를 JOIN 하지 않고 조회했으므로 응답에 사용할 owner 를 지정
+                snippet.owner = owner
+                if any(field in data and data[field] != getattr(snippet, field)
+                       for field in HIGHLIGHT_INPUT_FIELDS):
+                    rehighlight.append(snippet)
+                for attr, value in data.items():
+                    setattr(snippet, attr, value)
+                fields.update(data)
+                # bulk_update 에는 auto_now 가 적용되지 않음
+                snippet.version += 1
+                snippet.modified = timezone.now()
+                updated[pk] = snippet
+
+            if rehighlight:
+                highlight_snippets(rehighlight, options)
+                fields.update(('highlighted', 'highlight_status'))
+            changed = [snippet for pk, snippet in instances.items() if pk in updated]
+            if changed:
+                Snippet.objects.bulk_update(changed, sorted(fields))
+                if fields & {'title', 'code'}:
+                    get_search_backend().index(changed)
+                transaction.on_commit(partial(
+                    invalidate_snippets, [snippet.pk for snippet in changed], [owner.pk],
+                ))
+    return updated
+
+
+def bulk_delete_snippets(pks, owner):
+    """
+    owner 의 Snippet 을 삭제 (삭제 signal 에서 검색 인덱스, 캐시된 개수와 응답이 갱신됨)
+        signal 에는 pk, owner_id 만 사용하므로 다른 컬럼은 조회하지 않음
+    :return: 삭제된 pk set
+    """
+    options = get_bulk_options()
+    deleted = set()
+    for chunk in chunks(pks, options['BATCH_SIZE']):
+        with transaction.atomic():
+            queryset = Snippet.objects.filter(owner_id=owner.pk, pk__in=chunk).only('owner')
+            chunk_pks = set(queryset.values_list('pk', flat=True))
+            queryset.delete()
+            deleted |= chunk_pks
+    return deleted
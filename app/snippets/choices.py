@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import pygments
+from django.conf import settings
+
+__all__ = (
+    'get_language_choices',
+    'get_style_choices',
+)
+
+
+def get_choices_cache_path():
+    """
+    설치된 Pygments 버전별로 만들어지는 choices 캐시 파일 경로
+    """
+    cache_dir = getattr(settings, 'SNIPPETS_CHOICES_CACHE_DIR', None) or tempfile.gettempdir()
+    return os.path.join(cache_dir, f'snippets-choices-pygments-{pygments.__version__}.json')
+
+
+def compute_choices():
+    """
+    Pygments 의 모든 lexer, style 플러그인을 읽어서 choices 를 계산 (느림)
+    """
+    from pygments.lexers import get_all_lexers
+    from pygments.styles import get_all_styles
+
+    lexers = [item for item in get_all_lexers() if item[1]]
+    return {
+        'languages': sorted([(item[1][0], item[0]) for item in lexers]),
+        'styles': sorted((item, item) for item in get_all_styles()),
+    }
+
+
+def _read_choices_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return {
+            'languages': [tuple(item) for item in data['languages']],
+            'styles': [tuple(item) for item in data['styles']],
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_choices_cache(path, choices):
+    # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 후 교체
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(choices, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+_eager_choices = None
+
+
+def load_eager_choices():
+    """
+    SNIPPETS_CHOICES_LAZY 가 False 이면 snippets.models 를 import 할 때 디스크 캐시 없이 choices 를 계산
+    (choices 를 지연 계산하기 전의 방식, bench_startup 의 기준값으로 사용)
+    """
+    global _eager_choices
+    _eager_choices = compute_choices()
+
+
+@lru_cache(maxsize=None)
+def load_choices():
+    """
+    디스크 캐시가 있으면 읽고, 없으면 계산해서 캐시 파일을 생성
+    """
+    if _eager_choices is not None:
+        return _eager_choices
+    path = get_choices_cache_path()
+    choices = _read_choices_cache(path)
+    if choices is None:
+        choices = compute_choices()
+        _write_choices_cache(path, choices)
+    return choices
+
+
+def get_language_choices():
+    return load_choices()['languages']
+
+
+def get_style_choices():
+    return load_choices()['styles']
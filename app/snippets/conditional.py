@@ -0,0 +1,82 @@
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from .models import Snippet
+
+__all__ = (
+    'snippet_condition',
+)
+
+
+def get_snippet_state(request, pk=None):
+    """
+    ETag, Last-Modified 계산에 필요한 값을 요청당 한 번의 쿼리로 조회
+        상세: (version, modified), 목록: (count, max(modified))
+        owner 가 수정되면 owner 의 Snippet 들의 modified 도 갱신되므로 (signals.user_saved) owner 정보는 조회하지 않음
+        목록의 count 는 max(modified) 가 바뀌지 않는 삭제를 감지하기 위해 사용하며,
+        프로세스마다 다를 수 있는 캐시된 개수가 아니라 max(modified) 와 같은 쿼리에서 DB 의 COUNT(*) 로 조회함
+        상세 요청에서 Snippet 이 없으면 None
+    """
+    if not hasattr(request, '_snippet_state'):
+        try:
+            pk = None if pk is None else int(pk)
+        except ValueError:
+            request._snippet_state = None
+            return None
+
+        if pk is None:
+            state = Snippet.objects.order_by().aggregate(count=Count('pk'), modified=Max('modified'))
+            request._snippet_state = (state['count'], state['modified'])
+        else:
+            request._snippet_state = (
+                Snippet.objects
+                .filter(pk=pk)
+                .values_list('version', 'modified')
+                .first()
+            )
+    return request._snippet_state
+
+
+def snippet_etag(request, pk=None, **kwargs):
+    state = get_snippet_state(request, pk)
+    if state is None:
+        return None
+    # ?fields=, 페이지, 필터 등 query string 에 따라 내용이 달라지므로 함께 사용
+    if pk is not None:
+        version, modified = state
+        value = f'{request.get_full_path()}|{version}|{modified.timestamp()}'
+    else:
+        count, modified = state
+        value = f'{request.get_full_path()}|{count}|{modified.timestamp() if modified else ""}'
+    return 'W/"%s"' % hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+def snippet_last_modified(request, pk=None, **kwargs):
+    # 목록은 Snippet 이 삭제되어도 max(modified) 가 바뀌지 않으므로 ETag 만 사용
+    if pk is None:
+        return None
+    state = get_snippet_state(request, pk)
+    return state[1] if state else None
+
+
+def snippet_condition(view):
+    """
+    Snippet 목록, 상세 view 에 조건부 GET(If-None-Match, If-Modified-Since)을 적용
+        변경되지 않았으면 serializer 를 실행하지 않고 304 를 리턴
+        view 의 URL kwargs 에 pk 가 있으면 상세, 없으면 목록으로 처리
+    """
+    conditional_view = condition(
+        etag_func=snippet_etag,
+        last_modified_func=snippet_last_modified,
+    )(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        # 쓰기 요청에는 ETag 계산을 위한 쿼리를 실행하지 않음
+        if request.method in ('GET', 'HEAD'):
+            return conditional_view(request, *args, **kwargs)
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Snippet, SnippetOwnerStats
+
+__all__ = (
+    'get_snippet_count',
+    'estimate_snippet_count',
+    'incr_snippet_count',
+    'reset_snippet_counts',
+    'update_owner_snippet_counts',
+)
+
+DEFAULT_COUNT_CACHE = {
+    'CACHE_ALIAS': 'default',
+    # 캐시된 개수가 DB와 달라지더라도 TIMEOUT 이 지나면 다시 계산됨
+    'TIMEOUT': 60 * 5,
+}
+
+KEY_PREFIX = 'snippets:count:'
+
+# DB별 테이블 행 수 추정값 조회 쿼리
+ESTIMATE_COUNT_QUERIES = {
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+    'mysql': (
+        'SELECT table_rows FROM information_schema.tables '
+        'WHERE table_schema = DATABASE() AND table_name = %s'
+    ),
+    # ANALYZE 로 생성된 통계 (stat 의 첫 번째 값이 테이블의 행 수)
+    'sqlite': 'SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+}
+
+
+def get_count_cache_options():
+    options = dict(DEFAULT_COUNT_CACHE)
+    options.update(getattr(settings, 'SNIPPETS_COUNT_CACHE', {}))
+    return options
+
+
+def get_count_cache():
+    return caches[get_count_cache_options()['CACHE_ALIAS']]
+
+
+def get_count_key(owner_id=None):
+    if owner_id is None:
+        return KEY_PREFIX + 'all'
+    return f'{KEY_PREFIX}owner:{owner_id}'
+
+
+def get_snippet_count(owner_id=None):
+    """
+    전체(owner_id 가 None) 또는 owner 별 Snippet 개수
+        캐시에 없을 때만 COUNT(*) 를 실행하고, 이후에는 생성/삭제 signal 에서 캐시된 값을 증감
+        여러 프로세스에서 같은 값을 사용하려면 공유되는 캐시 backend 를 사용해야 함
+    """
+    cache = get_count_cache()
+    key = get_count_key(owner_id)
+    count = cache.get(key)
+    if count is None:
+        queryset = Snippet.objects.all()
+        if owner_id is not None:
+            queryset = queryset.filter(owner_id=owner_id)
+        count = queryset.count()
+        cache.add(key, count, get_count_cache_options()['TIMEOUT'])
+    return count
+
+
+def incr_snippet_count(owner_id, delta=1):
+    """
+    전체와 owner 별 개수를 delta 만큼 증감
+        캐시에 없는 값은 다음 조회시 계산되므로 건너뜀
+    """
+    cache = get_count_cache()
+    for key in (get_count_key(), get_count_key(owner_id)):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            pass
+
+
+def reset_snippet_counts(owner_ids=()):
+    """
+    bulk_create 등 signal 이 발생하지 않는 변경 후 캐시된 개수를 삭제
+    """
+    get_count_cache().delete_many(
+        [get_count_key()] + [get_count_key(owner_id) for owner_id in owner_ids]
+    )
+
+
+def update_owner_snippet_counts(deltas, using=None):
+    """
+    owner 별 snippet_count(SnippetOwnerStats) 를 {owner_id: delta} 만큼 증감
+        Snippet 생성/삭제와 같은 트랜잭션에서 실행해서 DB 에 저장된 개수가 항상 일치하도록 함
+        행이 없는 owner 는 증가할 때만 현재 Snippet 개수로 행을 만들고,
+        감소할 때 행이 없으면 owner 가 삭제되는 중(CASCADE)일 수 있으므로 건너뜀
+    """
+    using = using or router.db_for_write(SnippetOwnerStats)
+    missing = []
+    for owner_id, delta in deltas.items():
+        if not delta:
+            continue
+        updated = SnippetOwnerStats.objects.using(using).filter(owner_id=owner_id).update(
+            snippet_count=Greatest(F('snippet_count') + delta, 0),
+        )
+        if not updated and delta > 0:
+            missing.append(owner_id)
+    if missing:
+        counts = dict(
+            Snippet.objects.using(using)
+            .filter(owner_id__in=missing)
+            .values_list('owner_id')
+            .annotate(snippet_count=Count('pk'))
+            .order_by()
+        )
+        SnippetOwnerStats.objects.using(using).bulk_create(
+            [SnippetOwnerStats(owner_id=owner_id, snippet_count=counts.get(owner_id, 0)) for owner_id in missing],
+            ignore_conflicts=True,
+        )
+
+
+def estimate_snippet_count():
+    """
+    DB 통계 정보로 추정한 전체 Snippet 개수 (매우 큰 테이블에서 COUNT(*) 대신 사용)
+        추정값을 얻을 수 없는 DB는 캐시된 개수를 리턴
+    """
+    connection = connections[router.db_for_read(Snippet)]
+    sql = ESTIMATE_COUNT_QUERIES.get(connection.vendor)
+    if sql is not None:
+        try:
+            # 쿼리가 실패해도 현재 트랜잭션에 영향을 주지 않도록 savepoint 사용
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute(sql, [Snippet._meta.db_table])
+                row = cursor.fetchone()
+        except DatabaseError:
+            # ANALYZE 를 실행한 적이 없어 sqlite_stat1 테이블이 없는 경우 등
+            row = None
+        if row and row[0] is not None and row[0] >= 0:
+            return int(row[0])
+    return get_snippet_count()
@@ -0,0 +1,115 @@
+import gzip
+import hashlib
+
+import pygments
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Snippet
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+__all__ = (
+    'get_document_variants',
+    'select_encoding',
+)
+
+DEFAULT_HIGHLIGHT_DOCUMENT = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 60 * 24,
+    # 압축하지 않을 최소 크기 (bytes)
+    'MIN_COMPRESS_SIZE': 512,
+    'GZIP_LEVEL': 9,
+    'BROTLI_QUALITY': 11,
+}
+
+KEY_PREFIX = 'snippets:document:'
+
+
+def get_document_options():
+    options = dict(DEFAULT_HIGHLIGHT_DOCUMENT)
+    options.update(getattr(settings, 'SNIPPETS_HIGHLIGHT_DOCUMENT', {}))
+    return options
+
+
+def compress_document(content, options):
+    """
+    HTML 문서의 Content-Encoding 별 압축 결과 {'gzip': bytes, 'br': bytes}
+        같은 문서는 항상 같은 bytes 가 되도록 gzip 헤더의 시간(mtime)을 0으로 고정함
+        압축해도 크기가 줄지 않으면 포함하지 않음
+    """
+    variants = {}
+    if len(content) < options['MIN_COMPRESS_SIZE']:
+        return variants
+    variants['gzip'] = gzip.compress(content, compresslevel=options['GZIP_LEVEL'], mtime=0)
+    if brotli is not None:
+        variants['br'] = brotli.compress(content, quality=options['BROTLI_QUALITY'])
+    return {encoding: value for encoding, value in variants.items() if len(value) < len(content)}
+
+
+def get_document_variants(pk, version, modified):
+    """
+    Snippet 의 하이라이트된 HTML 문서와 압축된 문서, 각각의 강한 ETag
+        Snippet 이 수정되면 version, modified 가 바뀌므로 이를 포함한 키로 캐시하고,
+        캐시에 없을 때만 문서를 만들고 압축함
+    :return: {encoding: (content, etag)} ('identity' 는 압축하지 않은 문서), Snippet 이 없으면 None
+    """
+    options = get_document_options()
+    cache = caches[options['CACHE_ALIAS']]
+    # style 의 CSS 는 Pygments 버전에 따라 달라질 수 있으므로 함께 사용
+    key = f'{KEY_PREFIX}{pk}:{version}:{modified.timestamp()}:{pygments.__version__}'
+    variants = cache.get(key)
+    if variants is not None:
+        return variants
+
+    snippet = Snippet.objects.filter(pk=pk).only('highlighted', 'style', 'title').first()
+    if snippet is None:
+        return None
+    content = snippet.render_document().encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()[:32]
+    # 강한 ETag 는 표현(representation)마다 달라야 하므로 Content-Encoding 을 붙임
+    variants = {'identity': (content, f'"{digest}"')}
+    for encoding, value in compress_document(content, options).items():
+        variants[encoding] = (value, f'"{digest}-{encoding}"')
+    cache.set(key, variants, options['TIMEOUT'])
+    return variants
+
+
+def parse_accept_encoding(header):
+    """
+    Accept-Encoding 헤더를 {encoding: q} 로 변환
+    """
+    accepted = {}
+    for item in header.split(','):
+        encoding, _, params = item.partition(';')
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[encoding] = q
+    return accepted
+
+
+def select_encoding(header, available):
+    """
+    Accept-Encoding 헤더에 따라 사용할 Content-Encoding (br > gzip > identity 순서로 선호)
+    :return: available 중 하나, 압축하지 않으면 'identity'
+    """
+    accepted = parse_accept_encoding(header or '')
+    for encoding in ('br', 'gzip'):
+        if encoding not in available:
+            continue
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > 0:
+            return encoding
+    return 'identity'
@@ -0,0 +1,86 @@
+import csv
+import json
+
+from .models import Snippet
+
+__all__ = (
+    'EXPORT_FIELDS',
+    'EXPORT_FORMATS',
+    'get_export_queryset',
+    'iter_export',
+)
+
+# 출력 순서, owner 는 다른 환경에서도 사용할 수 있도록 username 으로 출력
+EXPORT_FIELDS = (
+    'pk',
+    'created',
+    'title',
+    'code',
+    'linenos',
+    'language',
+    'style',
+    'owner',
+)
+EXPORT_COLUMNS = {
+    'owner': 'owner__username',
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def get_export_queryset(owner=None, language=None, created_after=None, created_before=None):
+    """
+    내보낼 Snippet 의 값 tuple queryset (pk 순서)
+        owner 는 User 의 pk, created_after 이상 created_before 미만
+    """
+    queryset = Snippet.objects.order_by('pk')
+    if owner is not None:
+        queryset = queryset.filter(owner_id=owner)
+    if language is not None:
+        queryset = queryset.filter(language=language)
+    if created_after is not None:
+        queryset = queryset.filter(created__gte=created_after)
+    if created_before is not None:
+        queryset = queryset.filter(created__lt=created_before)
+    return queryset.values_list(*[EXPORT_COLUMNS.get(field, field) for field in EXPORT_FIELDS])
+
+
+class Echo:
+    """
+    csv.writer 가 쓴 행을 버퍼에 모으지 않고 그대로 리턴하는 file-like 객체
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        item = dict(zip(EXPORT_FIELDS, row))
+        item['created'] = item['created'].isoformat()
+        yield json.dumps(item, ensure_ascii=False) + '\n'
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    created_index = EXPORT_FIELDS.index('created')
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        row = list(row)
+        row[created_index] = row[created_index].isoformat()
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
+
+
+def iter_export(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    queryset 의 행을 export_format(ndjson, csv) 형식의 문자열로 한 행씩 생성
+        iterator(chunk_size) 로 chunk_size 개씩 가져오므로 행 수와 관계없이 메모리 사용량이 일정함
+    """
+    iter_rows = EXPORT_FORMATS[export_format][0]
+    return iter_rows(queryset.iterator(chunk_size=chunk_size))
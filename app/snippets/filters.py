@@ -0,0 +1,92 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+__all__ = (
+    'SnippetFilterBackend',
+    'get_filter_params',
+    'filter_snippets',
+    'parse_created',
+)
+
+# 필터 조건에 사용되는 인덱스는 Snippet.Meta.indexes 참조
+BOOLEAN_VALUES = {
+    'true': True,
+    '1': True,
+    'false': False,
+    '0': False,
+}
+
+
+def parse_created(value):
+    """
+    created 범위 필터 값(ISO 8601 datetime 또는 date)을 aware datetime 으로 변환
+    :return: 잘못된 값이면 None
+    """
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                return None
+            parsed = datetime.combine(date, time.min)
+    except ValueError:
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def get_filter_params(query_params):
+    """
+    query string 의 필터 값을 queryset.filter() 에 사용할 조건으로 변환
+        ?language=&style=&owner=<User pk>&linenos=<true|false>
+        &created_after=<ISO 8601, 포함>&created_before=<ISO 8601, 미포함>
+    잘못된 값이 있으면 ValidationError
+    """
+    params = {}
+    errors = {}
+    for name in ('language', 'style'):
+        if name in query_params:
+            params[name] = query_params[name]
+
+    if 'owner' in query_params:
+        try:
+            params['owner_id'] = int(query_params['owner'])
+        except ValueError:
+            errors['owner'] = ['A valid integer is required.']
+
+    if 'linenos' in query_params:
+        try:
+            # linenos=True 는 WHERE "linenos" (False 는 NOT "linenos") 로 변환되어 인덱스를 사용할 수 없으므로
+            # 인덱스 검색이 가능한 IN (값) 조건으로 조회
+            params['linenos__in'] = [BOOLEAN_VALUES[query_params['linenos'].lower()]]
+        except KeyError:
+            errors['linenos'] = ['Must be a valid boolean.']
+
+    for name, lookup in (('created_after', 'created__gte'), ('created_before', 'created__lt')):
+        if name in query_params:
+            value = parse_created(query_params[name])
+            if value is None:
+                errors[name] = ['Must be an ISO 8601 date or datetime.']
+            params[lookup] = value
+
+    if errors:
+        raise ValidationError(errors)
+    return params
+
+
+def filter_snippets(queryset, query_params):
+    return queryset.filter(**get_filter_params(query_params))
+
+
+class SnippetFilterBackend(BaseFilterBackend):
+    """
+    Snippet 목록의 language, style, owner, linenos, created 범위 필터
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return filter_snippets(queryset, request.query_params)
@@ -0,0 +1,462 @@
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.html import escape
+from pygments import highlight
+from pygments.formatters.html import DOC_FOOTER, DOC_HEADER, HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from pygments.token import string_to_tokentype
+
+from .choices import get_style_choices
+
+__all__ = (
+    'highlight_key',
+    'token_key',
+    'render_highlight',
+    'highlight_code',
+    'lex_code',
+    'format_tokens',
+    'get_tokens',
+    'render_document',
+    'get_style_sheets',
+    'get_highlight_cache',
+    'prewarm_highlight_pool',
+)
+
+DEFAULT_HIGHLIGHT_POOL = {
+    # pool 에 보관할 lexer, formatter 인스턴스의 최대 개수
+    'MAX_SIZE': 64,
+    # 워커 시작시 미리 만들어 둘 lexer 개수 (DB에서 많이 사용된 언어 순)
+    'PREWARM': 0,
+}
+
+DEFAULT_HIGHLIGHT_CACHE = {
+    # 'locmem': 프로세스 내부 LRU, 'django': Django 캐시 프레임워크, None: 캐시 사용안함
+    'BACKEND': 'locmem',
+    'MAX_BYTES': 16 * 1024 * 1024,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': None,
+}
+
+
+def highlight_key(code, language, linenos):
+    """
+    하이라이트 결과에 영향을 주는 입력값들로 만든 캐시 키 (sha256)
+        style, title 은 CSS 와 문서 헤더에만 쓰이므로 키에 포함하지 않음
+    """
+    digest = hashlib.sha256()
+    for value in (language, 'table' if linenos else '', code):
+        value = value.encode('utf-8')
+        # 길이를 앞에 붙여 필드 경계가 모호해지지 않도록 함
+        digest.update(b'%d:' % len(value))
+        digest.update(value)
+    return digest.hexdigest()
+
+
+def token_key(code, language):
+    """
+    lexer 결과(토큰)의 캐시 키, linenos 는 formatter 에만 쓰이므로 포함하지 않음
+        HTML 조각의 키와 구분되도록 prefix 를 붙임
+    """
+    return 'tokens:' + highlight_key(code, language, False)
+
+
+def render_highlight(code, language, linenos):
+    """
+    캐시를 거치지 않고 Pygments로 직접 하이라이트한 HTML 조각(fragment)을 리턴
+        <style> 블록과 HTML 문서 wrapper 는 포함하지 않음 (render_document() 참조)
+    """
+    # 지정한 언어에 대한 분석기 lexer, 줄 표시 여부에 따른 formatter 는
+    # 프로세스 내부 pool 에서 재사용
+    lexer = lexer_pool.get(language)
+    formatter = formatter_pool.get(bool(linenos))
+    return highlight(code, lexer, formatter)
+
+
+def lex_code(code, language):
+    """
+    lexer 만 실행한 (token type, 값) list
+        HtmlFormatter 는 같은 종류의 연속된 토큰을 하나의 <span> 으로 출력하므로
+        인접한 같은 종류의 토큰을 합쳐도 결과가 같음 (저장할 토큰 수가 줄어듦)
+    """
+    tokens = []
+    last_type = None
+    values = []
+    for token_type, value in lexer_pool.get(language).get_tokens(code):
+        if token_type is not last_type and values:
+            tokens.append((last_type, ''.join(values)))
+            values = []
+        last_type = token_type
+        values.append(value)
+    if values:
+        tokens.append((last_type, ''.join(values)))
+    return tokens
+
+
+def format_tokens(tokens, linenos):
+    """
+    lex_code() 의 토큰을 HTML 조각으로 변환 (render_highlight() 와 같은 결과)
+    """
+    outfile = StringIO()
+    formatter_pool.get(bool(linenos)).format(tokens, outfile)
+    return outfile.getvalue()
+
+
+def serialize_tokens(tokens):
+    """
+    토큰을 캐시에 저장할 문자열로 변환
+        token type 은 한 번만 저장하고 각 토큰은 type 의 순번과 값으로 저장함
+        ["Token.Name", ...], [0, "print", 1, "(", ...]
+    """
+    type_indexes = {}
+    flat = []
+    for token_type, value in tokens:
+        flat.append(type_indexes.setdefault(token_type, len(type_indexes)))
+        flat.append(value)
+    return json.dumps([[str(token_type) for token_type in type_indexes], flat],
+                      ensure_ascii=False, separators=(',', ':'))
+
+
+def deserialize_tokens(serialized):
+    names, flat = json.loads(serialized)
+    token_types = [string_to_tokentype(name) for name in names]
+    return [(token_types[flat[index]], flat[index + 1]) for index in range(0, len(flat), 2)]
+
+
+def get_tokens(code, language):
+    """
+    하이라이트 캐시에 저장된 토큰을 사용하고, 없을 때만 lexer 를 실행해서 저장
+        linenos 만 바뀐 경우 lexer 를 다시 실행하지 않고 formatter 만 실행하기 위해 사용
+    """
+    cache = get_highlight_cache()
+    key = token_key(code, language)
+    serialized = cache.get(key)
+    if serialized is not None:
+        return deserialize_tokens(serialized)
+    tokens = lex_code(code, language)
+    cache.set(key, serialize_tokens(tokens))
+    return tokens
+
+
+def highlight_code(code, language, linenos):
+    """
+    하이라이트 캐시를 먼저 확인하고, 없을 때만 렌더링
+        같은 code, language 의 토큰이 캐시에 있으면 formatter 만 실행함
+    """
+    key = highlight_key(code, language, linenos)
+    return get_highlight_cache().get_or_render(
+        key,
+        lambda: format_tokens(get_tokens(code, language), linenos),
+    )
+
+
+def render_document(fragment, style, title):
+    """
+    저장된 HTML 조각으로 HtmlFormatter(full=True) 와 같은 형식의 전체 HTML 문서를 생성
+        title 은 HTML escape 해서 사용
+    """
+    header = DOC_HEADER % {
+        'title': escape(title),
+        'styledefs': _document_style_defs(style),
+        'encoding': None,
+    }
+    return header + fragment + DOC_FOOTER
+
+
+@lru_cache(maxsize=None)
+def _document_style_defs(style):
+    return HtmlFormatter(style=style).get_style_defs('body')
+
+
+@lru_cache(maxsize=None)
+def get_style_sheets():
+    """
+    get_style_choices() 의 각 style 에 대해 HTML 조각에 사용할 CSS 와 ETag 를 한 번만 계산
+    :return: {style: (css, etag)}
+    """
+    style_sheets = {}
+    for style, _ in get_style_choices():
+        css = HtmlFormatter(style=style).get_style_defs('.highlight')
+        etag = '"%s"' % hashlib.sha256(css.encode('utf-8')).hexdigest()[:32]
+        style_sheets[style] = (css, etag)
+    return style_sheets
+
+
+def get_pool_options():
+    options = dict(DEFAULT_HIGHLIGHT_POOL)
+    options.update(getattr(settings, 'SNIPPETS_HIGHLIGHT_POOL', {}))
+    return options
+
+
+class InstancePool:
+    """
+    key 별로 하나의 인스턴스를 만들어 재사용하는 LRU pool
+        lexer 와 HtmlFormatter 는 format 중에 공유 상태를 바꾸지 않으므로
+        여러 스레드에서 같은 인스턴스를 동시에 사용할 수 있음
+    """
+
+    def __init__(self, factory, max_size):
+        self.factory = factory
+        self.max_size = max_size
+        self._instances = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._instances.move_to_end(key)
+                return self._instances[key]
+            except KeyError:
+                pass
+        # 인스턴스 생성(registry 검색)은 lock 밖에서 실행
+        instance = self.factory(key)
+        with self._lock:
+            instance = self._instances.setdefault(key, instance)
+            self._instances.move_to_end(key)
+            while len(self._instances) > self.max_size:
+                self._instances.popitem(last=False)
+        return instance
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._instances
+
+    def __len__(self):
+        with self._lock:
+            return len(self._instances)
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+
+def _create_formatter(linenos):
+    return HtmlFormatter(linenos='table' if linenos else False)
+
+
+lexer_pool = InstancePool(get_lexer_by_name, get_pool_options()['MAX_SIZE'])
+formatter_pool = InstancePool(_create_formatter, 2)
+
+
+def prewarm_highlight_pool(count=None):
+    """
+    DB에서 많이 사용된 언어 순으로 count 개의 lexer 를 미리 생성
+        워커 프로세스 시작시(config/wsgi.py) 호출
+    :return: 생성한 lexer 의 언어 목록
+    """
+    from django.db import DatabaseError
+    from django.db.models import Count
+    from .models import Snippet
+
+    if count is None:
+        count = get_pool_options()['PREWARM']
+    if not count:
+        return []
+    try:
+        languages = list(
+            Snippet.objects
+            .values_list('language', flat=True)
+            .annotate(snippet_count=Count('pk'))
+            .order_by('-snippet_count')[:count]
+        )
+    except DatabaseError:
+        # 아직 migrate 되지 않은 DB 등
+        return []
+    for linenos in (False, True):
+        formatter_pool.get(linenos)
+    for language in languages:
+        lexer_pool.get(language)
+    return languages
+
+
+class BaseHighlightCache:
+    """
+    하이라이트 캐시 백엔드의 공통 인터페이스와 hit/miss 카운터
+    """
+
+    def __init__(self, **options):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_or_render(self, key, render):
+        value = self.get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if value is None:
+            value = render()
+            self.set(key, value)
+        return value
+
+    def stats(self):
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                'backend': self.__class__.__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+
+class DummyHighlightCache(BaseHighlightCache):
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LocMemHighlightCache(BaseHighlightCache):
+    """
+    저장된 바이트 수로 크기를 제한하는 프로세스 내부 LRU 캐시
+    """
+
+    def __init__(self, MAX_BYTES=DEFAULT_HIGHLIGHT_CACHE['MAX_BYTES'], **options):
+        super().__init__(**options)
+        self.max_bytes = MAX_BYTES
+        self.current_bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(key, value):
+        return len(key) + len(value.encode('utf-8'))
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value):
+        size = self._size(key, value)
+        # 하나의 항목이 전체 용량보다 크면 캐시하지 않음
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.current_bytes -= self._size(key, old)
+            self._data[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                old_key, old_value = self._data.popitem(last=False)
+                self.current_bytes -= self._size(old_key, old_value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats.update({
+                'entries': len(self._data),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            })
+        return stats
+
+
+class DjangoHighlightCache(BaseHighlightCache):
+    """
+    settings.CACHES 에 정의된 Django 캐시를 사용하는 백엔드
+        다른 용도와 함께 쓰는 캐시일 수 있으므로 clear() 는 캐시 전체를 비우지 않고 generation 만 바꿈
+        (키에 generation 을 포함하므로 이전 항목은 더이상 사용되지 않고 TIMEOUT 또는 캐시의 정책에 따라 삭제됨)
+    """
+    KEY_PREFIX = 'snippets:highlight:'
+    GENERATION_KEY = KEY_PREFIX + 'generation'
+
+    def __init__(self, CACHE_ALIAS='default', TIMEOUT=None, **options):
+        super().__init__(**options)
+        self.alias = CACHE_ALIAS
+        self.timeout = TIMEOUT
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_generation(self):
+        generation = self.cache.get(self.GENERATION_KEY)
+        if generation is None:
+            # generation 이 캐시에서 삭제된 경우에도 이전 값을 다시 사용하지 않도록 새 값을 만듦
+            self.cache.add(self.GENERATION_KEY, uuid.uuid4().hex, None)
+            generation = self.cache.get(self.GENERATION_KEY)
+        return generation
+
+    def make_key(self, key):
+        return f'{self.KEY_PREFIX}{self.get_generation()}:{key}'
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def set(self, key, value):
+        self.cache.set(self.make_key(key), value, self.timeout)
+
+    def clear(self):
+        self.cache.set(self.GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+HIGHLIGHT_CACHE_BACKENDS = {
+    None: DummyHighlightCache,
+    'locmem': LocMemHighlightCache,
+    'django': DjangoHighlightCache,
+}
+
+_highlight_cache = None
+_highlight_cache_lock = threading.Lock()
+
+
+def get_highlight_cache():
+    global _highlight_cache
+    if _highlight_cache is None:
+        with _highlight_cache_lock:
+            if _highlight_cache is None:
+                options = dict(DEFAULT_HIGHLIGHT_CACHE)
+                options.update(getattr(settings, 'SNIPPETS_HIGHLIGHT_CACHE', {}))
+                backend = HIGHLIGHT_CACHE_BACKENDS[options.pop('BACKEND')]
+                _highlight_cache = backend(**options)
+    return _highlight_cache
+
+
+@receiver(setting_changed)
+def reset_highlight_cache(setting, **kwargs):
+    global _highlight_cache
+    if setting == 'SNIPPETS_HIGHLIGHT_CACHE':
+        _highlight_cache = None
+    elif setting == 'SNIPPETS_HIGHLIGHT_POOL':
+        lexer_pool.max_size = get_pool_options()['MAX_SIZE']
+        lexer_pool.clear()
@@ -0,0 +1,216 @@
+import json
+import os
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .choices import get_language_choices, get_style_choices
+from .counters import reset_snippet_counts, update_owner_snippet_counts
+from .filters import parse_created
+from .models import Snippet
+from .response_cache import invalidate_snippet_owners, invalidate_snippets
+from .search import get_search_backend
+from .worker import HIGHLIGHT_INPUT_FIELDS, _render
+
+__all__ = (
+    'SnippetImporter',
+    'read_checkpoint',
+    'write_checkpoint',
+)
+
+User = get_user_model()
+
+# export_snippets 출력 중 가져오는 필드 (pk 는 대상 환경에서 새로 할당됨)
+IMPORT_FIELDS = (
+    'title',
+    'code',
+    'linenos',
+    'language',
+    'style',
+)
+
+
+def render_batch(inputs):
+    """
+    프로세스 풀에서 실행되는 함수, 한 batch 를 한 번에 전달해서 프로세스간 통신 횟수를 줄임
+    """
+    return [_render(item) for item in inputs]
+
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, offset):
+    # 중간에 중단되어도 checkpoint 파일이 깨지지 않도록 임시 파일을 쓴 후 교체
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, delete=False) as f:
+        f.write(str(offset))
+    os.replace(f.name, path)
+
+
+class SnippetImporter:
+    """
+    NDJSON 행을 읽어 Snippet 을 bulk_create
+        main 프로세스가 batch 를 DB 에 쓰는 동안 프로세스 풀이 다음 batch 들을 하이라이트함
+        동시에 처리 중인 batch 는 window 개를 넘지 않으므로 입력 크기와 관계없이 메모리 사용량이 일정함
+        하이라이트는 Snippet.save() 와 같은 render_highlight() 를 사용함
+    """
+
+    def __init__(self, batch_size=500, window=4, max_workers=None,
+                 create_owners=False, on_batch=None):
+        self.batch_size = batch_size
+        self.window = window
+        self.max_workers = max_workers
+        self.create_owners = create_owners
+        # batch 를 commit 할 때마다 on_batch(offset) 호출 (offset: 처리를 마친 입력 행 수)
+        self.on_batch = on_batch
+        self.owners = {}
+        self.languages = {value for value, name in get_language_choices()}
+        self.styles = {value for value, name in get_style_choices()}
+        self.imported = 0
+        self.errors = []
+
+    def get_owner_id(self, username):
+        """
+        username 별 User pk 를 캐시해서 행마다 User 를 조회하지 않음
+        """
+        if username not in self.owners:
+            owner_id = User.objects.filter(username=username).values_list('pk', flat=True).first()
+            if owner_id is None and self.create_owners:
+                owner_id = User.objects.create_user(username=username).pk
+            self.owners[username] = owner_id
+        return self.owners[username]
+
+    def parse(self, line):
+        """
+        NDJSON 한 행을 Snippet 으로 변환
+        :return: (Snippet, 원래의 created) 잘못된 행이면 ValueError
+        """
+        item = json.loads(line)
+        if not isinstance(item, dict):
+            raise ValueError('expected a JSON object')
+        if not isinstance(item.get('code'), str):
+            raise ValueError('code is required')
+        owner_id = self.get_owner_id(item.get('owner'))
+        if owner_id is None:
+            raise ValueError(f'owner "{item.get("owner")}" does not exist')
+
+        values = {field: item[field] for field in IMPORT_FIELDS if field in item}
+        if not isinstance(values.get('title', ''), str):
+            raise ValueError('title must be a string')
+        if not isinstance(values.get('linenos', False), bool):
+            raise ValueError('linenos must be a boolean')
+        if 'language' in values and values['language'] not in self.languages:
+            raise ValueError(f'invalid language "{values["language"]}"')
+        if 'style' in values and values['style'] not in self.styles:
+            raise ValueError(f'invalid style "{values["style"]}"')
+        created = None
+        if item.get('created') is not None:
+            created = parse_created(item['created'])
+            if created is None:
+                raise ValueError(f'invalid created "{item["created"]}"')
+        return Snippet(owner_id=owner_id, **values), created
+
+    def read_batches(self, lines, start):
+        """
+        (batch 의 마지막 입력 행 번호, [(Snippet, created), ...]) 를 생성
+            잘못된 행은 errors 에 (행 번호, 메시지)로 기록하고 건너뜀
+        """
+        number = start
+        batch = []
+        for number, line in enumerate(lines, start=start + 1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(self.parse(line))
+            except ValueError as exc:
+                self.errors.append((number, str(exc)))
+                continue
+            if len(batch) >= self.batch_size:
+                yield number, batch
+                batch = []
+        if batch or number > start:
+            yield number, batch
+
+    def run(self, lines, start=0):
+        """
+        lines 의 start 번째 행 이후부터 가져옴 (이전 실행에서 commit 된 행은 건너뜀)
+        :return: 가져온 Snippet 수
+        """
+        lines = islice(lines, start, None)
+        batches = self.read_batches(lines, start)
+        if getattr(settings, 'SNIPPETS_HIGHLIGHT_ASYNC', False):
+            # 비동기 모드에서는 pending 상태로 저장만 하고 highlight_worker 가 처리함
+            for offset, batch in batches:
+                for snippet, created in batch:
+                    snippet.highlight_status = Snippet.HIGHLIGHT_PENDING
+                self.write(offset, batch, None)
+        elif self.max_workers == 0:
+            for offset, batch in batches:
+                self.write(offset, batch, render_batch(self.get_inputs(batch)))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                in_flight = deque()
+                for offset, batch in batches:
+                    in_flight.append((offset, batch, executor.submit(render_batch, self.get_inputs(batch))))
+                    if len(in_flight) >= self.window:
+                        offset, batch, future = in_flight.popleft()
+                        self.write(offset, batch, future.result())
+                while in_flight:
+                    offset, batch, future = in_flight.popleft()
+                    self.write(offset, batch, future.result())
+        return self.imported
+
+    def get_inputs(self, batch):
+        return [
+            {field: getattr(snippet, field) for field in HIGHLIGHT_INPUT_FIELDS}
+            for snippet, created in batch
+        ]
+
+    def write(self, offset, batch, results):
+        snippets = [snippet for snippet, created in batch]
+        if results is not None:
+            for snippet, (html, failed) in zip(snippets, results):
+                snippet.highlighted = html
+                snippet.highlight_status = Snippet.HIGHLIGHT_FAILED if failed else Snippet.HIGHLIGHT_DONE
+
+        if not snippets:
+            # 잘못된 행만 있는 batch 는 checkpoint 만 기록
+            if self.on_batch is not None:
+                self.on_batch(offset)
+            return
+
+        with transaction.atomic():
+            Snippet.objects.bulk_create(snippets)
+            # bulk_create 는 auto_now_add 인 created 를 현재 시각으로 저장하므로 원래 값으로 수정
+            dated = []
+            for snippet, created in batch:
+                if created is not None:
+                    snippet.created = created
+                    dated.append(snippet)
+            if dated:
+                Snippet.objects.bulk_update(dated, ['created'])
+            get_search_backend().index(snippets)
+            owner_counts = Counter(snippet.owner_id for snippet in snippets)
+            update_owner_snippet_counts(owner_counts)
+            transaction.on_commit(partial(reset_snippet_counts, list(owner_counts)))
+            transaction.on_commit(partial(
+                invalidate_snippets, [snippet.pk for snippet in snippets], list(owner_counts),
+            ))
+            transaction.on_commit(partial(invalidate_snippet_owners, list(owner_counts)))
+
+        self.imported += len(snippets)
+        if self.on_batch is not None:
+            self.on_batch(offset)
+
@@ -0,0 +1,318 @@
+import json
+import logging
+import math
+import platform
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from snippets.counters import reset_snippet_counts
+from snippets.highlight import highlight_code
+from snippets.management.commands.bench_highlight import SAMPLES
+from snippets.models import Snippet
+from snippets.performance import measure_request
+
+User = get_user_model()
+
+FLAVORS = (
+    'django_view',
+    'api_view',
+    'mixins_view',
+    'generic_cbv',
+    'viewsets_router',
+)
+OPERATIONS = (
+    'list',
+    'detail',
+    'create',
+    'update',
+    'delete',
+)
+
+# 언어별 Snippet 비율
+LANGUAGE_WEIGHTS = {
+    'python': 35,
+    'javascript': 25,
+    'java': 12,
+    'c': 10,
+    'html': 10,
+    'sql': 8,
+}
+# Snippet 의 줄 수는 중앙값 LINES_MEDIAN 인 로그 정규 분포 (짧은 코드가 대부분이고 가끔 긴 코드가 있음)
+LINES_MEDIAN = 30
+LINES_SIGMA = 1.0
+MAX_LINES = 3000
+
+
+def percentile(values, q):
+    """
+    정렬된 values 의 q 분위수 (선형 보간)
+    """
+    if not values:
+        return None
+    position = (len(values) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(timings, queries, errors, elapsed):
+    """
+    요청별 처리 시간(초)으로 p50/p95/p99, 평균(ms)과 처리량(requests/sec)을 계산
+    """
+    timings = sorted(timings)
+    return {
+        'requests': len(timings),
+        'errors': errors,
+        'p50': percentile(timings, 0.50) * 1000 if timings else None,
+        'p95': percentile(timings, 0.95) * 1000 if timings else None,
+        'p99': percentile(timings, 0.99) * 1000 if timings else None,
+        'mean': statistics.mean(timings) * 1000 if timings else None,
+        'throughput': len(timings) / elapsed if elapsed else None,
+        'queries': statistics.mean(queries) if queries else None,
+    }
+
+
+def compare_results(results, baseline, metric, tolerance, min_delta):
+    """
+    baseline 보다 metric(p50, p95, p99) 이 tolerance 비율과 min_delta(ms) 를 모두 넘게 느려졌거나,
+    평균 쿼리 수나 오류 수가 늘어난 (flavor, operation) 목록
+        응답 시간은 실행 환경에 따라 흔들리므로 여유를 두고, 쿼리 수와 오류 수는 늘어나면 바로 실패함
+    """
+    regressions = []
+    for flavor, operations in results.items():
+        for operation, current in operations.items():
+            previous = baseline.get(flavor, {}).get(operation)
+            if previous is None:
+                continue
+            if (current[metric] is not None and previous[metric] is not None
+                    and current[metric] > previous[metric] * (1 + tolerance)
+                    and current[metric] - previous[metric] > min_delta):
+                regressions.append(
+                    f'{flavor} {operation}: {metric} {previous[metric]:.2f}ms -> {current[metric]:.2f}ms'
+                )
+            if (current['queries'] is not None and previous['queries'] is not None
+                    and current['queries'] > previous['queries']):
+                regressions.append(
+                    f'{flavor} {operation}: queries {previous["queries"]:.1f} -> {current["queries"]:.1f}'
+                )
+            if current['errors'] > previous['errors']:
+                regressions.append(
+                    f'{flavor} {operation}: errors {previous["errors"]} -> {current["errors"]}'
+                )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        'User, Snippet 데이터를 생성하고 5가지 view(django_view, api_view, mixins_view, generic_cbv, '
+        'viewsets_router)의 list, detail, create, update, delete 요청을 test client 로 실행해서 '
+        'p50/p95/p99 응답 시간, 처리량, 쿼리 수를 측정합니다. '
+        '--baseline 으로 이전 결과와 비교해서 느려지면 실패합니다. (생성한 데이터는 rollback 됨)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--snippets', type=int, default=1000)
+        parser.add_argument('--requests', type=int, default=100, help='flavor, operation 별 측정할 요청 수')
+        parser.add_argument('--warmup', type=int, default=5, help='측정 전에 실행할 요청 수')
+        parser.add_argument('--flavors', nargs='+', choices=FLAVORS, default=list(FLAVORS))
+        parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+        parser.add_argument('--seed', type=int, default=0, help='데이터, 요청 순서를 만들 난수 seed')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+        parser.add_argument('--baseline', help='비교할 이전 결과 JSON 파일 경로')
+        parser.add_argument('--metric', choices=('p50', 'p95', 'p99'), default='p50',
+                            help='baseline 과 비교할 응답 시간')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='허용할 응답 시간 증가 비율')
+        parser.add_argument('--min-delta', type=float, default=1.0, help='허용할 응답 시간 증가량 (ms)')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.warmup = options['warmup']
+        self.requests = options['requests']
+
+        # 오류 응답(500)은 결과의 errors 로 집계하므로 django.request 로그는 출력하지 않음
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            results = self.run(options)
+        finally:
+            request_logger.setLevel(level)
+
+        report = {
+            'config': {
+                'users': options['users'],
+                'snippets': options['snippets'],
+                'requests': self.requests,
+                'warmup': self.warmup,
+                'seed': options['seed'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        self.write_table(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['results']
+            regressions = compare_results(
+                results, baseline, options['metric'], options['tolerance'], options['min_delta'],
+            )
+            if regressions:
+                raise CommandError('performance regression:\n' + '\n'.join(regressions))
+            self.stdout.write(f'no regression against {options["baseline"]}')
+
+    def run(self, options):
+        # rollback 된 데이터의 응답이 캐시에 남지 않도록 실행마다 새 캐시를 사용
+        # (응답 캐시는 프로세스별 캐시로는 동작하지 않으므로 shared 는 임시 디렉토리의 파일 기반 캐시)
+        with tempfile.TemporaryDirectory(prefix='snippets-bench-') as shared_dir:
+            caches = {
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': f'snippets-bench-{uuid.uuid4().hex}',
+                },
+                'shared': {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': shared_dir,
+                },
+            }
+            with override_settings(ALLOWED_HOSTS=['*'], CACHES=caches), transaction.atomic():
+                self.seed(options['users'], options['snippets'])
+                results = {
+                    flavor: self.run_flavor(flavor, options['operations'])
+                    for flavor in options['flavors']
+                }
+                transaction.set_rollback(True)
+        return results
+
+    def make_code(self, language):
+        lines = SAMPLES['js' if language == 'javascript' else language].splitlines()
+        count = min(max(round(self.random.lognormvariate(math.log(LINES_MEDIAN), LINES_SIGMA)), 1), MAX_LINES)
+        # 같은 코드가 반복되지 않도록 줄마다 번호를 붙임 (하이라이트 캐시를 사용하지 않음)
+        return '\n'.join(
+            f'{lines[i % len(lines)]} {self.random.randrange(10 ** 6)}' if lines[i % len(lines)].strip() else ''
+            for i in range(count)
+        ) + '\n'
+
+    def make_data(self, title):
+        language = self.random.choices(list(LANGUAGE_WEIGHTS), weights=list(LANGUAGE_WEIGHTS.values()))[0]
+        return {
+            'title': title,
+            'code': self.make_code(language),
+            'language': language,
+            'linenos': self.random.random() < 0.3,
+        }
+
+    def create_snippets(self, owners, count, prefix):
+        snippets = []
+        for i in range(count):
+            data = self.make_data(f'{prefix} {i}')
+            data['highlighted'] = highlight_code(data['code'], data['language'], data['linenos'])
+            snippets.append(Snippet(owner=self.random.choice(owners), **data))
+        return Snippet.objects.bulk_create(snippets)
+
+    def seed(self, users, snippets):
+        started = time.perf_counter()
+        self.users = [User.objects.create_user(username=f'bench_{i}') for i in range(users)]
+        self.snippet_pks = [snippet.pk for snippet in self.create_snippets(self.users, snippets, 'bench')]
+        reset_snippet_counts()
+        self.stderr.write(f'seeded {users} users, {snippets} snippets in {time.perf_counter() - started:.1f}s')
+
+    def request(self, client, operation, flavor, target):
+        url = f'/snippets/{flavor}/snippets/'
+        if operation == 'list':
+            return client.get(url)
+        if operation == 'detail':
+            return client.get(f'{url}{target}/')
+        if operation == 'create':
+            return client.post(url, self.make_data('created'), format='json')
+        if operation == 'update':
+            return client.put(f'{url}{target}/', self.make_data('updated'), format='json')
+        return client.delete(f'{url}{target}/')
+
+    def get_targets(self, operation, write_targets):
+        count = self.warmup + self.requests
+        if operation in ('list', 'create'):
+            return [None] * count
+        if operation == 'detail':
+            return [self.random.choice(self.snippet_pks) for _ in range(count)]
+        return write_targets
+
+    def run_flavor(self, flavor, operations):
+        owner = self.random.choice(self.users)
+        client = APIClient()
+        client.force_authenticate(owner)
+        # update, delete 는 요청한 User 가 owner 인 Snippet 을 flavor 마다 따로 만들어서 사용 (update 후 delete)
+        write_targets = []
+        if {'update', 'delete'} & set(operations):
+            write_targets = [
+                snippet.pk
+                for snippet in self.create_snippets([owner], self.warmup + self.requests, 'target')
+            ]
+
+        results = {}
+        for operation in OPERATIONS:
+            if operation not in operations:
+                continue
+            timings = []
+            queries = []
+            errors = 0
+            started = time.perf_counter()
+            for i, target in enumerate(self.get_targets(operation, write_targets)):
+                if i == self.warmup:
+                    started = time.perf_counter()
+                timing = self.measure(client, operation, flavor, target)
+                if i < self.warmup:
+                    continue
+                if timing is None:
+                    errors += 1
+                else:
+                    timings.append(timing.durations['total'])
+                    queries.append(timing.queries)
+            results[operation] = summarize(timings, queries, errors, time.perf_counter() - started)
+        return results
+
+    def measure(self, client, operation, flavor, target):
+        """
+        요청 하나를 실행하고 RequestTimings 를 리턴 (오류 응답이면 None)
+            요청마다 savepoint 를 사용해서 오류가 나도 다음 요청을 계속 실행하고,
+            commit 후 실행되는 callback(캐시 무효화 등)은 요청이 끝날 때 실행해서 처리 시간에 포함함
+        """
+        try:
+            with transaction.atomic():
+                with measure_request() as timing, TestCase.captureOnCommitCallbacks(execute=True):
+                    response = self.request(client, operation, flavor, target)
+        except Exception:
+            return None
+        return timing if response.status_code < 400 else None
+
+    def write_table(self, results):
+        self.stdout.write(
+            f'{"flavor":<16} {"operation":<10} {"requests":>8} {"errors":>6} {"p50":>8} {"p95":>8} '
+            f'{"p99":>8} {"req/s":>8} {"queries":>8}'
+        )
+        for flavor, operations in results.items():
+            for operation, result in operations.items():
+                if not result['requests']:
+                    self.stdout.write(f'{flavor:<16} {operation:<10} {0:>8} {result["errors"]:>6}')
+                    continue
+                self.stdout.write(
+                    f'{flavor:<16} {operation:<10} {result["requests"]:>8} {result["errors"]:>6} '
+                    f'{result["p50"]:>8.2f} {result["p95"]:>8.2f} {result["p99"]:>8.2f} '
+                    f'{result["throughput"]:>8.1f} {result["queries"]:>8.1f}'
+                )
+        self.stdout.write('(ms, 오류 응답은 시간과 쿼리 수에서 제외)')
@@ -0,0 +1,275 @@
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+
+from .bench import Command as BenchCommand, summarize
+
+User = get_user_model()
+
+# (이름, 서버, 요청할 view flavor)
+TARGETS = (
+    ('wsgi', 'gunicorn', 'django_view'),
+    ('asgi', 'uvicorn', 'django_view'),
+    ('asgi-async', 'uvicorn', 'async_view'),
+)
+HOST = '127.0.0.1'
+
+
+def get_server_command(server, port, threads):
+    """
+    서버를 실행할 명령 (WSGI: gunicorn gthread 워커 1개, ASGI: uvicorn 워커 1개)
+    """
+    if server == 'gunicorn':
+        return [
+            sys.executable, '-m', 'gunicorn', 'config.wsgi:application',
+            '--bind', f'{HOST}:{port}', '--workers', '1', '--worker-class', 'gthread',
+            '--threads', str(threads), '--log-level', 'warning',
+        ]
+    return [
+        sys.executable, '-m', 'uvicorn', 'config.asgi:application',
+        '--host', HOST, '--port', str(port), '--workers', '1',
+        '--log-level', 'warning', '--no-access-log',
+    ]
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f'server exited with status {process.returncode}')
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f'server did not start listening on port {port}')
+
+
+async def fetch(reader, writer, path):
+    """
+    keep-alive 연결로 GET 요청을 보내고 응답 본문까지 읽음
+    :return: (status, 서버가 연결을 닫는지 여부)
+    """
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\nAccept: application/json\r\n\r\n'.encode('ascii'))
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip().lower()
+    if 'content-length' not in headers:
+        raise ValueError('response without Content-Length')
+    await reader.readexactly(int(headers['content-length']))
+    return status, headers.get('connection') == 'close'
+
+
+async def client(port, paths, deadline, timeout, timings, errors, rng):
+    """
+    deadline 까지 연결 하나로 요청을 반복 (서버가 연결을 닫거나 응답이 timeout 초를 넘으면 다시 연결)
+    """
+    reader = writer = None
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+            status, close = await asyncio.wait_for(fetch(reader, writer, rng.choice(paths)), timeout)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            errors.append(1)
+            close = True
+        else:
+            if status < 400:
+                timings.append(time.perf_counter() - started)
+            else:
+                errors.append(1)
+        if close and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def slow_client(port, stop):
+    """
+    요청 헤더를 1초에 한 줄씩 보내면서 응답을 기다리는 연결 (long polling 처럼 연결을 오래 점유하는 클라이언트)
+        요청을 끝까지 받을 때까지 WSGI 서버는 스레드 하나를 점유하지만 ASGI 서버는 이벤트 루프에서 기다림
+    """
+    try:
+        _, writer = await asyncio.open_connection(HOST, port)
+    except OSError:
+        return
+    try:
+        writer.write(f'GET /snippets/ HTTP/1.1\r\nHost: {HOST}\r\n'.encode('ascii'))
+        while not stop.is_set():
+            await writer.drain()
+            try:
+                await asyncio.wait_for(stop.wait(), 1)
+            except asyncio.TimeoutError:
+                writer.write(b'X-Slow-Client: 1\r\n')
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_load(port, paths, concurrency, duration, slow_clients=0, seed=0, timeout=5.0):
+    """
+    concurrency 개의 연결로 duration 초 동안 paths 에 GET 요청을 보내고 결과를 요약
+        slow_clients 개의 느린 연결을 먼저 연 상태에서 측정하고, timeout 초 안에 응답하지 않은 요청은 오류로 집계함
+    """
+    stop = asyncio.Event()
+    slow = [asyncio.create_task(slow_client(port, stop)) for _ in range(slow_clients)]
+    if slow:
+        await asyncio.sleep(0.5)
+    timings = []
+    errors = []
+    started = time.perf_counter()
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(
+        client(port, paths, deadline, timeout, timings, errors, random.Random(seed + i))
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await asyncio.gather(*slow)
+    result = summarize(timings, [], len(errors), elapsed)
+    del result['queries']
+    return result
+
+
+class Command(BenchCommand):
+    help = (
+        'User, Snippet 데이터를 DB 에 생성하고 WSGI(gunicorn gthread) 서버와 ASGI(uvicorn) 서버를 실행해서 '
+        '동시 연결 수별 처리량과 p50/p95/p99 응답 시간을 비교합니다. '
+        'ASGI 는 동기 view(django_view)와 async view(async_view)를 각각 측정합니다. '
+        'gunicorn, uvicorn 이 설치되어 있어야 하며, 생성한 데이터는 측정 후 삭제됩니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--snippets', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64],
+                            help='측정할 동시 연결 수')
+        parser.add_argument('--duration', type=float, default=5.0, help='동시 연결 수별 측정 시간 (초)')
+        parser.add_argument('--slow-clients', type=int, default=0,
+                            help='측정하는 동안 열어둘 느린 연결 수 (요청 헤더를 천천히 보냄)')
+        parser.add_argument('--timeout', type=float, default=5.0, help='요청별 응답 대기 시간 (초, 넘으면 오류)')
+        parser.add_argument('--threads', type=int, default=8, help='WSGI 서버의 스레드 수')
+        parser.add_argument('--operations', nargs='+', choices=('list', 'detail'), default=['list', 'detail'])
+        parser.add_argument('--targets', nargs='+', choices=[name for name, _, _ in TARGETS],
+                            default=[name for name, _, _ in TARGETS])
+        parser.add_argument('--seed', type=int, default=0, help='데이터, 요청 순서를 만들 난수 seed')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        targets = [target for target in TARGETS if target[0] in options['targets']]
+        missing = sorted({server for _, server, _ in targets if importlib.util.find_spec(server) is None})
+        if missing:
+            raise CommandError(f'{", ".join(missing)} is not installed (pip install {" ".join(missing)})')
+
+        self.random = random.Random(options['seed'])
+        self.seed(options['users'], options['snippets'])
+        try:
+            results = {
+                name: self.run_target(server, flavor, options)
+                for name, server, flavor in targets
+            }
+        finally:
+            User.objects.filter(pk__in=[user.pk for user in self.users]).delete()
+
+        report = {
+            'config': {
+                'users': options['users'],
+                'snippets': options['snippets'],
+                'duration': options['duration'],
+                'slow_clients': options['slow_clients'],
+                'timeout': options['timeout'],
+                'threads': options['threads'],
+                'seed': options['seed'],
+                'cpus': os.cpu_count(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        self.write_table(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+
+    def get_paths(self, flavor, operation):
+        url = f'/snippets/{flavor}/snippets/'
+        if operation == 'list':
+            # 전체 목록은 Snippet 수에 비례하므로 owner 별 목록을 요청
+            return [f'{url}?owner={user.pk}' for user in self.users]
+        return [f'{url}{pk}/' for pk in self.snippet_pks]
+
+    def run_target(self, server, flavor, options):
+        port = get_free_port()
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        process = subprocess.Popen(
+            get_server_command(server, port, options['threads']),
+            cwd=settings.BASE_DIR, env=env,
+        )
+        try:
+            wait_for_port(port, process)
+            results = {}
+            for operation in options['operations']:
+                paths = self.get_paths(flavor, operation)
+                # 첫 요청의 import, lexer 생성 등이 측정에 포함되지 않도록 먼저 요청
+                asyncio.run(run_load(port, paths, 1, 0.5, seed=options['seed']))
+                results[operation] = {
+                    str(concurrency): asyncio.run(run_load(
+                        port, paths, concurrency, options['duration'], options['slow_clients'], options['seed'],
+                        options['timeout'],
+                    ))
+                    for concurrency in options['concurrency']
+                }
+            return results
+        finally:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def write_table(self, results):
+        self.stdout.write(
+            f'{"target":<12} {"operation":<10} {"conns":>6} {"requests":>8} {"errors":>6} '
+            f'{"p50":>8} {"p95":>8} {"p99":>8} {"req/s":>8}'
+        )
+        for target, operations in results.items():
+            for operation, levels in operations.items():
+                for concurrency, result in levels.items():
+                    if not result['requests']:
+                        self.stdout.write(
+                            f'{target:<12} {operation:<10} {concurrency:>6} {0:>8} {result["errors"]:>6}'
+                        )
+                        continue
+                    self.stdout.write(
+                        f'{target:<12} {operation:<10} {concurrency:>6} {result["requests"]:>8} '
+                        f'{result["errors"]:>6} {result["p50"]:>8.2f} {result["p95"]:>8.2f} '
+                        f'{result["p99"]:>8.2f} {result["throughput"]:>8.1f}'
+                    )
+        self.stdout.write('(ms, conns: 동시 연결 수, 오류 응답은 시간에서 제외)')
@@ -0,0 +1,69 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from snippets.highlight import get_highlight_cache
+
+User = get_user_model()
+
+SAMPLE_CODE = '''def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Snippet 을 한 건씩 POST 로 생성할 때와 bulk API 로 생성할 때의 '
+        '초당 처리량을 비교합니다. (생성한 데이터는 rollback 됨)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=2000)
+        parser.add_argument('--batch', type=int, default=1000, help='bulk 요청당 항목 수')
+        parser.add_argument('--workers', type=int, default=None, help='하이라이트 프로세스 풀 크기')
+
+    def handle(self, *args, **options):
+        items = [
+            # 항목마다 code 가 달라 하이라이트 캐시를 사용하지 않음
+            {'title': f'bench {i}', 'code': f'{SAMPLE_CODE}\nprint(fibonacci({i}))\n'}
+            for i in range(options['items'])
+        ]
+        with override_settings(ALLOWED_HOSTS=['*']), transaction.atomic():
+            client = APIClient()
+            client.force_authenticate(User.objects.create_user(username='bench_bulk'))
+
+            single = self.measure(lambda: [
+                client.post('/snippets/viewsets_router/snippets/', item, format='json')
+                for item in items
+            ])
+
+            bulk_options = {'WORKERS': options['workers']}
+            with override_settings(SNIPPETS_BULK=bulk_options):
+                bulk = self.measure(lambda: [
+                    client.post('/snippets/viewsets_router/snippets/bulk/',
+                                items[start:start + options['batch']], format='json')
+                    for start in range(0, len(items), options['batch'])
+                ])
+            transaction.set_rollback(True)
+
+        count = len(items)
+        self.stdout.write(f'{"mode":<8} {"seconds":>10} {"items/sec":>12}')
+        for name, seconds in (('single', single), ('bulk', bulk)):
+            self.stdout.write(f'{name:<8} {seconds:>10.2f} {count / seconds:>12.1f}')
+
+    def measure(self, run):
+        get_highlight_cache().clear()
+        start = time.perf_counter()
+        responses = run()
+        seconds = time.perf_counter() - start
+        failed = [response for response in responses if response.status_code >= 400]
+        if failed:
+            raise RuntimeError(f'request failed: {failed[0].status_code} {failed[0].content[:200]}')
+        return seconds
@@ -0,0 +1,135 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from snippets.highlight import (
+    deserialize_tokens,
+    format_tokens,
+    lex_code,
+    render_highlight,
+    serialize_tokens,
+)
+from snippets.models import Snippet
+
+# DB 에 Snippet 이 없을 때 사용할 언어별 예제 코드 (--size 크기가 될 때까지 반복)
+SAMPLES = {
+    'python': (
+        'class Point:\n'
+        '    """2차원 좌표"""\n'
+        '    def __init__(self, x=0, y=0):\n'
+        '        self.x, self.y = x, y\n\n'
+        '    def __repr__(self):\n'
+        '        return f"Point({self.x!r}, {self.y!r})"  # repr\n\n'
+    ),
+    'js': (
+        'function debounce(fn, wait = 100) {\n'
+        '  let timer = null;\n'
+        '  return (...args) => {\n'
+        '    clearTimeout(timer);\n'
+        '    timer = setTimeout(() => fn.apply(this, args), wait); // 지연 실행\n'
+        '  };\n'
+        '}\n'
+    ),
+    'java': (
+        'public final class Counter {\n'
+        '    private final Map<String, Integer> counts = new HashMap<>();\n'
+        '    public int add(String key) {\n'
+        '        return counts.merge(key, 1, Integer::sum); /* 개수 */\n'
+        '    }\n'
+        '}\n'
+    ),
+    'c': (
+        '#include <stdio.h>\n'
+        'static int sum(const int *values, size_t n) {\n'
+        '    int total = 0;\n'
+        '    for (size_t i = 0; i < n; i++) total += values[i];\n'
+        '    return total; /* 합계 */\n'
+        '}\n'
+    ),
+    'html': (
+        '<section class="card" id="intro">\n'
+        '  <h2>Title &amp; subtitle</h2>\n'
+        '  <a href="/snippets/?page=2" data-id="42">next</a>\n'
+        '</section>\n'
+    ),
+    'sql': (
+        'SELECT s.id, s.title, COUNT(*) AS total\n'
+        'FROM snippets_snippet s JOIN auth_user u ON u.id = s.owner_id\n'
+        "WHERE s.language = 'python' -- 언어\n"
+        'GROUP BY s.id ORDER BY total DESC LIMIT 10;\n'
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        '언어별 하이라이트 시간을 lexer(토큰 생성)와 formatter(HTML 생성)로 나누어 측정하고, '
+        'linenos 만 바뀐 경우(캐시된 토큰 + formatter)와 전체 렌더링을 비교합니다. '
+        'DB 에 Snippet 이 있으면 많이 사용된 언어의 코드를 사용합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--languages', type=int, default=6, help='측정할 언어 수')
+        parser.add_argument('--size', type=int, default=20 * 1024, help='언어별 코드 크기 (bytes)')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.stdout.write(
+            f'{"language":<10} {"KB":>5} {"tokens":>7} {"lex":>8} {"format":>8} {"format+ln":>10} '
+            f'{"serialize":>10} {"load":>7} {"full":>8} {"linenos":>8} {"speedup":>8}'
+        )
+        for language, code in self.get_codes(options['languages'], options['size']):
+            self.compare(language, code)
+        self.stdout.write('(ms, linenos: 캐시된 토큰을 읽고 formatter 만 실행한 시간)')
+
+    def get_codes(self, count, size):
+        languages = list(
+            Snippet.objects
+            .values_list('language', flat=True)
+            .annotate(snippet_count=Count('pk'))
+            .order_by('-snippet_count')[:count]
+        )
+        if not languages:
+            return [(language, self.repeat_code(code, size)) for language, code in list(SAMPLES.items())[:count]]
+
+        codes = []
+        for language in languages:
+            code = ''
+            for value in Snippet.objects.filter(language=language).values_list('code', flat=True).iterator():
+                code += value + '\n'
+                if len(code) >= size:
+                    break
+            codes.append((language, self.repeat_code(code, size)))
+        return codes
+
+    def repeat_code(self, code, size):
+        return (code * (size // max(len(code), 1) + 1))[:size]
+
+    def measure(self, func):
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def compare(self, language, code):
+        tokens = lex_code(code, language)
+        serialized = serialize_tokens(tokens)
+        assert format_tokens(deserialize_tokens(serialized), True) == render_highlight(code, language, True)
+
+        lex_ms = self.measure(lambda: lex_code(code, language))
+        format_ms = self.measure(lambda: format_tokens(tokens, False))
+        format_linenos_ms = self.measure(lambda: format_tokens(tokens, True))
+        serialize_ms = self.measure(lambda: serialize_tokens(tokens))
+        load_ms = self.measure(lambda: deserialize_tokens(serialized))
+        full_ms = self.measure(lambda: render_highlight(code, language, True))
+        linenos_ms = self.measure(lambda: format_tokens(deserialize_tokens(serialized), True))
+        self.stdout.write(
+            f'{language:<10} {len(code) / 1024:>5.0f} {len(tokens):>7} {lex_ms:>8.2f} {format_ms:>8.2f} '
+            f'{format_linenos_ms:>10.2f} {serialize_ms:>10.2f} {load_ms:>7.2f} {full_ms:>8.2f} '
+            f'{linenos_ms:>8.2f} {full_ms / linenos_ms:>7.1f}x'
+        )
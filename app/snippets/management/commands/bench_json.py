@@ -0,0 +1,73 @@
+import io
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from utils.parsers import FastJSONParser
+from utils.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        'code 가 큰 Snippet 응답/요청의 JSON 렌더링, 파싱 시간을 '
+        'JSONRenderer/JSONParser 와 FastJSONRenderer/FastJSONParser 로 비교합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--code-size', type=int, default=100 * 1024)
+        parser.add_argument('--counts', type=int, nargs='+', default=[1, 10, 100])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        code_size = options['code_size']
+        self.stdout.write(
+            f'{"snippets":>8} {"size(KB)":>9} {"render(ms)":>11} {"fast(ms)":>9} '
+            f'{"parse(ms)":>10} {"fast(ms)":>9}'
+        )
+        for count in options['counts']:
+            data = [self.make_snippet(pk, code_size) for pk in range(1, count + 1)]
+            body = JSONRenderer().render(data)
+            assert FastJSONRenderer().render(data) == body
+            assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body)) == data
+
+            render_ms = self.measure(lambda: JSONRenderer().render(data))
+            fast_render_ms = self.measure(lambda: FastJSONRenderer().render(data))
+            parse_ms = self.measure(lambda: JSONParser().parse(io.BytesIO(body)))
+            fast_parse_ms = self.measure(lambda: FastJSONParser().parse(io.BytesIO(body)))
+            self.stdout.write(
+                f'{count:>8} {len(body) / 1024:>9.0f} {render_ms:>11.2f} {fast_render_ms:>9.2f} '
+                f'{parse_ms:>10.2f} {fast_parse_ms:>9.2f}'
+            )
+
+    def make_snippet(self, pk, code_size):
+        # 들여쓰기, 따옴표, 역슬래시, 한글 등 escape 가 필요한 문자를 포함한 코드
+        words = ['def', 'return', '"text"', "'\\n'", '한글', 'x = {"key": [1, 2]}', 'é', '\t']
+        lines = []
+        size = 0
+        while size < code_size:
+            line = '    ' + ' '.join(random.choice(words + list(string.ascii_letters)) for _ in range(8))
+            lines.append(line)
+            size += len(line) + 1
+        return {
+            'pk': pk,
+            'title': f'snippet {pk}',
+            'code': '\n'.join(lines)[:code_size],
+            'linenos': False,
+            'language': 'python',
+            'style': 'friendly',
+            'owner': {'pk': 1, 'username': 'bench'},
+        }
+
+    def measure(self, func):
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
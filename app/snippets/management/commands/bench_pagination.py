@@ -0,0 +1,85 @@
+import statistics
+import time
+from base64 import b64encode
+from urllib import parse
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from snippets.models import Snippet
+from snippets.serializers import SnippetListSerializer
+from utils.paginations import SnippetCursorPagination, SnippetListPagination
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        '페이지 번호(OFFSET) 페이지네이션과 (created, pk) 커서 페이지네이션의 '
+        '페이지 깊이별 조회 시간을 비교합니다. (생성한 데이터는 rollback 됨)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--page-size', type=int, default=SnippetListPagination.page_size)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--pages', type=int, nargs='+', default=[1, 10, 100, 1000, 10000],
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['rows'])
+            self.compare(options['pages'], options['page_size'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        owner = User.objects.create_user(username='bench_pagination')
+        batch_size = 10000
+        for start in range(0, rows, batch_size):
+            Snippet.objects.bulk_create(
+                Snippet(code=f'a = {i}', highlighted='', owner=owner)
+                for i in range(start, min(start + batch_size, rows))
+            )
+        self.stdout.write(f'{rows} snippets created')
+
+    def measure(self, paginator, params):
+        timings = []
+        factory = APIRequestFactory()
+        for _ in range(self.repeat):
+            request = Request(factory.get('/snippets/', params, SERVER_NAME='localhost'))
+            queryset = Snippet.objects.for_serializer(SnippetListSerializer)
+            start = time.perf_counter()
+            paginator.paginate_queryset(queryset, request)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+
+    def compare(self, pages, page_size, repeat):
+        self.repeat = repeat
+        total = Snippet.objects.count()
+
+        offset_pagination = SnippetListPagination()
+        offset_pagination.page_size = page_size
+        cursor_pagination = SnippetCursorPagination()
+        cursor_pagination.max_page_size = page_size
+
+        self.stdout.write(f'{"page":>8} {"offset(ms)":>12} {"cursor(ms)":>12}')
+        ordered = Snippet.objects.order_by('-created', '-pk')
+        for page in pages:
+            offset = (page - 1) * page_size
+            if offset >= total:
+                break
+            offset_ms = self.measure(offset_pagination, {'page': page})
+
+            params = {'page_size': page_size}
+            if offset:
+                # 이전 페이지의 마지막 행으로 커서를 만듦 (SnippetCursorPagination.encode_cursor 와 같은 형식)
+                created, pk = ordered.values_list('created', 'pk')[offset - 1]
+                querystring = parse.urlencode({'c': created.isoformat(), 'p': pk})
+                params['cursor'] = b64encode(querystring.encode('ascii')).decode('ascii')
+            cursor_ms = self.measure(cursor_pagination, params)
+
+            self.stdout.write(f'{page:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}')
@@ -0,0 +1,82 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from snippets.models import Snippet
+from snippets.search import DatabaseSearchBackend, get_search_backend
+from snippets.serializers import SnippetListSerializer
+
+User = get_user_model()
+
+WORDS = (
+    'request', 'response', 'queryset', 'serializer', 'render', 'lexer', 'token', 'cursor',
+    'owner', 'cache', 'index', 'value', 'result', 'buffer', 'stream', 'parser', 'style',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'icontains 검색과 검색 backend(인덱스)의 검색 시간(count + 첫 페이지)을 비교합니다. '
+        '(생성한 데이터는 rollback 됨)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument(
+            '--queries', nargs='+',
+            default=['render_token', 'cache_index stream_buffer', 'pars*', 'snippet_42424'],
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            self.seed(options['rows'], backend)
+            self.compare(backend, options['queries'], options['page_size'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, rows, backend):
+        owner = User.objects.create_user(username='bench_search')
+        rng = random.Random(0)
+        batch_size = 10000
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            Snippet.objects.bulk_create(
+                Snippet(
+                    title=f'snippet_{i}',
+                    code='\n'.join(
+                        f'{rng.choice(WORDS)}_{rng.choice(WORDS)} = {rng.randrange(1000)}'
+                        for _ in range(5)
+                    ),
+                    highlighted='',
+                    owner=owner,
+                )
+                for i in range(offset, min(offset + batch_size, rows))
+            )
+        self.stdout.write(f'{rows} snippets created in {time.perf_counter() - start:.1f}s')
+        start = time.perf_counter()
+        backend.rebuild()
+        self.stdout.write(f'{type(backend).__name__} index built in {time.perf_counter() - start:.1f}s')
+
+    def measure(self, backend, text, page_size, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = backend.search(text, Snippet.objects.for_serializer(SnippetListSerializer))
+            count = results.count()
+            list(results[:page_size])
+            timings.append(time.perf_counter() - start)
+        return count, statistics.median(timings) * 1000
+
+    def compare(self, backend, queries, page_size, repeat):
+        scan = DatabaseSearchBackend(backend.using)
+        self.stdout.write(f'{"query":<28} {"matches":>9} {"icontains(ms)":>14} {"index(ms)":>10}')
+        for text in queries:
+            matches, index_ms = self.measure(backend, text, page_size, repeat)
+            scan_matches, scan_ms = self.measure(scan, text, page_size, repeat)
+            self.stdout.write(f'{text:<28} {matches:>9} {scan_ms:>14.1f} {index_ms:>10.1f}')
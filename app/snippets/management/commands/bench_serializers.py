@@ -0,0 +1,77 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.serializers import ListSerializer
+
+from snippets.models import Snippet
+from snippets.serializers import SnippetListSerializer, UserListSerializer, values_for_serializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        '목록 serializer 의 페이지 크기별 직렬화 처리량(rows/sec)을 DRF 필드 방식과 '
+        'ValuesListSerializer(모델 인스턴스, values() 행)로 비교합니다. (생성한 데이터는 rollback 됨)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        sizes = options['sizes']
+        with transaction.atomic():
+            self.seed(max(sizes))
+            self.stdout.write(
+                f'{"serializer":<22} {"rows":>6} {"drf(rows/s)":>13} '
+                f'{"instances(rows/s)":>18} {"values(rows/s)":>15} {"speedup":>8}'
+            )
+            for size in sizes:
+                self.compare(SnippetListSerializer, Snippet.objects.all(), size)
+            for size in sizes:
+                self.compare(UserListSerializer, User.objects.all(), size)
+            transaction.set_rollback(True)
+
+    def seed(self, rows):
+        owners = [User.objects.create_user(username=f'bench_serializers_{i}') for i in range(rows)]
+        Snippet.objects.bulk_create(
+            Snippet(title=f'title {i}', code=f'a = {i}', linenos=i % 2 == 0,
+                    highlighted='', owner=owners[i % 10])
+            for i in range(rows)
+        )
+
+    def measure(self, serialize, data):
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            serialize(data)
+            timings.append(time.perf_counter() - start)
+        return len(data) / statistics.median(timings)
+
+    def compare(self, serializer_class, queryset, size):
+        # 조회 시간은 제외하고 이미 가져온 페이지의 직렬화 시간만 측정
+        queryset = queryset.order_by('pk')
+        if serializer_class is SnippetListSerializer:
+            queryset = queryset.select_related('owner')
+        instances = list(queryset[:size])
+        rows = list(values_for_serializer(queryset, serializer_class)[:size])
+
+        def drf(data):
+            return ListSerializer(data, child=serializer_class()).data
+
+        def fast(data):
+            return serializer_class(data, many=True).data
+
+        assert drf(instances) == fast(instances) == fast(rows)
+        drf_rate = self.measure(drf, instances)
+        instance_rate = self.measure(fast, instances)
+        values_rate = self.measure(fast, rows)
+        self.stdout.write(
+            f'{serializer_class.__name__:<22} {len(instances):>6} {drf_rate:>13.0f} '
+            f'{instance_rate:>18.0f} {values_rate:>15.0f} {values_rate / drf_rate:>7.1f}x'
+        )
@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# 새 인터프리터에서 config.wsgi 를 import 하는 데 걸린 시간을 측정하는 코드
+# (choices 계산 방식과 캐시 경로는 settings 를 읽은 후, 측정을 시작하기 전에 지정)
+IMPORT_SCRIPT = '''
+import json, os, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+from django.conf import settings
+settings.SNIPPETS_CHOICES_LAZY = {lazy}
+settings.SNIPPETS_CHOICES_CACHE_DIR = {cache_dir!r}
+start = time.perf_counter()
+import config.wsgi
+imported = time.perf_counter()
+if {load_choices}:
+    from snippets.choices import get_language_choices, get_style_choices
+    get_language_choices()
+    get_style_choices()
+print(json.dumps([imported - start, time.perf_counter() - start]))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'config.wsgi 를 새 프로세스에서 import 하는 시간(cold start)을 측정합니다. '
+        'choices 캐시 파일은 측정마다 만든 임시 디렉토리에 저장하므로 실행 중인 서버의 캐시 파일은 바뀌지 않습니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def run(self, lazy, load_choices, clear_cache):
+        timings = []
+        for _ in range(self.repeat):
+            if clear_cache:
+                for name in os.listdir(self.cache_dir):
+                    os.remove(os.path.join(self.cache_dir, name))
+            script = IMPORT_SCRIPT.format(lazy=lazy, cache_dir=self.cache_dir, load_choices=load_choices)
+            output = subprocess.check_output([sys.executable, '-c', script], cwd=settings.BASE_DIR)
+            timings.append(json.loads(output)[1])
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.cache_dir = tempfile.mkdtemp(prefix='snippets-bench-startup-')
+        try:
+            # 이전 방식: import 시점에 모든 lexer, style 을 읽어서 choices 를 계산 (SNIPPETS_CHOICES_LAZY=False)
+            eager = self.run(lazy=False, load_choices=True, clear_cache=True)
+            # choices 를 사용하지 않는 cold start (wsgi 워커 부팅)
+            lazy = self.run(lazy=True, load_choices=False, clear_cache=True)
+            # 처음 사용할 때 choices 를 계산하고 캐시 파일을 만드는 경우
+            computed = self.run(lazy=True, load_choices=True, clear_cache=True)
+            # choices 를 사용하지만 디스크 캐시가 있는 경우
+            cached = self.run(lazy=True, load_choices=True, clear_cache=False)
+        finally:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+        self.stdout.write(f'import config.wsgi, eager choices:     {eager * 1000:8.1f} ms')
+        self.stdout.write(f'import config.wsgi (lazy choices):     {lazy * 1000:8.1f} ms')
+        self.stdout.write(f'import config.wsgi + compute choices:  {computed * 1000:8.1f} ms')
+        self.stdout.write(f'import config.wsgi + cached choices:   {cached * 1000:8.1f} ms')
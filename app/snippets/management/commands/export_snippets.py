@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from snippets.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, get_export_queryset, iter_export
+from snippets.filters import parse_created
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Snippet 을 NDJSON 또는 CSV 로 내보냅니다. (행 수와 관계없이 일정한 메모리 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--output', '-o', help='출력 파일 경로 (지정하지 않으면 표준 출력)')
+        parser.add_argument('--owner', help='owner 의 username')
+        parser.add_argument('--language')
+        parser.add_argument('--created-after', help='ISO 8601 date 또는 datetime (포함)')
+        parser.add_argument('--created-before', help='ISO 8601 date 또는 datetime (미포함)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        filters = {'language': options['language']}
+        if options['owner'] is not None:
+            try:
+                filters['owner'] = User.objects.values_list('pk', flat=True).get(
+                    username=options['owner'],
+                )
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["owner"]}" does not exist')
+        for name in ('created_after', 'created_before'):
+            if options[name] is not None:
+                filters[name] = parse_created(options[name])
+                if filters[name] is None:
+                    raise CommandError(f'--{name.replace("_", "-")} must be an ISO 8601 date or datetime')
+
+        lines = iter_export(
+            get_export_queryset(**filters), options['format'], chunk_size=options['chunk_size'],
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
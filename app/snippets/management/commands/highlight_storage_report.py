@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from snippets.highlight import render_document
+from snippets.models import Snippet
+
+
+class Command(BaseCommand):
+    help = (
+        'Snippet.highlighted 에 저장된 HTML 조각의 크기와 '
+        '전체 HTML 문서로 저장했을 때의 크기를 비교합니다.'
+    )
+
+    def handle(self, *args, **options):
+        count = 0
+        fragment_bytes = 0
+        document_bytes = 0
+        rows = Snippet.objects.values_list('highlighted', 'style', 'title')
+        for highlighted, style, title in rows.iterator():
+            count += 1
+            fragment_bytes += len(highlighted.encode('utf-8'))
+            document_bytes += len(render_document(highlighted, style, title).encode('utf-8'))
+
+        saved = document_bytes - fragment_bytes
+        ratio = saved / document_bytes if document_bytes else 0.0
+        self.stdout.write(f'snippets:        {count}')
+        self.stdout.write(f'full documents:  {document_bytes} bytes')
+        self.stdout.write(f'fragments:       {fragment_bytes} bytes')
+        self.stdout.write(f'saved:           {saved} bytes ({ratio:.1%})')
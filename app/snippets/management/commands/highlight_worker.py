@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+
+from snippets.worker import highlight_pending
+
+
+class Command(BaseCommand):
+    help = 'pending 상태인 Snippet 을 프로세스 풀에서 하이라이트합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='프로세스 풀 크기 (0이면 현재 프로세스에서 처리)',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='처리할 항목이 없을 때 다시 확인하기까지 대기할 시간(초)',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='pending 항목을 모두 처리하면 종료',
+        )
+
+    def handle(self, *args, **options):
+        # 프로세스 풀은 한 번만 만들고 모든 배치에서 같은 풀을 사용
+        if options['workers'] == 0:
+            pool = nullcontext()
+        else:
+            pool = ProcessPoolExecutor(max_workers=options['workers'])
+        with pool as executor:
+            self.run(executor, options)
+
+    def run(self, executor, options):
+        while True:
+            written = highlight_pending(batch_size=options['batch_size'], executor=executor)
+            if written:
+                self.stdout.write(f'{written} snippet(s) highlighted')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,77 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from snippets.importer import SnippetImporter, read_checkpoint, write_checkpoint
+
+
+class Command(BaseCommand):
+    help = (
+        'export_snippets 로 내보낸 NDJSON 을 가져옵니다. '
+        '(프로세스 풀에서 하이라이트하는 동안 이전 batch 를 bulk_create)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', nargs='?', default='-', help='NDJSON 파일 경로 (- 이면 표준 입력)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--window', type=int, default=4,
+            help='동시에 하이라이트 중인 batch 의 최대 개수 (메모리 사용량은 batch-size * window 행)',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='하이라이트 프로세스 풀 크기 (0이면 현재 프로세스에서 처리)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='commit 된 입력 행 수를 기록할 파일, 파일이 있으면 기록된 행 다음부터 가져옴',
+        )
+        parser.add_argument('--start', type=int, default=None, help='건너뛸 입력 행 수')
+        parser.add_argument(
+            '--create-owners', action='store_true',
+            help='owner 의 username 에 해당하는 User 가 없으면 생성',
+        )
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint']
+        start = options['start']
+        if start is None:
+            start = read_checkpoint(checkpoint) if checkpoint else 0
+        if start:
+            self.stdout.write(f'resuming after line {start}')
+
+        started = time.perf_counter()
+        report = {'at': started}
+
+        def on_batch(offset):
+            if checkpoint:
+                write_checkpoint(checkpoint, offset)
+            now = time.perf_counter()
+            if now - report['at'] >= 5:
+                report['at'] = now
+                self.stdout.write(
+                    f'line {offset}: {importer.imported} imported '
+                    f'({importer.imported / (now - started):.1f} rows/sec)'
+                )
+
+        importer = SnippetImporter(
+            batch_size=options['batch_size'],
+            window=options['window'],
+            max_workers=options['workers'],
+            create_owners=options['create_owners'],
+            on_batch=on_batch,
+        )
+        if options['input'] == '-':
+            importer.run(sys.stdin, start=start)
+        else:
+            with open(options['input'], encoding='utf-8') as lines:
+                importer.run(lines, start=start)
+
+        elapsed = time.perf_counter() - started
+        for number, message in importer.errors:
+            self.stderr.write(f'line {number}: {message}')
+        self.stdout.write(
+            f'{importer.imported} imported, {len(importer.errors)} skipped '
+            f'in {elapsed:.2f}s ({importer.imported / elapsed if elapsed else 0:.1f} rows/sec)'
+        )
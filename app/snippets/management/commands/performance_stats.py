@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from snippets.performance import METRICS, get_performance_options, get_performance_stats, reset_performance_stats
+from utils.caches import is_process_local
+
+
+class Command(BaseCommand):
+    help = (
+        'PerformanceMiddleware 가 수집한 route 별 요청 수, 평균 쿼리 수와 '
+        '구간(total, db, serializer, render, highlight)별 평균, p50/p95/p99(ms)를 출력합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json', action='store_true',
+            help='히스토그램을 포함한 전체 통계를 JSON 으로 출력합니다.',
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='출력 후 통계를 초기화합니다.',
+        )
+
+    def handle(self, *args, **options):
+        # 통계는 웹 서버 프로세스들이 캐시에 합산하므로 이 명령의 프로세스에서 볼 수 있는 캐시여야 함
+        if is_process_local(get_performance_options()['CACHE_ALIAS']):
+            raise CommandError(
+                "SNIPPETS_PERFORMANCE['CACHE_ALIAS'] is a process-local cache (LocMemCache) "
+                'that this command cannot read; configure a shared cache (file based, Redis, Memcached).'
+            )
+        stats = get_performance_stats()
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2))
+        else:
+            for route, route_stats in stats.items():
+                self.stdout.write(
+                    f'{route}  requests: {route_stats["requests"]}  queries: {route_stats["queries"]:.1f}'
+                )
+                for name in METRICS:
+                    metric = route_stats['metrics'].get(name)
+                    if metric is None:
+                        continue
+                    self.stdout.write(
+                        f'    {name:<11} count: {metric["count"]:<8} mean: {metric["mean"]:>9.2f} '
+                        f'p50: {self.format_bound(metric["p50"])} p95: {self.format_bound(metric["p95"])} '
+                        f'p99: {self.format_bound(metric["p99"])}'
+                    )
+        if options['reset']:
+            reset_performance_stats()
+
+    def format_bound(self, value):
+        # 히스토그램 구간의 상한 (마지막 구간이면 None)
+        return f'{"<=" + str(value) if value is not None else "inf":>7}'
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from snippets.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Snippet 검색 인덱스를 모든 Snippet 으로 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        start = time.perf_counter()
+        with transaction.atomic(using=backend.using):
+            backend.rebuild()
+        self.stdout.write(
+            f'{type(backend).__name__}: rebuilt in {time.perf_counter() - start:.2f}s'
+        )
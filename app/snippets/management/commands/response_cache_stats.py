@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from snippets.response_cache import get_response_cache_stats, is_response_cache_enabled, reset_response_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'SnippetViewSet, UserViewSet 응답 캐시의 endpoint 별 hit/miss 수와 hit rate 를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='출력 후 통계를 초기화합니다.',
+        )
+
+    def handle(self, *args, **options):
+        # 통계는 웹 서버 프로세스들이 기록하므로 이 명령의 프로세스에서 볼 수 있는 캐시여야 함
+        if not is_response_cache_enabled():
+            raise CommandError(
+                "SNIPPETS_RESPONSE_CACHE['CACHE_ALIAS'] is a process-local cache (LocMemCache); "
+                'configure a shared cache (file based, Redis, Memcached) to cache responses and report stats.'
+            )
+        for endpoint, stats in get_response_cache_stats().items():
+            self.stdout.write(
+                f'{endpoint:<16} hits: {stats["hits"]:<8} misses: {stats["misses"]:<8} '
+                f'hit rate: {stats["hit_rate"]:.1%}'
+            )
+        if options['reset']:
+            reset_response_cache_stats()
@@ -0,0 +1,43 @@
+from django.core.exceptions import MiddlewareNotUsed
+
+from .performance import get_performance_options, measure_request, record_request
+
+__all__ = (
+    'PerformanceMiddleware',
+)
+
+
+def get_route(request):
+    """
+    요청의 URL 패턴 ('GET /snippets/viewsets_router/snippets/(?P<pk>[^/.]+)/$' 등)
+        pk 등 URL 의 값이 아니라 패턴 별로 통계를 모음
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return f'{request.method} <unresolved>'
+    return f'{request.method} /{match.route}'
+
+
+class PerformanceMiddleware:
+    """
+    요청별 전체 처리 시간, DB 쿼리 수와 시간, serializer, renderer, 하이라이트 시간을 측정해서
+    Server-Timing 헤더로 응답하고 route 별 히스토그램에 추가
+        SNIPPETS_PERFORMANCE['ENABLED'] 가 False 이면 미들웨어 체인에서 제외됨
+        (serializer 등의 timed() 구간은 ContextVar 확인만 하고 바로 실행됨)
+        동기 미들웨어이므로 ASGI(config.asgi)에서 켜면 요청마다 스레드에서 실행되어 async view 의 이점이 줄어듦
+    """
+
+    def __init__(self, get_response):
+        options = get_performance_options()
+        if not options['ENABLED']:
+            raise MiddlewareNotUsed
+        self.server_timing = options['SERVER_TIMING']
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with measure_request() as timings:
+            response = self.get_response(request)
+        if self.server_timing:
+            response['Server-Timing'] = timings.server_timing()
+        record_request(get_route(request), timings)
+        return response
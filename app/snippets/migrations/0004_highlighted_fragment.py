@@ -0,0 +1,77 @@
+from django.db import migrations
+from django.utils.html import escape
+from pygments import highlight
+from pygments.formatters.html import DOC_FOOTER, DOC_HEADER, HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name
+from pygments.util import ClassNotFound
+
+BATCH_SIZE = 500
+
+
+# 이후 snippets.highlight 가 바뀌어도 마이그레이션 결과가 달라지지 않도록
+# 이 마이그레이션을 작성한 시점의 하이라이트 방식을 그대로 사용 (pool, 캐시를 사용하지 않음)
+def render_highlight(code, language, linenos):
+    try:
+        lexer = get_lexer_by_name(language)
+    except ClassNotFound:
+        # 저장된 언어를 찾을 수 없으면 마이그레이션을 중단하지 않고 일반 텍스트로 처리
+        lexer = TextLexer()
+    return highlight(code, lexer, HtmlFormatter(linenos='table' if linenos else False))
+
+
+def render_document(fragment, style, title):
+    try:
+        styledefs = HtmlFormatter(style=style).get_style_defs('body')
+    except ClassNotFound:
+        styledefs = HtmlFormatter().get_style_defs('body')
+    header = DOC_HEADER % {'title': escape(title), 'styledefs': styledefs, 'encoding': None}
+    return header + fragment + DOC_FOOTER
+
+
+def highlighted_to_fragment(apps, schema_editor):
+    """
+    전체 HTML 문서로 저장된 highlighted 를 HTML 조각으로 변환
+    """
+    Snippet = apps.get_model('snippets', 'Snippet')
+    rows = (
+        Snippet.objects
+        .filter(highlighted__startswith='<!DOCTYPE')
+        .values_list('pk', 'code', 'language', 'linenos')
+    )
+    # 변환된 행은 조건에서 빠지므로 앞에서부터 BATCH_SIZE 개씩 반복
+    while True:
+        batch = list(rows[:BATCH_SIZE])
+        if not batch:
+            break
+        for pk, code, language, linenos in batch:
+            Snippet.objects.filter(pk=pk).update(
+                highlighted=render_highlight(code, language, linenos),
+            )
+
+
+def highlighted_to_document(apps, schema_editor):
+    Snippet = apps.get_model('snippets', 'Snippet')
+    rows = (
+        Snippet.objects
+        .exclude(highlighted__startswith='<!DOCTYPE')
+        .values_list('pk', 'highlighted', 'style', 'title')
+    )
+    while True:
+        batch = list(rows[:BATCH_SIZE])
+        if not batch:
+            break
+        for pk, highlighted, style, title in batch:
+            Snippet.objects.filter(pk=pk).update(
+                highlighted=render_document(highlighted, style, title),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('snippets', '0003_snippet_highlight_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(highlighted_to_fragment, highlighted_to_document),
+    ]
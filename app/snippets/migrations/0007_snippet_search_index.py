@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# FTS5SearchBackend 가 사용하는 전문 검색 인덱스 (SQLite 에서만 생성)
+# '_' 를 단어에 포함해서 highlight_code 같은 식별자를 하나의 단어로 인덱싱
+CREATE_SQL = (
+    'CREATE VIRTUAL TABLE IF NOT EXISTS snippets_snippet_fts '
+    'USING fts5(title, code, tokenize="unicode61 tokenchars \'_\'")'
+)
+POPULATE_SQL = (
+    'INSERT INTO snippets_snippet_fts (rowid, title, code) '
+    'SELECT id, title, code FROM snippets_snippet'
+)
+DROP_SQL = 'DROP TABLE IF EXISTS snippets_snippet_fts'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_SQL)
+    schema_editor.execute(POPULATE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('snippets', '0006_snippet_modified_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
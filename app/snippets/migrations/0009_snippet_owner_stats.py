@@ -0,0 +1,44 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_owner_stats(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Snippet = apps.get_model('snippets', 'Snippet')
+    SnippetOwnerStats = apps.get_model('snippets', 'SnippetOwnerStats')
+    db_alias = schema_editor.connection.alias
+    counts = dict(
+        Snippet.objects.using(db_alias)
+        .values_list('owner_id')
+        .annotate(snippet_count=models.Count('pk'))
+        .order_by()
+    )
+    SnippetOwnerStats.objects.using(db_alias).bulk_create(
+        (
+            SnippetOwnerStats(owner_id=pk, snippet_count=counts.get(pk, 0))
+            for pk in User.objects.using(db_alias).values_list('pk', flat=True).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('snippets', '0008_snippet_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnippetOwnerStats',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True,
+                                               related_name='snippet_stats', serialize=False,
+                                               to=settings.AUTH_USER_MODEL)),
+                ('snippet_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_owner_stats, migrations.RunPython.noop),
+    ]
@@ -1,52 +1,175 @@
 from django.conf import settings
 from django.db import models
-from pygments import highlight
-from pygments.formatters.html import HtmlFormatter
-from pygments.lexers import get_all_lexers, get_lexer_by_name
-from pygments.styles import get_all_styles
 
-LEXERS = [item for item in get_all_lexers() if item[1]]
-LANGUAGE_CHOICES = sorted([(item[1][0], item[0]) for item in LEXERS])
-STYLE_CHOICES = sorted((item, item) for item in get_all_styles())
+from .choices import get_language_choices, get_style_choices, load_eager_choices
+from .highlight import highlight_code, render_document
+from .performance import timing
+from .querysets import SnippetQuerySet
+
+if not getattr(settings, 'SNIPPETS_CHOICES_LAZY', True):
+    load_eager_choices()
+
+
+def __getattr__(name):
+    # LANGUAGE_CHOICES, STYLE_CHOICES 는 import 시점이 아니라 처음 사용할 때 계산
+    if name == 'LANGUAGE_CHOICES':
+        return get_language_choices()
+    if name == 'STYLE_CHOICES':
+        return get_style_choices()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class Snippet(models.Model):
+    HIGHLIGHT_PENDING = 'pending'
+    HIGHLIGHT_DONE = 'done'
+    HIGHLIGHT_FAILED = 'failed'
+    HIGHLIGHT_STATUS_CHOICES = (
+        (HIGHLIGHT_PENDING, 'Pending'),
+        (HIGHLIGHT_DONE, 'Done'),
+        (HIGHLIGHT_FAILED, 'Failed'),
+    )
+    # 하이라이트 결과(HTML 조각)에 영향을 주는 필드
+    HIGHLIGHT_INPUT_FIELDS = (
+        'code',
+        'language',
+        'linenos',
+    )
+    # 검색 인덱스(snippets.search)에 포함되는 필드
+    SEARCH_INPUT_FIELDS = (
+        'title',
+        'code',
+    )
+
     created = models.DateTimeField(auto_now_add=True)
+    # 조건부 GET(ETag, Last-Modified) 에 사용
+    modified = models.DateTimeField(auto_now=True, db_index=True)
+    version = models.PositiveIntegerField(default=1)
     title = models.CharField(max_length=100, blank=True, default='')
     code = models.TextField()
     linenos = models.BooleanField(default=False)
-    language = models.CharField(choices=LANGUAGE_CHOICES, default='python', max_length=100)
-    style = models.CharField(choices=STYLE_CHOICES, default='friendly', max_length=100)
+    language = models.CharField(choices=get_language_choices, default='python', max_length=100)
+    style = models.CharField(choices=get_style_choices, default='friendly', max_length=100)
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='snippets',
         )
     highlighted = models.TextField()
+    highlight_status = models.CharField(
+        choices=HIGHLIGHT_STATUS_CHOICES,
+        default=HIGHLIGHT_DONE,
+        max_length=10,
+    )
+
+    objects = SnippetQuerySet.as_manager()
 
     class Meta:
         ordering = ('-created',)
+        indexes = [
+            # SnippetCursorPagination 의 (created, pk) 키셋 조회용
+            models.Index(fields=['created', 'id'], name='snippets_created_id_idx'),
+            # 목록 필터(snippets.filters) 조건으로 찾은 행을 created 순서로 읽기 위한 인덱스
+            # (같은 created 는 인덱스에 포함된 pk 순서이므로 커서 페이지네이션의 정렬에도 사용됨)
+            models.Index(fields=['owner', 'created'], name='snippets_owner_created_idx'),
+            models.Index(fields=['language', 'created'], name='snippets_language_created_idx'),
+            models.Index(fields=['style', 'created'], name='snippets_style_created_idx'),
+            models.Index(fields=['linenos', 'created'], name='snippets_linenos_created_idx'),
+        ]
 
     def __str__(self):
         return f'{self.pk}'
 
-    def save(self, *args, **kwargs):
-        # 지정한 언어에 대한 분석기 lexer 할당
-        lexer = get_lexer_by_name(self.language)
+    def render_document(self):
+        """
+        저장된 HTML 조각(highlighted)에 style 과 title 을 적용한 전체 HTML 문서
+        """
+        return render_document(self.highlighted, self.style, self.title)
 
-        # 줄 표시 여부
-        linenos = 'table' if self.linenos else False
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_highlight_inputs = instance.get_highlight_inputs()
+        instance._loaded_search_inputs = instance.get_search_inputs()
+        return instance
 
-        # self.title 이 존재하면 option 에 'title' 키가 들어있는 dict 를 전달
-        options = {'title': self.title} if self.title else {}
+    def get_loaded_values(self, fields):
+        """
+        fields 중 조회된(deferred 가 아닌) 필드의 값
+        """
+        return {
+            field: self.__dict__[field]
+            for field in fields
+            if field in self.__dict__
+        }
 
-        # 위에서 지정한 여러 변수들을 사용해서 formatter 객체 생성
-        formatter = HtmlFormatter(
-            style=self.style,
-            linenos=linenos,
-            full=True,
-            **options
-        )
+    def get_highlight_inputs(self):
+        return self.get_loaded_values(self.HIGHLIGHT_INPUT_FIELDS)
+
+    def get_search_inputs(self):
+        return self.get_loaded_values(self.SEARCH_INPUT_FIELDS)
+
+    def highlight_inputs_changed(self):
+        """
+        DB 에서 조회한 후 하이라이트 입력(code, language, linenos)이 바뀌었는지 확인
+            새 Snippet 이거나, 조회하지 않은 입력 필드가 있거나, 하이라이트가 완료되지 않은 상태면 True
+        """
+        loaded = getattr(self, '_loaded_highlight_inputs', None)
+        if self._state.adding or loaded is None or len(loaded) != len(self.HIGHLIGHT_INPUT_FIELDS):
+            return True
+        if self.__dict__.get('highlight_status') != self.HIGHLIGHT_DONE:
+            return True
+        return loaded != self.get_highlight_inputs()
 
-        self.highlighted = highlight(self.code, lexer, formatter)
-        super().save(*args, **kwargs)
\ No newline at end of file
+    def search_inputs_changed(self):
+        """
+        DB 에서 조회한 후 검색 인덱스 입력(title, code)이 바뀌었는지 확인
+            새 Snippet 이거나 조회하지 않은 입력 필드가 있으면 True
+            (post_save signal 에서 호출하므로 save() 가 끝나기 전의 조회 값과 비교함)
+        """
+        loaded = getattr(self, '_loaded_search_inputs', None)
+        if loaded is None or len(loaded) != len(self.SEARCH_INPUT_FIELDS):
+            return True
+        return loaded != self.get_search_inputs()
+
+    def save(self, *args, **kwargs):
+        # style, title 등 HTML 조각에 영향을 주지 않는 값만 바뀌었으면 저장된 highlighted 를 그대로 사용
+        # (style, title 은 render_document() 에서 적용)
+        if self.highlight_inputs_changed():
+            if getattr(settings, 'SNIPPETS_HIGHLIGHT_ASYNC', False):
+                # 비동기 모드에서는 pending 상태로 저장만 하고,
+                # 하이라이트 결과는 highlight_worker 가 나중에 기록함
+                self.highlight_status = self.HIGHLIGHT_PENDING
+            else:
+                # 같은 입력(code, language, linenos)으로 이미 하이라이트한 결과가
+                # 캐시에 있으면 lexer 를 다시 실행하지 않고,
+                # code, language 가 같은 토큰이 캐시에 있으면 (linenos 만 바뀐 경우) formatter 만 실행
+                with timing('highlight'):
+                    self.highlighted = highlight_code(
+                        code=self.code,
+                        language=self.language,
+                        linenos=self.linenos,
+                    )
+                self.highlight_status = self.HIGHLIGHT_DONE
+        if not self._state.adding:
+            self.version += 1
+        super().save(*args, **kwargs)
+        self._loaded_highlight_inputs = self.get_highlight_inputs()
+        self._loaded_search_inputs = self.get_search_inputs()
+
+
+class SnippetOwnerStats(models.Model):
+    """
+    User 별 Snippet 개수
+        User 목록, 상세 응답에서 요청마다 COUNT(*) 를 실행하지 않도록 User 생성시 행을 만들고
+        Snippet 생성/삭제시 함께 갱신함 (counters.update_owner_snippet_counts)
+    """
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snippet_stats',
+    )
+    snippet_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.owner_id}: {self.snippet_count}'
@@ -0,0 +1,324 @@
+import hashlib
+import threading
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.dispatch import Signal
+
+__all__ = (
+    'request_timed',
+    'RequestTimings',
+    'get_request_timings',
+    'timing',
+    'timed',
+    'record_request',
+    'flush_performance_stats',
+    'get_performance_stats',
+    'reset_performance_stats',
+)
+
+DEFAULT_PERFORMANCE = {
+    'ENABLED': False,
+    'CACHE_ALIAS': 'default',
+    # 응답에 Server-Timing 헤더를 추가할지 여부
+    'SERVER_TIMING': True,
+    # 히스토그램 구간의 상한 (ms, 마지막 구간은 상한 없음)
+    'BUCKETS': (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+    # 프로세스에 모은 통계를 캐시에 합산하는 주기 (초)
+    'FLUSH_INTERVAL': 10,
+}
+
+KEY_PREFIX = 'snippets:performance:'
+METRICS = (
+    'total',
+    'db',
+    'serializer',
+    'render',
+    'highlight',
+)
+
+# 요청을 처리하는 동안 RequestTimings 를 저장 (PerformanceMiddleware 가 설정)
+_request_timings = ContextVar('snippets_request_timings', default=None)
+_null_timing = nullcontext()
+
+# 요청 처리가 끝나면 전송 (route='GET /snippets/...', timings=RequestTimings)
+request_timed = Signal()
+
+
+def get_performance_options():
+    options = dict(DEFAULT_PERFORMANCE)
+    options.update(getattr(settings, 'SNIPPETS_PERFORMANCE', {}))
+    return options
+
+
+class RequestTimings:
+    """
+    요청 하나의 구간별 처리 시간(초)과 DB 쿼리 수
+        같은 이름의 구간이 중첩되면 (serializer 안의 중첩된 serializer 등) 가장 바깥 구간만 기록함
+        db 시간은 serializer 등 다른 구간 안에서 실행된 쿼리의 시간도 포함함
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.queries = 0
+        self.active = set()
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    @contextmanager
+    def section(self, name):
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active.discard(name)
+            self.add(name, time.perf_counter() - start)
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() 로 등록해서 쿼리 수와 시간을 기록
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - start)
+
+    def server_timing(self):
+        """
+        Server-Timing 헤더 값 (ms)
+        """
+        metrics = []
+        for name in METRICS:
+            if name not in self.durations:
+                continue
+            metric = f'{name};dur={self.durations[name] * 1000:.2f}'
+            if name == 'db':
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+
+def get_request_timings():
+    """
+    현재 요청의 RequestTimings (측정하지 않는 경우 None)
+    """
+    return _request_timings.get()
+
+
+def timing(name):
+    """
+    with 문 안의 실행 시간을 현재 요청의 name 구간으로 기록
+        측정하지 않는 경우(PerformanceMiddleware 가 꺼져 있거나 요청 밖에서 실행) 아무 것도 하지 않음
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        return _null_timing
+    return timings.section(name)
+
+
+def timed(name):
+    """
+    함수의 실행 시간을 현재 요청의 name 구간으로 기록하는 decorator
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _request_timings.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            with timings.section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def measure_request():
+    """
+    with 문 안에서 실행된 구간과 DB 쿼리를 새 RequestTimings 에 기록
+    """
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+            yield timings
+    finally:
+        timings.add('total', time.perf_counter() - start)
+        _request_timings.reset(token)
+
+
+class PerformanceStats:
+    """
+    route 별 구간 시간 히스토그램
+        요청마다 캐시에 기록하지 않도록 프로세스에 모아두고 FLUSH_INTERVAL 마다 캐시에 합산함
+        (여러 프로세스의 값을 management command 등에서 합산해서 볼 수 있도록 캐시에 저장)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.last_flush = time.monotonic()
+
+    def record(self, route, timings, options):
+        buckets = options['BUCKETS']
+        with self.lock:
+            stats = self.pending.get(route)
+            if stats is None:
+                stats = self.pending[route] = {'queries': 0}
+            stats['queries'] += timings.queries
+            for name, seconds in timings.durations.items():
+                ms = seconds * 1000
+                field = f'{name}:{bucket_index(buckets, ms)}'
+                stats[field] = stats.get(field, 0) + 1
+                stats[f'{name}:count'] = stats.get(f'{name}:count', 0) + 1
+                # 캐시의 incr() 는 정수만 지원하므로 us 단위로 저장
+                stats[f'{name}:sum'] = stats.get(f'{name}:sum', 0) + round(ms * 1000)
+            flush = time.monotonic() - self.last_flush >= options['FLUSH_INTERVAL']
+        if flush:
+            self.flush(options)
+
+    def flush(self, options=None):
+        options = options or get_performance_options()
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        if not pending:
+            return
+
+        cache = caches[options['CACHE_ALIAS']]
+        routes = cache.get(get_routes_key(), {})
+        new_routes = {get_route_id(route): route for route in pending if get_route_id(route) not in routes}
+        if new_routes:
+            cache.set(get_routes_key(), {**routes, **new_routes}, None)
+        for route, stats in pending.items():
+            route_id = get_route_id(route)
+            for field, value in stats.items():
+                key = get_stats_key(route_id, field)
+                cache.add(key, 0, None)
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    pass
+
+    def clear(self):
+        with self.lock:
+            self.pending = {}
+
+
+_stats = PerformanceStats()
+
+
+def bucket_index(buckets, ms):
+    for index, upper in enumerate(buckets):
+        if ms <= upper:
+            return index
+    return len(buckets)
+
+
+def get_route_id(route):
+    # route 에는 memcached 키에 사용할 수 없는 공백 등이 있으므로 hash 를 사용
+    return hashlib.sha1(route.encode('utf-8')).hexdigest()[:16]
+
+
+def get_routes_key():
+    return f'{KEY_PREFIX}routes'
+
+
+def get_stats_key(route_id, field):
+    return f'{KEY_PREFIX}{route_id}:{field}'
+
+
+def get_stats_fields(buckets):
+    fields = ['queries']
+    for name in METRICS:
+        fields += [f'{name}:count', f'{name}:sum']
+        fields += [f'{name}:{index}' for index in range(len(buckets) + 1)]
+    return fields
+
+
+def record_request(route, timings):
+    """
+    요청 하나의 구간별 시간을 route 의 히스토그램에 추가하고 request_timed signal 을 전송
+    """
+    _stats.record(route, timings, get_performance_options())
+    request_timed.send(sender=RequestTimings, route=route, timings=timings)
+
+
+def flush_performance_stats():
+    _stats.flush()
+
+
+def percentile(buckets, counts, count, q):
+    """
+    히스토그램으로 추정한 q 분위수 (해당 구간의 상한, 마지막 구간이면 None)
+    """
+    rank = q * count
+    cumulative = 0
+    for index, value in enumerate(counts):
+        cumulative += value
+        if cumulative >= rank:
+            return buckets[index] if index < len(buckets) else None
+    return None
+
+
+def get_performance_stats():
+    """
+    route 별 요청 수, 평균 쿼리 수와 구간별 요청 수, 평균, p50/p95/p99(ms, 히스토그램 구간의 상한)
+        이 프로세스에 모인 값도 캐시에 합산한 후 조회함
+    """
+    options = get_performance_options()
+    _stats.flush(options)
+    cache = caches[options['CACHE_ALIAS']]
+    buckets = tuple(options['BUCKETS'])
+    fields = get_stats_fields(buckets)
+
+    stats = {}
+    for route_id, route in sorted(cache.get(get_routes_key(), {}).items(), key=lambda item: item[1]):
+        values = cache.get_many([get_stats_key(route_id, field) for field in fields])
+        values = {field: values.get(get_stats_key(route_id, field), 0) for field in fields}
+        requests = values['total:count']
+        metrics = {}
+        for name in METRICS:
+            count = values[f'{name}:count']
+            if not count:
+                continue
+            counts = [values[f'{name}:{index}'] for index in range(len(buckets) + 1)]
+            metrics[name] = {
+                'count': count,
+                'mean': values[f'{name}:sum'] / count / 1000,
+                'p50': percentile(buckets, counts, count, 0.50),
+                'p95': percentile(buckets, counts, count, 0.95),
+                'p99': percentile(buckets, counts, count, 0.99),
+                'histogram': {str(upper): value for upper, value in zip(buckets + ('inf',), counts)},
+            }
+        stats[route] = {
+            'requests': requests,
+            'queries': values['queries'] / requests if requests else 0.0,
+            'metrics': metrics,
+        }
+    return stats
+
+
+def reset_performance_stats():
+    options = get_performance_options()
+    _stats.clear()
+    cache = caches[options['CACHE_ALIAS']]
+    route_ids = list(cache.get(get_routes_key(), {}))
+    fields = get_stats_fields(options['BUCKETS'])
+    cache.delete_many(
+        [get_stats_key(route_id, field) for route_id in route_ids for field in fields]
+        + [get_routes_key()]
+    )
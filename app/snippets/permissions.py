@@ -9,6 +9,7 @@ __all__ = {
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
     객체의 소유자에게만 쓰기를 허용하는 커스텀 권한
+        owner 객체가 아니라 owner_id 를 비교하므로 owner 를 조회(JOIN)하지 않아도 됨
     """
 
     def has_object_permission(self, request, view, obj):
@@ -18,4 +19,4 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # 쓰기 권한은 코드 조각의 소유자에게만 부여함
-        return obj.owner == request.user
+        return obj.owner_id == request.user.pk
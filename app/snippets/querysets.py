@@ -0,0 +1,116 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework.serializers import BaseSerializer
+
+__all__ = (
+    'SnippetQuerySet',
+    'get_source_field',
+    'select_serializer_fields',
+)
+
+
+def get_source_field(model, source_attrs):
+    """
+    serializer 필드의 source_attrs 가 가리키는 모델 필드와 그 필드까지의 관계 이름
+        ('snippet_stats', 'snippet_count') 처럼 중간 속성은 객체 하나를 가리키는 관계
+        (NULL 이 아닌 ForeignKey, OneToOneField 와 역방향 OneToOneField)여야 함
+    :return: (모델 필드, 관계 이름 list), 모델 필드가 아니면 None
+    """
+    if not source_attrs:
+        return None
+    relations = []
+    for name in source_attrs[:-1]:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not (field.is_relation and (field.many_to_one or field.one_to_one)):
+            return None
+        if field.concrete and field.null:
+            return None
+        relations.append(name)
+        model = field.related_model
+    name = source_attrs[-1]
+    if name == 'pk':
+        name = model._meta.pk.name
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not field.concrete:
+        return None
+    return field, relations
+
+
+def get_field_paths(serializer, prefix=''):
+    """
+    serializer 가 출력하는 모델 필드의 경로와 select_related 가 필요한 관계 경로
+    :return: (only() 에 사용할 경로 list, select_related() 에 사용할 경로 list)
+        모델 필드가 아닌 값을 출력하는 필드가 있으면 None
+    """
+    model = serializer.Meta.model
+    only_paths = []
+    related_paths = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        source = get_source_field(model, field.source_attrs)
+        if source is None:
+            return None
+        model_field, relations = source
+        if relations:
+            if isinstance(field, BaseSerializer):
+                return None
+            # 관계를 거치는 값 (snippet_stats.snippet_count) 은 관계를 JOIN 해서 함께 조회
+            related_paths.append(prefix + '__'.join(relations))
+            only_paths.append(prefix + '__'.join(relations + [model_field.name]))
+            continue
+        name = model_field.name
+
+        if isinstance(field, BaseSerializer):
+            # 중첩된 serializer (예: owner) 는 JOIN 으로 함께 조회
+            nested = get_field_paths(field, prefix=f'{prefix}{name}__')
+            if nested is None:
+                return None
+            only_paths += [prefix + name] + nested[0]
+            related_paths += [prefix + name] + nested[1]
+        else:
+            only_paths.append(prefix + name)
+    return only_paths, related_paths
+
+
+# fields, expand 조합은 요청에 따라 달라지므로 캐시 크기를 제한
+@lru_cache(maxsize=256)
+def get_serializer_field_paths(serializer_class, fields=None, expand=()):
+    options = {} if fields is None and not expand else {'fields': fields, 'expand': expand}
+    return get_field_paths(serializer_class(**options))
+
+
+def select_serializer_fields(queryset, serializer_class, fields=None, expand=(), default_related=()):
+    """
+    serializer_class 가 출력하는 컬럼만 조회하고, 중첩된 관계(owner)는 JOIN 으로 가져옴
+        fields, expand 는 DynamicFieldsMixin 의 인자 (선택하지 않은 컬럼과 펼치지 않은 관계는 조회하지 않음)
+        serializer 가 모델 필드가 아닌 값을 출력하면 default_related 만 JOIN 으로 가져옴
+    """
+    paths = get_serializer_field_paths(serializer_class, fields, expand)
+    if paths is None:
+        return queryset.select_related(*default_related) if default_related else queryset
+    only_paths, related_paths = paths
+    queryset = queryset.only(*only_paths)
+    if related_paths:
+        queryset = queryset.select_related(*related_paths)
+    return queryset
+
+
+class SnippetQuerySet(models.QuerySet):
+    def for_serializer(self, serializer_class, fields=None, expand=()):
+        """
+        serializer_class 가 출력하는 컬럼만 조회
+            (목록 조회시 사용하지 않는 code, highlighted 컬럼을 읽지 않고,
+             각 행마다 owner 를 조회하는 N+1 쿼리가 발생하지 않도록 함)
+        """
+        return select_serializer_fields(
+            self, serializer_class, fields, expand, default_related=('owner',),
+        )
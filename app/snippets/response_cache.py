@@ -0,0 +1,233 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from utils.caches import is_process_local
+
+__all__ = (
+    'CachedResponseMixin',
+    'invalidate_snippet',
+    'invalidate_snippets',
+    'invalidate_user',
+    'invalidate_snippet_owners',
+    'get_snippet_list_scope',
+    'is_response_cache_enabled',
+    'get_response_cache_stats',
+    'reset_response_cache_stats',
+)
+
+DEFAULT_RESPONSE_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60 * 5,
+}
+
+KEY_PREFIX = 'snippets:response:'
+# 요청마다 다시 계산하는 헤더 (ETag, Last-Modified 는 렌더링 전에 snippet_condition 이 추가함)
+UNCACHED_HEADERS = {'etag', 'last-modified', 'set-cookie'}
+ENDPOINTS = (
+    'snippet-list',
+    'snippet-detail',
+    'user-list',
+    'user-detail',
+)
+
+
+def get_response_cache_options():
+    options = dict(DEFAULT_RESPONSE_CACHE)
+    options.update(getattr(settings, 'SNIPPETS_RESPONSE_CACHE', {}))
+    return options
+
+
+def get_response_cache():
+    return caches[get_response_cache_options()['CACHE_ALIAS']]
+
+
+def is_response_cache_enabled():
+    """
+    다른 프로세스에서 변경한 generation 을 볼 수 없는 프로세스별 캐시(LocMemCache)로는 무효화할 수 없으므로 캐시하지 않음
+    """
+    return not is_process_local(get_response_cache_options()['CACHE_ALIAS'])
+
+
+def get_generation_key(scope):
+    return f'{KEY_PREFIX}generation:{scope}'
+
+
+def get_generations(scopes):
+    """
+    scope 별 generation 값
+        캐시된 응답의 키에 generation 을 포함하므로, generation 을 바꾸면 이전 응답은 더이상 사용되지 않음
+        generation 이 캐시에서 삭제된 경우에도 이전 값을 다시 사용하지 않도록 새 값을 만듦
+    """
+    cache = get_response_cache()
+    keys = [get_generation_key(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, uuid.uuid4().hex, None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generations(scopes):
+    get_response_cache().set_many(
+        {get_generation_key(scope): uuid.uuid4().hex for scope in scopes},
+        None,
+    )
+
+
+def get_snippet_list_scope(owner_id=None):
+    """
+    Snippet 목록 응답의 scope
+        ?owner= 로 필터링된 목록은 owner 의 Snippet 만 포함하므로 owner 별 scope 를 사용하고,
+        owner 로 필터링되지 않은 목록(전체, language 등)은 어떤 Snippet 이 바뀌어도 달라질 수 있으므로 하나의 scope 를 사용함
+    """
+    if owner_id is None:
+        return 'snippet-list'
+    return f'snippet-list:owner:{owner_id}'
+
+
+def invalidate_snippet(pk, owner_id):
+    """
+    Snippet 상세 응답과 Snippet 이 포함될 수 있는 목록 응답을 무효화
+    """
+    invalidate_snippets([pk], [owner_id])
+
+
+def invalidate_snippets(pks, owner_ids):
+    bump_generations(
+        [get_snippet_list_scope()]
+        + [get_snippet_list_scope(owner_id) for owner_id in set(owner_ids)]
+        + [f'snippet:{pk}' for pk in pks]
+    )
+
+
+def invalidate_user(pk, snippet_pks=()):
+    """
+    User 목록, 상세 응답과 owner 로 User 를 포함하는 Snippet 목록, 상세 응답을 무효화
+    """
+    bump_generations(
+        ['user-list', f'user:{pk}', get_snippet_list_scope(), get_snippet_list_scope(pk)]
+        + [f'snippet:{snippet_pk}' for snippet_pk in snippet_pks]
+    )
+
+
+def invalidate_snippet_owners(pks):
+    """
+    snippet_count 가 바뀐 User 의 목록, 상세 응답을 무효화 (Snippet 응답의 owner 에는 snippet_count 가 없음)
+    """
+    bump_generations(['user-list'] + [f'user:{pk}' for pk in pks])
+
+
+def get_stats_key(endpoint, name):
+    return f'{KEY_PREFIX}stats:{endpoint}:{name}'
+
+
+def incr_stat(endpoint, name):
+    # 여러 프로세스의 값을 합산할 수 있도록 캐시에 저장
+    cache = get_response_cache()
+    key = get_stats_key(endpoint, name)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_response_cache_stats():
+    cache = get_response_cache()
+    stats = {}
+    for endpoint in ENDPOINTS:
+        hits = cache.get(get_stats_key(endpoint, 'hits'), 0)
+        misses = cache.get(get_stats_key(endpoint, 'misses'), 0)
+        total = hits + misses
+        stats[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+        }
+    return stats
+
+
+def reset_response_cache_stats():
+    get_response_cache().delete_many([
+        get_stats_key(endpoint, name)
+        for endpoint in ENDPOINTS
+        for name in ('hits', 'misses')
+    ])
+
+
+class CachedResponseMixin:
+    """
+    ViewSet 의 list, retrieve 응답(JSON)을 캐시
+        URL(host, query string 포함)과 Accept 헤더, 관련 scope 의 generation 으로 키를 만들고,
+        Snippet, User 의 저장/삭제 signal 에서 관련된 generation 만 변경해서 무효화
+        (CACHE_ALIAS 는 모든 워커 프로세스가 공유하는 캐시여야 하며, LocMemCache 이면 캐시하지 않음)
+        캐시된 응답은 view 에서 설정한 헤더(Content-Type, Vary 등)와 함께 리턴하고,
+        ETag, Last-Modified 와 middleware 의 헤더(Server-Timing 등)는 요청마다 다시 추가됨
+    """
+    # 'snippet' 또는 'user'
+    response_cache_scope = None
+
+    def get_list_cache_scopes(self):
+        return [f'{self.response_cache_scope}-list']
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            f'{self.response_cache_scope}-list',
+            self.get_list_cache_scopes(),
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            f'{self.response_cache_scope}-detail',
+            [f'{self.response_cache_scope}:{kwargs[self.lookup_field]}'],
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cached_response(self, endpoint, scopes, handler, request, *args, **kwargs):
+        if not is_response_cache_enabled():
+            return handler(request, *args, **kwargs)
+
+        # 페이지네이션의 next, previous 는 요청의 host 로 만든 절대 URL 이므로 host 도 키에 포함
+        value = '|'.join(
+            [request.get_host(), request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+            + get_generations(scopes)
+        )
+        key = f'{KEY_PREFIX}{endpoint}:{hashlib.sha1(value.encode("utf-8")).hexdigest()}'
+
+        cached = get_response_cache().get(key)
+        if cached is not None:
+            incr_stat(endpoint, 'hits')
+            content, headers = cached
+            return HttpResponse(content, headers=headers)
+
+        incr_stat(endpoint, 'misses')
+        self.response_cache_key = key
+        return handler(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'response_cache_key', None)
+        if (key is not None
+                and isinstance(response, Response)
+                and response.status_code == 200
+                and getattr(response, 'accepted_renderer', None) is not None
+                and response.accepted_renderer.format == 'json'):
+            # 로그인 여부에 따라 내용이 달라지는 browsable API(HTML) 응답은 캐시하지 않음
+            response.add_post_render_callback(
+                lambda rendered: get_response_cache().set(
+                    key,
+                    (rendered.content, {
+                        name: value for name, value in rendered.items()
+                        if name.lower() not in UNCACHED_HEADERS
+                    }),
+                    get_response_cache_options()['TIMEOUT'],
+                )
+            )
+        return response
@@ -0,0 +1,224 @@
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections, router
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Snippet
+
+__all__ = (
+    'get_search_backend',
+)
+
+DEFAULT_SEARCH = {
+    # 'fts5': SQLite FTS5 인덱스, 'database': 인덱스 없이 icontains 로 검색,
+    # 그 외의 DB는 BaseSearchBackend 를 상속한 클래스의 경로를 지정
+    # None 이면 DB 에 따라 선택 (VENDOR_SEARCH_BACKENDS)
+    'BACKEND': None,
+}
+
+
+def parse_terms(text):
+    """
+    검색어를 공백으로 나눈 단어 list (끝에 * 가 있으면 prefix 검색)
+    :return: [(단어, prefix 여부), ...]
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        if word:
+            terms.append((word, prefix))
+    return terms
+
+
+class BaseSearchBackend:
+    """
+    Snippet 의 title, code 검색 backend
+        index(), remove() 는 Snippet 저장/삭제 signal 과 bulk 저장 경로에서 호출되어 인덱스를 갱신함
+        search() 는 관련도 순으로 정렬된, 슬라이스와 count() 를 지원하는 결과(Paginator 에 전달 가능)를 리턴
+    """
+
+    def __init__(self, using):
+        self.using = using
+
+    def index(self, snippets):
+        pass
+
+    def remove(self, pks):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, text, queryset, language=None, owner=None):
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    전문 검색 인덱스가 없는 DB 용 (모든 단어를 title 또는 code 에 포함하는 Snippet, 최신순)
+    """
+
+    def search(self, text, queryset, language=None, owner=None):
+        terms = parse_terms(text)
+        if not terms:
+            return queryset.none()
+        for word, prefix in terms:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(code__icontains=word))
+        if language is not None:
+            queryset = queryset.filter(language=language)
+        if owner is not None:
+            queryset = queryset.filter(owner_id=owner)
+        return queryset.order_by('-created', '-pk')
+
+
+class FTS5SearchResults:
+    """
+    FTS5 검색 결과
+        슬라이스하면 해당 범위의 pk 만 관련도(bm25) 순으로 조회한 후 queryset 으로 Snippet 을 가져옴
+    """
+
+    def __init__(self, backend, match, queryset, filters):
+        self.backend = backend
+        self.match = match
+        self.queryset = queryset
+        self.filters = filters
+
+    def count(self):
+        return self.backend.count(self.match, self.filters)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        limit = -1 if index.stop is None else max(index.stop - start, 0)
+        pks = self.backend.ranked_pks(self.match, self.filters, start, limit)
+        snippets = self.queryset.in_bulk(pks)
+        return [snippets[pk] for pk in pks if pk in snippets]
+
+
+class FTS5SearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 가상 테이블(snippets_snippet_fts, rowid 가 Snippet 의 pk)을 사용하는 backend
+        title 에 일치하는 Snippet 이 code 에 일치하는 Snippet 보다 높은 순위를 갖도록 가중치를 줌
+    """
+    table = 'snippets_snippet_fts'
+    # bm25() 의 컬럼(title, code)별 가중치
+    weights = (10.0, 1.0)
+
+    def execute(self, sql, params=()):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def index(self, snippets):
+        snippets = list(snippets)
+        if not snippets:
+            return
+        with connections[self.using].cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {self.table} WHERE rowid = %s',
+                [(snippet.pk,) for snippet in snippets],
+            )
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, code) VALUES (%s, %s, %s)',
+                [(snippet.pk, snippet.title, snippet.code) for snippet in snippets],
+            )
+
+    def remove(self, pks):
+        with connections[self.using].cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(pk,) for pk in pks])
+
+    def rebuild(self):
+        self.execute(f'DELETE FROM {self.table}')
+        self.execute(
+            f'INSERT INTO {self.table} (rowid, title, code) '
+            f'SELECT {Snippet._meta.pk.column}, title, code FROM {Snippet._meta.db_table}'
+        )
+        # 증분 갱신으로 나뉜 인덱스 segment 를 하나로 합침
+        self.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+
+    def get_match(self, text):
+        # 검색어를 FTS5 문법으로 해석하지 않도록 각 단어를 문자열로 감싸서 AND 로 연결
+        return ' '.join(
+            '"%s"%s' % (word.replace('"', '""'), '*' if prefix else '')
+            for word, prefix in parse_terms(text)
+        )
+
+    def get_where(self, match, filters):
+        where = [f'{self.table} MATCH %s']
+        params = [match]
+        for column, value in filters.items():
+            where.append(f's.{column} = %s')
+            params.append(value)
+        return ' AND '.join(where), params
+
+    def get_from(self, filters):
+        if not filters:
+            return self.table
+        return f'{self.table} JOIN {Snippet._meta.db_table} s ON s.{Snippet._meta.pk.column} = {self.table}.rowid'
+
+    def count(self, match, filters):
+        where, params = self.get_where(match, filters)
+        return self.execute(f'SELECT COUNT(*) FROM {self.get_from(filters)} WHERE {where}', params)[0][0]
+
+    def ranked_pks(self, match, filters, offset, limit):
+        where, params = self.get_where(match, filters)
+        weights = ', '.join(str(weight) for weight in self.weights)
+        rows = self.execute(
+            f'SELECT {self.table}.rowid FROM {self.get_from(filters)} WHERE {where} '
+            f'ORDER BY bm25({self.table}, {weights}), {self.table}.rowid DESC LIMIT %s OFFSET %s',
+            params + [limit, offset],
+        )
+        return [row[0] for row in rows]
+
+    def search(self, text, queryset, language=None, owner=None):
+        match = self.get_match(text)
+        if not match:
+            return queryset.none()
+        filters = {}
+        if language is not None:
+            filters['language'] = language
+        if owner is not None:
+            filters['owner_id'] = owner
+        return FTS5SearchResults(self, match, queryset, filters)
+
+
+SEARCH_BACKENDS = {
+    'fts5': FTS5SearchBackend,
+    'database': DatabaseSearchBackend,
+}
+
+VENDOR_SEARCH_BACKENDS = {
+    'sqlite': 'fts5',
+}
+
+_search_backends = {}
+
+
+def get_search_backend(using=None):
+    """
+    DB alias 별 검색 backend (SNIPPETS_SEARCH['BACKEND'])
+    """
+    if using is None:
+        using = router.db_for_write(Snippet)
+    if using not in _search_backends:
+        options = dict(DEFAULT_SEARCH)
+        options.update(getattr(settings, 'SNIPPETS_SEARCH', {}))
+        name = options['BACKEND']
+        if name is None:
+            name = VENDOR_SEARCH_BACKENDS.get(connections[using].vendor, 'database')
+        backend = SEARCH_BACKENDS[name] if name in SEARCH_BACKENDS else import_string(name)
+        _search_backends[using] = backend(using)
+    return _search_backends[using]
+
+
+@receiver(setting_changed)
+def reset_search_backend(setting, **kwargs):
+    if setting == 'SNIPPETS_SEARCH':
+        _search_backends.clear()
@@ -1,2 +1,4 @@
+from .fields import *
 from .snippets import *
-from .users import *
\ No newline at end of file
+from .users import *
+from .values import *
\ No newline at end of file
@@ -0,0 +1,72 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from ..performance import timed
+
+__all__ = (
+    'DynamicFieldsMixin',
+    'get_field_options',
+)
+
+
+def split_names(value):
+    # 순서와 중복에 관계없이 같은 값이 되도록 정렬 (get_serializer_field_paths 의 캐시 키로 사용됨)
+    return tuple(sorted({name.strip() for name in value.split(',') if name.strip()}))
+
+
+def get_field_options(query_params):
+    """
+    ?fields=pk,title&expand=owner 를 DynamicFieldsMixin 을 사용하는 serializer 의 인자로 변환
+    """
+    options = {}
+    if 'fields' in query_params:
+        options['fields'] = split_names(query_params['fields'])
+    if 'expand' in query_params:
+        options['expand'] = split_names(query_params['expand'])
+    return options
+
+
+class DynamicFieldsMixin:
+    """
+    fields 로 출력할 필드를 선택하는 serializer
+        fields 를 지정하면 expandable_fields 의 관계 필드는 expand 에 포함된 경우에만 중첩된 객체로,
+        그 외에는 pk 로 출력함 (fields 를 지정하지 않으면 모든 필드를 기본 형태로 출력)
+        querysets.get_field_paths() 가 선택된 필드만 조회하도록 queryset 을 만듦
+    """
+    expandable_fields = ()
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selected_fields = fields
+        self.expand = expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        errors = {}
+        unknown = set(self.expand) - set(self.expandable_fields)
+        if unknown:
+            errors['expand'] = [f'Unknown field: {name}' for name in sorted(unknown)]
+        if self.selected_fields is not None:
+            unknown = set(self.selected_fields) - set(fields)
+            if unknown:
+                errors['fields'] = [f'Unknown field: {name}' for name in sorted(unknown)]
+        if errors:
+            raise ValidationError(errors)
+        if self.selected_fields is None:
+            return fields
+
+        for name in list(fields):
+            if name not in self.selected_fields:
+                del fields[name]
+            elif name in self.expandable_fields and name not in self.expand:
+                # owner_id 컬럼 값만 사용하므로 JOIN 이 필요하지 않음
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return fields
+
+    @timed('serializer')
+    def run_validation(self, data=serializers.empty):
+        return super().run_validation(data)
+
+    @timed('serializer')
+    def to_representation(self, instance):
+        return super().to_representation(instance)
@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 
+from .fields import DynamicFieldsMixin
 from .users import UserListSerializer
+from .values import ValuesListSerializer
 from ..models import Snippet
 
 User = get_user_model()
@@ -9,11 +12,15 @@ User = get_user_model()
 __all__ = (
     'SnippetListSerializer',
     'SnippetDetailSerializer',
+    'SnippetBulkSerializer',
 )
 
 
-class SnippetBaseSerializer(serializers.ModelSerializer):
+class SnippetBaseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     owner = UserListSerializer(required=False)
+    expandable_fields = (
+        'owner',
+    )
 
     class Meta:
         model = Snippet
@@ -31,9 +38,41 @@ class SnippetBaseSerializer(serializers.ModelSerializer):
 
 
 class SnippetListSerializer(SnippetBaseSerializer):
-    pass
+    class Meta(SnippetBaseSerializer.Meta):
+        # many=True 로 목록을 출력할 때 values() 행에서 바로 출력을 만듦
+        list_serializer_class = ValuesListSerializer
 
 
 class SnippetDetailSerializer(SnippetBaseSerializer):
     class Meta(SnippetBaseSerializer.Meta):
-        fields = SnippetBaseSerializer.Meta.fields + ('code',)
\ No newline at end of file
+        fields = SnippetBaseSerializer.Meta.fields + (
+            'code',
+            'highlight_status',
+        )
+        read_only_fields = SnippetBaseSerializer.Meta.read_only_fields + (
+            'highlight_status',
+        )
+
+
+class SnippetBulkSerializer(serializers.ListSerializer):
+    """
+    여러 Snippet 의 생성, 수정 요청을 항목별로 검증하는 ListSerializer
+        잘못된 항목이 있어도 요청 전체를 실패시키지 않고,
+        validated_data 에 항목별 결과({'data': ...} 또는 {'errors': ...})를 입력 순서대로 담음
+        partial(수정)이면 각 항목에 수정할 Snippet 의 pk 가 있어야 함 (결과의 'pk')
+    """
+    def run_child_validation(self, data):
+        result = {}
+        try:
+            if self.partial:
+                result['pk'] = self.get_item_pk(data)
+            result['data'] = super().run_child_validation(data)
+        except ValidationError as exc:
+            result['errors'] = exc.detail
+        return result
+
+    def get_item_pk(self, data):
+        pk = data.get('pk') if isinstance(data, dict) else None
+        if isinstance(pk, bool) or not isinstance(pk, int):
+            raise ValidationError({'pk': ['A valid integer is required.']})
+        return pk
@@ -1,14 +1,18 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from .fields import DynamicFieldsMixin
+from .values import ValuesListSerializer
+
 User = get_user_model()
 
 __all__ = (
     'UserListSerializer',
+    'UserDetailSerializer',
 )
 
 
-class UserBaseSerializer(serializers.ModelSerializer):
+class UserBaseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -18,4 +22,19 @@ class UserBaseSerializer(serializers.ModelSerializer):
 
 
 class UserListSerializer(UserBaseSerializer):
-    pass
\ No newline at end of file
+    class Meta(UserBaseSerializer.Meta):
+        # many=True 로 목록을 출력할 때 values() 행에서 바로 출력을 만듦
+        list_serializer_class = ValuesListSerializer
+
+
+class UserDetailSerializer(UserListSerializer):
+    """
+    User 목록, 상세 API 의 User (Snippet 의 owner 에는 snippet_count 를 포함하지 않음)
+        snippet_count 는 User 생성시 만들어지고 Snippet 생성/삭제시 갱신되는 SnippetOwnerStats 의 값
+    """
+    snippet_count = serializers.IntegerField(source='snippet_stats.snippet_count', read_only=True)
+
+    class Meta(UserListSerializer.Meta):
+        fields = UserListSerializer.Meta.fields + (
+            'snippet_count',
+        )
@@ -0,0 +1,211 @@
+from functools import lru_cache
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Manager, QuerySet
+from django.db.models.query import ModelIterable
+from rest_framework import fields, relations, serializers
+
+from .fields import DynamicFieldsMixin
+from ..performance import timed
+from ..querysets import get_source_field
+
+__all__ = (
+    'ValuesListSerializer',
+    'get_value_reader',
+    'values_for_serializer',
+)
+
+
+def get_converter(field):
+    """
+    field.to_representation() 과 같은 값을 리턴하는 함수 (지원하지 않는 필드면 None)
+        DRF 필드 객체의 메서드 호출 없이 처리할 수 있는 흔한 값은 바로 리턴하고, 그 외의 값은 to_representation() 사용
+    """
+    field_type = type(field)
+    if field_type is fields.IntegerField:
+        return int
+    if field_type is fields.CharField:
+        return str
+    if field_type is fields.ReadOnlyField:
+        return lambda value: value
+    if field_type is fields.BooleanField:
+        to_representation = field.to_representation
+        return lambda value: value if value is True or value is False else to_representation(value)
+    if field_type is fields.ChoiceField:
+        choices = field.choice_strings_to_values
+        to_representation = field.to_representation
+        return lambda value: choices.get(value, value) if type(value) is str and value else to_representation(value)
+    if field_type is relations.PrimaryKeyRelatedField and field.pk_field is None:
+        # 행에는 관계의 pk (owner_id) 가 있으므로 그대로 사용
+        return lambda value: value
+    return None
+
+
+def read_path(path, convert):
+    def read(row):
+        value = row[path]
+        return None if value is None else convert(value)
+    return read
+
+
+def read_attribute(name, convert):
+    def read(instance):
+        value = getattr(instance, name)
+        return None if value is None else convert(value)
+    return read
+
+
+def read_related_attribute(relations, name, convert):
+    def read(instance):
+        # DRF 와 같이 관계된 객체가 없으면 (역방향 OneToOneField) None
+        try:
+            for relation in relations:
+                instance = getattr(instance, relation)
+        except ObjectDoesNotExist:
+            return None
+        value = getattr(instance, name)
+        return None if value is None else convert(value)
+    return read
+
+
+def read_nested_row(path, reader):
+    def read(row):
+        return None if row[path] is None else reader.read_row(row)
+    return read
+
+
+def read_nested_attribute(name, reader):
+    def read(instance):
+        value = getattr(instance, name)
+        return None if value is None else reader.read_instance(value)
+    return read
+
+
+class ValueReader:
+    """
+    serializer 의 출력을 values() 행(dict) 또는 모델 인스턴스에서 바로 만드는 필드별 읽기 함수 모음
+        paths 는 values() 에 전달할 경로 (중첩된 serializer 의 필드는 owner__username 처럼 prefix 를 붙임)
+    """
+
+    def __init__(self, paths, row_readers, instance_readers):
+        self.paths = paths
+        self.row_readers = row_readers
+        self.instance_readers = instance_readers
+
+    def read_row(self, row):
+        return {name: read(row) for name, read in self.row_readers}
+
+    def read_instance(self, instance):
+        return {name: read(instance) for name, read in self.instance_readers}
+
+    def read(self, item):
+        return self.read_row(item) if isinstance(item, dict) else self.read_instance(item)
+
+
+def compile_reader(serializer, prefix=''):
+    """
+    serializer 의 필드별 읽기 함수를 만듦
+    :return: ValueReader, 모델 필드가 아닌 값이나 지원하지 않는 필드를 출력하면 None
+    """
+    # DynamicFieldsMixin.to_representation() 은 처리 시간만 기록하고 Serializer 의 것을 그대로 실행함
+    if type(serializer).to_representation not in (
+            serializers.Serializer.to_representation, DynamicFieldsMixin.to_representation):
+        return None
+    model = serializer.Meta.model
+    paths = []
+    row_readers = []
+    instance_readers = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source_field = get_source_field(model, field.source_attrs)
+        if source_field is None:
+            return None
+        model_field, relations = source_field
+        if relations:
+            # 관계를 거치는 값 (snippet_stats.snippet_count) 은 LEFT JOIN 으로 조회되므로
+            # 관계된 행이 없으면 values() 에서도 None
+            convert = get_converter(field)
+            if convert is None or isinstance(field, serializers.BaseSerializer):
+                return None
+            path = prefix + '__'.join(relations + [model_field.name])
+            paths.append(path)
+            row_readers.append((name, read_path(path, convert)))
+            instance_readers.append((name, read_related_attribute(relations, model_field.attname, convert)))
+            continue
+
+        source = field.source_attrs[0]
+        path = prefix + source
+        if isinstance(field, serializers.BaseSerializer):
+            nested = compile_reader(field, prefix=f'{path}__')
+            if nested is None:
+                return None
+            # 관계가 없는(NULL) 행을 구분하기 위해 외래 키 컬럼(owner_id)도 조회
+            paths += [path] + nested.paths
+            row_readers.append((name, read_nested_row(path, nested)))
+            instance_readers.append((name, read_nested_attribute(source, nested)))
+            continue
+
+        convert = get_converter(field)
+        if convert is None:
+            return None
+        paths.append(path)
+        row_readers.append((name, read_path(path, convert)))
+        # PrimaryKeyRelatedField 는 관계 객체를 조회하지 않도록 owner_id 를 읽음
+        attribute = model_field.attname if model_field.is_relation else source
+        instance_readers.append((name, read_attribute(attribute, convert)))
+    return ValueReader(list(dict.fromkeys(paths)), row_readers, instance_readers)
+
+
+# fields, expand 조합은 요청에 따라 달라지므로 캐시 크기를 제한
+@lru_cache(maxsize=256)
+def get_value_reader(serializer_class, fields=None, expand=()):
+    """
+    serializer_class(fields=fields, expand=expand) 의 ValueReader (빠른 경로를 사용할 수 없으면 None)
+        캐시된 경우 serializer 의 필드를 만들지 않음
+    """
+    options = {} if fields is None and not expand else {'fields': fields, 'expand': expand}
+    return compile_reader(serializer_class(**options))
+
+
+def values_for_serializer(queryset, serializer_class, fields=None, expand=()):
+    """
+    serializer_class 의 목록 출력에 필요한 값만 조회하는 values() queryset
+        페이지네이션에서 사용할 수 있도록 pk 를 항상 포함하며, 빠른 경로를 사용할 수 없으면 queryset 을 그대로 리턴
+    """
+    list_serializer_class = getattr(getattr(serializer_class, 'Meta', None), 'list_serializer_class', None)
+    if not (list_serializer_class and issubclass(list_serializer_class, ValuesListSerializer)):
+        return queryset
+    reader = get_value_reader(serializer_class, fields, expand)
+    if reader is None:
+        return queryset
+    return queryset.values(*dict.fromkeys(['pk'] + reader.paths))
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """
+    읽기 전용 목록 출력을 DRF 필드의 get_attribute(), to_representation() 호출 없이 만드는 ListSerializer
+        (Meta.list_serializer_class 로 지정)
+        모델 queryset 은 values() 로 필요한 컬럼만 조회해서 모델 인스턴스를 만들지 않으며,
+        values() 행과 모델 인스턴스(페이지네이션 결과 등)도 처리함
+        출력은 child serializer 를 항목마다 실행한 결과와 같고, 지원하지 않는 필드가 있으면 기존 방식으로 처리
+    """
+
+    def get_value_reader(self):
+        return get_value_reader(
+            type(self.child),
+            getattr(self.child, 'selected_fields', None),
+            getattr(self.child, 'expand', ()),
+        )
+
+    @timed('serializer')
+    def to_representation(self, data):
+        reader = self.get_value_reader()
+        if reader is None:
+            return super().to_representation(data)
+
+        if isinstance(data, Manager):
+            data = data.all()
+        if isinstance(data, QuerySet) and data._iterable_class is ModelIterable:
+            data = data.values(*reader.paths)
+        return [reader.read(item) for item in data]
@@ -0,0 +1,65 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .counters import incr_snippet_count, update_owner_snippet_counts
+from .models import Snippet, SnippetOwnerStats
+from .response_cache import invalidate_snippet, invalidate_snippet_owners, invalidate_user
+from .search import get_search_backend
+from .serializers import UserListSerializer
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Snippet)
+def snippet_saved(sender, instance, created, using, **kwargs):
+    if created:
+        # DB 에 저장하는 owner 별 개수는 같은 트랜잭션에서 갱신
+        update_owner_snippet_counts({instance.owner_id: 1}, using=using)
+        # rollback 된 생성이 개수에 반영되지 않도록 commit 후에 증가
+        transaction.on_commit(partial(incr_snippet_count, instance.owner_id, 1), using=using)
+        transaction.on_commit(partial(invalidate_snippet_owners, [instance.owner_id]), using=using)
+    # commit 전에 무효화하면 다른 요청이 이전 내용을 다시 캐시할 수 있으므로 commit 후에 무효화
+    transaction.on_commit(partial(invalidate_snippet, instance.pk, instance.owner_id), using=using)
+    # 검색 인덱스는 같은 DB 에 있으므로 같은 트랜잭션에서 갱신
+    # (linenos, style 만 바뀐 경우 등 title, code 가 그대로면 다시 색인하지 않음)
+    if instance.search_inputs_changed():
+        get_search_backend(using).index([instance])
+
+
+@receiver(post_delete, sender=Snippet)
+def snippet_deleted(sender, instance, using, **kwargs):
+    update_owner_snippet_counts({instance.owner_id: -1}, using=using)
+    transaction.on_commit(partial(incr_snippet_count, instance.owner_id, -1), using=using)
+    transaction.on_commit(partial(invalidate_snippet_owners, [instance.owner_id]), using=using)
+    transaction.on_commit(partial(invalidate_snippet, instance.pk, instance.owner_id), using=using)
+    get_search_backend(using).remove([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields, using, raw=False, **kwargs):
+    if created and not raw:
+        # snippet_count 를 조회할 때 항상 행이 있도록 User 와 함께 생성
+        SnippetOwnerStats.objects.using(using).bulk_create(
+            [SnippetOwnerStats(owner_id=instance.pk)], ignore_conflicts=True,
+        )
+    # 로그인시 last_login 만 저장하는 경우 등 응답에 포함되지 않는 필드만 변경되면 무효화하지 않음
+    if update_fields is not None and not set(update_fields) & set(UserListSerializer.Meta.fields):
+        return
+    snippet_pks = ()
+    if not created:
+        snippets = Snippet.objects.using(using).filter(owner_id=instance.pk)
+        snippet_pks = list(snippets.values_list('pk', flat=True))
+        # Snippet 목록, 상세 응답에 owner 가 포함되므로 ETag, Last-Modified 가 바뀌도록 modified 를 갱신
+        snippets.update(modified=timezone.now())
+    transaction.on_commit(partial(invalidate_user, instance.pk, snippet_pks), using=using)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, using, **kwargs):
+    # owner 의 Snippet 들은 CASCADE 로 삭제되면서 각각 무효화됨
+    transaction.on_commit(partial(invalidate_user, instance.pk), using=using)
@@ -1,12 +1,59 @@
+import asyncio
+import csv
+import datetime
+import decimal
+import gzip
+import importlib
+import io
 import json
+import os
 import random
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
 
 from django.contrib.auth import get_user_model
-from rest_framework import status
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers, status
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 
+from utils import parsers, renderers
+from utils.paginations import SnippetCursorPagination
+
+from . import documents
+from .choices import get_choices_cache_path
+from .management.commands import bench_asgi
+from .counters import estimate_snippet_count, get_snippet_count
+from .filters import filter_snippets
+from .highlight import (
+    InstancePool,
+    format_tokens,
+    get_highlight_cache,
+    get_style_sheets,
+    get_tokens,
+    highlight_key,
+    lexer_pool,
+    prewarm_highlight_pool,
+    render_highlight,
+)
+from .serializers import SnippetListSerializer, get_value_reader, values_for_serializer
 from .serializers.users import UserListSerializer
-from .models import Snippet
+from .views import async_view
+from .models import Snippet, SnippetOwnerStats
+from .performance import RequestTimings, get_request_timings, request_timed, reset_performance_stats, timing
+from .permissions import IsOwnerOrReadOnly
+from .response_cache import get_response_cache, get_response_cache_stats, is_response_cache_enabled
+from .search import get_search_backend
+from .worker import get_shared_executor, highlight_pending
 
 from django.core.paginator import Paginator
 
@@ -19,7 +66,53 @@ def get_dummy_user():
     return User.objects.create_user(username=DUMMY_USER_USERNAME)
 
 
-class SnippetListTest(APITestCase):
+class SnippetAPITestCase(APITestCase):
+    """
+    테스트마다 DB는 rollback 되지만 캐시는 남아있으므로, 각 테스트 시작 전에 캐시를 비움
+    """
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
+        get_highlight_cache().clear()
+
+
+class QueryCountTestMixin:
+    """
+    응답에 포함되는 Snippet 수와 관계없이 쿼리 수가 일정한지 확인하는 helper
+    """
+
+    def create_snippets(self, count):
+        # 각 Snippet 마다 다른 owner 를 사용해서 owner 조회가 행마다 발생하면 드러나도록 함
+        for i in range(count):
+            Snippet.objects.create(
+                code=f'a = {i}',
+                owner=User.objects.create_user(username=f'owner{User.objects.count()}'),
+            )
+
+    def assertConstantQueryCount(self, url, sizes=(1, 3), **extra):
+        """
+        Snippet 을 sizes 의 각 개수만큼 만든 후 url 에 GET 요청을 보내고,
+        모든 요청의 쿼리 수가 같은지 확인
+        :return: 마지막 요청에서 실행된 쿼리 목록
+        """
+        counts = []
+        total = 0
+        for size in sizes:
+            self.create_snippets(size - total)
+            total = size
+            for cache in caches.all():
+                cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, **extra)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(len(set(counts)), 1, f'{url}: {counts}')
+        return context.captured_queries
+
+
+class SnippetListTest(SnippetAPITestCase):
     """
     Snippet List요청에 대한 테스트
     """
@@ -97,13 +190,64 @@ class SnippetListTest(APITestCase):
         # for snippet in snippets:
         #     snippets_pk_list.append(snippet.pk)
 
+    def test_snippet_list_cursor_order_by_created_descending(self):
+        """
+        커서 페이지네이션(viewsets_router)의 결과가 (생성일자, pk) 내림차순인지,
+        previous 링크로 되돌아갈 때도 같은 순서인지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        for i in range(random.randint(5, 10)):
+            Snippet.objects.create(
+                code=f'a = {i}',
+                owner=user,
+            )
+        # 생성일자가 같은 Snippet 들은 pk 로 순서가 정해지는지 확인하기 위해 일부의 생성일자를 같게 만듦
+        first = Snippet.objects.order_by('pk').first()
+        Snippet.objects.filter(pk__lte=first.pk + 3).update(created=first.created)
+
+        pages = []
+        url = '/snippets/viewsets_router/snippets/'
+        while url:
+            data = json.loads(self.client.get(url).content)
+            pages.append([item['pk'] for item in data['results']])
+            url = data['next']
+        pk_list = [pk for page in pages for pk in page]
+        self.assertEqual(pk_list, list(Snippet.objects.order_by('-created', '-pk').values_list('pk', flat=True)))
+
+        # 마지막 페이지에서 previous 링크를 따라가며 되돌아가기
+        previous_pages = [pages[-1]]
+        url = data['previous']
+        while url:
+            data = json.loads(self.client.get(url).content)
+            previous_pages.insert(0, [item['pk'] for item in data['results']])
+            url = data['previous']
+        self.assertEqual([pk for page in previous_pages for pk in page], pk_list)
+
+    def test_snippet_list_cursor_page_size(self):
+        """
+        page_size 파라미터로 페이지 크기를 지정할 수 있고, max_page_size 를 넘지 않는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        for i in range(5):
+            Snippet.objects.create(code=f'a = {i}', owner=user)
+        url = '/snippets/viewsets_router/snippets/'
+        data = json.loads(self.client.get(url, {'page_size': 4}).content)
+        self.assertEqual(len(data['results']), 4)
+        # 같은 요청의 캐시된 응답을 사용하지 않도록 캐시를 비움
+        get_response_cache().clear()
+        with mock.patch.object(SnippetCursorPagination, 'max_page_size', 2):
+            data = json.loads(self.client.get(url, {'page_size': 4}).content)
+        self.assertEqual(len(data['results']), 2)
+
 
 CREATE_DATA = '''{
     "code": "print('hello, world')"
 }'''
 
 
-class SnippetCreateTest(APITestCase):
+class SnippetCreateTest(SnippetAPITestCase):
     URL = '/snippets/generic_cbv/snippets/'
 
     def test_snippet_create_status_code(self):
@@ -192,4 +336,2073 @@ class SnippetCreateTest(APITestCase):
         )
 
         # code가 주어지지 않으면 HTTP상태코드가 400이어야 함
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SnippetHighlightCacheTest(SnippetAPITestCase):
+    """
+    Snippet.save()의 하이라이트 캐시 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.cache = get_highlight_cache()
+        self.cache.reset_stats()
+
+    def test_same_input_hits_cache(self):
+        """
+        같은 입력으로 저장하면 두번째부터는 cache hit 인지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        first = Snippet.objects.create(code='a = 1', owner=user)
+        second = Snippet.objects.create(code='a = 1', owner=user)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(first.highlighted, second.highlighted)
+
+    def test_changed_input_misses_cache(self):
+        """
+        하이라이트 결과에 영향을 주는 값이 바뀌면 다시 렌더링하는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        snippet = Snippet.objects.create(code='a = 1', owner=user)
+        snippet.linenos = True
+        snippet.save()
+        self.assertEqual(self.cache.stats()['misses'], 2)
+        self.assertEqual(snippet.highlighted, render_highlight(
+            code='a = 1',
+            language='python',
+            linenos=True,
+        ))
+
+    def test_presentation_change_skips_highlight(self):
+        """
+        style, title 만 바뀌면 캐시도 조회하지 않고 저장된 HTML 조각을 그대로 사용하는지 확인
+        (DB 에서 조회한 Snippet 과 PATCH 요청도 확인)
+        :return:
+        """
+        user = get_dummy_user()
+        snippet = Snippet.objects.create(code='a = 1', owner=user)
+        highlighted = snippet.highlighted
+        snippet.style = 'monokai'
+        snippet.title = 'SnippetTitle'
+        snippet.save()
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+
+        self.client.force_authenticate(user)
+        with mock.patch('snippets.models.highlight_code') as highlight_code:
+            Snippet.objects.get(pk=snippet.pk).save()
+            response = self.client.patch(
+                f'/snippets/viewsets_router/snippets/{snippet.pk}/', {'style': 'friendly'}, format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        highlight_code.assert_not_called()
+        snippet.refresh_from_db()
+        self.assertEqual((snippet.style, snippet.version, snippet.highlighted), ('friendly', 4, highlighted))
+
+    def test_linenos_change_reuses_tokens(self):
+        """
+        linenos 만 바뀌면 캐시된 토큰으로 formatter 만 실행하고, 결과가 직접 렌더링한 것과 같은지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        code = 'def f(x):\n    return "a" + x  # 주석\n\n\tpass\n'
+        snippet = Snippet.objects.create(code=code, owner=user)
+        snippet = Snippet.objects.get(pk=snippet.pk)
+        snippet.linenos = True
+        with mock.patch('snippets.highlight.lex_code') as lex_code:
+            snippet.save()
+        lex_code.assert_not_called()
+        self.assertEqual(snippet.highlighted, render_highlight(code, 'python', True))
+
+        for language in ('python', 'c', 'js', 'html'):
+            tokens = get_tokens(code, language)
+            self.assertEqual(get_tokens(code, language), tokens)
+            for linenos in (False, True):
+                self.assertEqual(format_tokens(tokens, linenos), render_highlight(code, language, linenos))
+
+    def test_highlight_key_field_boundary(self):
+        """
+        필드 경계가 달라지면 다른 키가 만들어지는지 확인
+        :return:
+        """
+        self.assertNotEqual(
+            highlight_key('b', 'python', False),
+            highlight_key('', 'pythonb', False),
+        )
+
+    @override_settings(SNIPPETS_HIGHLIGHT_CACHE={'BACKEND': 'django'})
+    def test_django_cache_clear_keeps_other_keys(self):
+        """
+        Django 캐시 백엔드의 clear()는 하이라이트 항목만 무효화하고 같은 캐시의 다른 키는 남겨두는지 확인
+        :return:
+        """
+        cache = get_highlight_cache()
+        caches['default'].set('other', 'value')
+        cache.set('key', 'highlighted')
+        self.assertEqual(cache.get('key'), 'highlighted')
+
+        cache.clear()
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(caches['default'].get('other'), 'value')
+
+
+@override_settings(SNIPPETS_HIGHLIGHT_ASYNC=True)
+class SnippetAsyncHighlightTest(SnippetAPITestCase):
+    """
+    비동기 하이라이트 모드 테스트
+    """
+    URL = '/snippets/generic_cbv/snippets/'
+
+    def test_create_returns_pending(self):
+        """
+        생성 요청은 하이라이트 없이 pending 상태로 바로 응답하는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        self.client.force_authenticate(user=user)
+        response = self.client.post(self.URL, data={'code': 'a = 1'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = json.loads(response.content)
+        self.assertEqual(data['highlight_status'], Snippet.HIGHLIGHT_PENDING)
+        self.assertEqual(Snippet.objects.get(pk=data['pk']).highlighted, '')
+
+    def test_worker_writes_result(self):
+        """
+        highlight_pending()이 하이라이트 결과를 기록하고 done 상태로 바꾸는지 확인
+        :return:
+        """
+        snippet = Snippet.objects.create(code='a = 1', owner=get_dummy_user())
+        self.assertEqual(highlight_pending(), 1)
+
+        snippet.refresh_from_db()
+        self.assertEqual(snippet.highlight_status, Snippet.HIGHLIGHT_DONE)
+        self.assertEqual(snippet.highlighted, render_highlight(
+            code='a = 1',
+            language='python',
+            linenos=False,
+        ))
+        self.assertEqual(highlight_pending(), 0)
+
+    def test_worker_command_reuses_executor(self):
+        """
+        highlight_worker 명령은 프로세스 풀을 한 번만 만들고 모든 배치에 같은 풀을 넘기는지 확인
+        :return:
+        """
+        with mock.patch('snippets.management.commands.highlight_worker.ProcessPoolExecutor') as pool, \
+                mock.patch('snippets.management.commands.highlight_worker.highlight_pending',
+                           side_effect=[2, 1, 0]) as pending:
+            call_command('highlight_worker', '--once', '--workers', '2', stdout=io.StringIO())
+        pool.assert_called_once_with(max_workers=2)
+        executor = pool.return_value.__enter__.return_value
+        self.assertEqual(pending.call_args_list, [mock.call(batch_size=100, executor=executor)] * 3)
+
+
+class SnippetHighlightFragmentTest(SnippetAPITestCase):
+    """
+    HTML 조각 저장과 style 별 CSS 테스트
+    """
+
+    def test_highlighted_is_fragment(self):
+        """
+        highlighted 에는 <style> 과 문서 wrapper 없이 HTML 조각만 저장되는지 확인
+        :return:
+        """
+        snippet = Snippet.objects.create(
+            code='a = 1',
+            title='<b>SnippetTitle</b>',
+            owner=get_dummy_user(),
+        )
+        self.assertTrue(snippet.highlighted.startswith('<div class="highlight">'))
+        self.assertNotIn('<style', snippet.highlighted)
+
+        document = snippet.render_document()
+        self.assertIn(snippet.highlighted, document)
+        self.assertIn('<h2>&lt;b&gt;SnippetTitle&lt;/b&gt;</h2>', document)
+
+    def test_style_sheet(self):
+        """
+        style 별 CSS 가 ETag 와 함께 전달되고, If-None-Match 에는 304를 리턴하는지 확인
+        :return:
+        """
+        css, etag = get_style_sheets()['monokai']
+        response = self.client.get('/snippets/styles/monokai.css')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content.decode(), css)
+
+        response = self.client.get('/snippets/styles/monokai.css', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get('/snippets/styles/unknown.css')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fragment_migration(self):
+        """
+        0004 마이그레이션의 하이라이트 결과가 현재 렌더링과 같고, 알 수 없는 언어, style 은 실패하지 않는지 확인
+        :return:
+        """
+        migration = importlib.import_module('snippets.migrations.0004_highlighted_fragment')
+        self.assertEqual(migration.render_highlight('a = 1', 'python', True), render_highlight('a = 1', 'python', True))
+        self.assertEqual(
+            migration.render_document('<pre>a</pre>', 'monokai', '<b>'),
+            Snippet(highlighted='<pre>a</pre>', style='monokai', title='<b>').render_document(),
+        )
+        self.assertIn('a = 1', migration.render_highlight('a = 1', 'unknown-language', False))
+        self.assertIn('<pre>a</pre>', migration.render_document('<pre>a</pre>', 'unknown-style', ''))
+
+
+class SnippetHighlightPoolTest(SnippetAPITestCase):
+    """
+    lexer, formatter 인스턴스 pool 테스트
+    """
+
+    def test_pool_reuses_instance_and_evicts_lru(self):
+        """
+        같은 key 에는 같은 인스턴스를 리턴하고, 최대 개수를 넘으면 가장 오래 사용하지 않은 항목을 제거하는지 확인
+        :return:
+        """
+        pool = InstancePool(lambda key: object(), max_size=2)
+        first = pool.get('a')
+        pool.get('b')
+        self.assertIs(pool.get('a'), first)
+        pool.get('c')
+        self.assertEqual(len(pool), 2)
+        self.assertIn('a', pool)
+        self.assertNotIn('b', pool)
+
+    def test_prewarm_most_used_languages(self):
+        """
+        DB에서 많이 사용된 언어 순으로 lexer 를 미리 생성하는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        for language in ('c', 'c', 'rust', 'python'):
+            Snippet.objects.create(code='a', language=language, owner=user)
+        lexer_pool.clear()
+        self.assertEqual(prewarm_highlight_pool(count=1), ['c'])
+        self.assertIn('c', lexer_pool)
+        self.assertNotIn('rust', lexer_pool)
+
+
+class SnippetListQueryTest(QueryCountTestMixin, SnippetAPITestCase):
+    """
+    Snippet List 요청시 owner 를 행마다 조회하지 않는지, 사용하지 않는 컬럼을 읽지 않는지 테스트
+    """
+    URLS = (
+        '/snippets/django_view/snippets/',
+        '/snippets/api_view/snippets/',
+        '/snippets/mixins_view/snippets/',
+        '/snippets/generic_cbv/snippets/',
+        '/snippets/viewsets_router/snippets/',
+    )
+
+    def test_list_query_count_is_constant(self):
+        """
+        각 view 의 목록 요청 쿼리 수가 Snippet 수와 관계없이 일정한지 확인
+        :return:
+        """
+        for url in self.URLS:
+            with self.subTest(url=url):
+                Snippet.objects.all().delete()
+                queries = self.assertConstantQueryCount(url)
+                sql = ' '.join(query['sql'] for query in queries)
+                self.assertNotIn('"highlighted"', sql)
+                self.assertNotIn('"code"', sql)
+
+
+class SnippetCountTest(SnippetAPITestCase):
+    """
+    캐시된 Snippet 개수와 count 모드 테스트
+    """
+    URL = '/snippets/generic_cbv/snippets/'
+
+    def test_count_follows_create_and_delete(self):
+        """
+        생성/삭제 signal 로 캐시된 전체, owner 별 개수가 증감하는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        other = User.objects.create_user(username='other')
+        self.assertEqual(get_snippet_count(), 0)
+        self.assertEqual(get_snippet_count(user.pk), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet = Snippet.objects.create(code='a = 1', owner=user)
+            Snippet.objects.create(code='a = 2', owner=other)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_snippet_count(), 2)
+            self.assertEqual(get_snippet_count(user.pk), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.delete()
+        self.assertEqual(get_snippet_count(), 1)
+        self.assertEqual(get_snippet_count(user.pk), 0)
+        self.assertEqual(get_snippet_count(other.pk), 1)
+
+    def test_list_count_without_count_query(self):
+        """
+        캐시된 개수가 있으면 목록 요청시 COUNT(*) 를 실행하지 않고,
+        count=exact 를 지정하면 실행하는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                Snippet.objects.create(code=f'a = {i}', owner=user)
+        get_snippet_count()
+
+        with CaptureQueriesContext(connection) as context:
+            data = json.loads(self.client.get(self.URL).content)
+        self.assertEqual(data['count'], 5)
+        # 목록 ETag 를 위한 COUNT, MAX 조회는 제외
+        self.assertFalse(any('COUNT(' in query['sql'] and 'MAX(' not in query['sql']
+                             for query in context.captured_queries))
+
+        with CaptureQueriesContext(connection) as context:
+            data = json.loads(self.client.get(self.URL, {'count': 'exact'}).content)
+        self.assertEqual(data['count'], 5)
+        self.assertTrue(any('COUNT(' in query['sql'] for query in context.captured_queries))
+
+    def test_estimated_count(self):
+        """
+        통계 정보가 없으면 캐시된 개수를, ANALYZE 후에는 통계로 추정한 개수를 사용하는지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        for i in range(3):
+            Snippet.objects.create(code=f'a = {i}', owner=user)
+        self.assertEqual(estimate_snippet_count(), 3)
+        if connection.vendor != 'sqlite':
+            return
+
+        caches['default'].clear()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        Snippet.objects.create(code='a = 3', owner=user)
+        data = json.loads(self.client.get(self.URL, {'count': 'estimated'}).content)
+        self.assertEqual(data['count'], 3)
+        data = json.loads(self.client.get(self.URL).content)
+        self.assertEqual(data['count'], 4)
+
+
+class SnippetConditionalGetTest(SnippetAPITestCase):
+    """
+    ETag, Last-Modified 를 사용한 조건부 GET 테스트
+    """
+    FLAVORS = (
+        'django_view',
+        'api_view',
+        'mixins_view',
+        'generic_cbv',
+        'viewsets_router',
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.snippet = Snippet.objects.create(code='a = 1', owner=get_dummy_user())
+
+    def test_detail_not_modified(self):
+        """
+        상세 요청에 If-None-Match, If-Modified-Since 가 일치하면
+        쿼리 한 번만 실행하고 304를 리턴하는지 확인
+        :return:
+        """
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                url = f'/snippets/{flavor}/snippets/{self.snippet.pk}/'
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                etag = response['ETag']
+
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response.content, b'')
+
+                with self.assertNumQueries(1):
+                    response = self.client.get(
+                        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+                    )
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_modified(self):
+        """
+        Snippet 이 수정되면 이전 ETag 로 요청해도 200을 리턴하는지 확인
+        :return:
+        """
+        url = f'/snippets/viewsets_router/snippets/{self.snippet.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.snippet.title = 'SnippetTitle'
+        self.snippet.save()
+        self.assertEqual(self.snippet.version, 2)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_query_string(self):
+        """
+        상세 요청도 query string(?fields=)이 다르면 다른 ETag 를 사용하는지 확인
+        :return:
+        """
+        url = f'/snippets/generic_cbv/snippets/{self.snippet.pk}/'
+        etag = self.client.get(url, {'fields': 'pk'})['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('code', response.json())
+
+    def test_owner_modified(self):
+        """
+        owner 의 username 이 바뀌면 owner 를 포함하는 상세, 목록 응답이 이전 ETag 로도 200을 리턴하는지 확인
+        :return:
+        """
+        urls = ('/snippets/generic_cbv/snippets/', f'/snippets/generic_cbv/snippets/{self.snippet.pk}/')
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        modified = self.snippet.modified
+
+        owner = self.snippet.owner
+        owner.username = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            owner.save()
+        self.snippet.refresh_from_db()
+        self.assertGreater(self.snippet.modified, modified)
+        self.assertEqual(self.snippet.version, 1)
+
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn('renamed', response.content.decode())
+
+    def test_list_not_modified(self):
+        """
+        목록 요청은 생성, 수정, 삭제가 없으면 304를, 있으면 200을 리턴하는지 확인
+        :return:
+        """
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                url = f'/snippets/{flavor}/snippets/'
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+                # query string 이 다르면 다른 ETag
+                self.assertNotEqual(self.client.get(url, {'page': 1})['ETag'], etag)
+
+        url = '/snippets/viewsets_router/snippets/'
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Snippet.objects.create(code='a = 2', owner=self.snippet.owner)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.snippet.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_delete_in_other_process(self):
+        """
+        다른 프로세스에서 삭제되어 이 프로세스의 캐시된 개수가 바뀌지 않아도 목록의 ETag 가 바뀌는지 확인
+        :return:
+        """
+        url = '/snippets/generic_cbv/snippets/'
+        Snippet.objects.create(code='a = 2', owner=self.snippet.owner)
+        self.assertEqual(get_snippet_count(), 2)
+        etag = self.client.get(url)['ETag']
+
+        # signal 과 캐시된 개수를 거치지 않고 삭제 (max(modified) 는 그대로)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM snippets_snippet WHERE id = %s', [self.snippet.pk])
+        self.assertEqual(get_snippet_count(), 2)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class SnippetResponseCacheTest(SnippetAPITestCase):
+    """
+    SnippetViewSet, UserViewSet 응답 캐시 테스트
+    """
+    LIST_URL = '/snippets/viewsets_router/snippets/'
+    USER_LIST_URL = '/snippets/viewsets_router/users/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.snippet = Snippet.objects.create(code='a = 1', owner=self.user)
+        self.other = Snippet.objects.create(code='b = 1', owner=self.user)
+
+    def detail_url(self, snippet):
+        return f'{self.LIST_URL}{snippet.pk}/'
+
+    def test_cached_response(self):
+        """
+        같은 요청은 캐시된 응답을 쿼리 없이 리턴하고 hit rate 가 기록되는지 확인
+        (ETag 계산을 위한 쿼리는 제외)
+        :return:
+        """
+        for url in (self.LIST_URL, self.detail_url(self.snippet)):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                with CaptureQueriesContext(connection) as context:
+                    cached = self.client.get(url)
+                self.assertEqual(cached.status_code, status.HTTP_200_OK)
+                self.assertEqual(cached.content, response.content)
+                self.assertEqual(cached['Content-Type'], response['Content-Type'])
+                self.assertFalse(any('snippets_snippet"."code' in query['sql']
+                                     or 'auth_user' in query['sql']
+                                     for query in context.captured_queries))
+
+        stats = get_response_cache_stats()
+        self.assertEqual(stats['snippet-list'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+        self.assertEqual(stats['snippet-detail'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_query_params_and_cursor(self):
+        """
+        query string (page_size, cursor) 이 다르면 다른 응답을 리턴하는지 확인
+        :return:
+        """
+        first = self.client.get(self.LIST_URL, {'page_size': 1}).json()
+        self.assertEqual(len(first['results']), 1)
+        second = self.client.get(first['next']).json()
+        self.assertEqual(len(second['results']), 1)
+        self.assertNotEqual(first['results'][0]['pk'], second['results'][0]['pk'])
+        self.assertEqual(len(self.client.get(self.LIST_URL).json()['results']), 2)
+
+    @override_settings(ALLOWED_HOSTS=['a.example.com', 'b.example.com'])
+    def test_host(self):
+        """
+        host 가 다르면 다른 응답을 사용해서 next URL 이 요청한 host 로 만들어지는지 확인
+        :return:
+        """
+        for host in ('a.example.com', 'b.example.com'):
+            with self.subTest(host=host):
+                response = self.client.get(self.LIST_URL, {'page_size': 1}, HTTP_HOST=host)
+                self.assertTrue(response.json()['next'].startswith(f'http://{host}/'))
+
+    def test_cached_headers(self):
+        """
+        캐시된 응답도 처음 응답과 같은 헤더를 리턴하고, ETag 는 Snippet 이 수정되면 바뀌는지 확인
+        :return:
+        """
+        url = self.detail_url(self.snippet)
+        response = self.client.get(url)
+        cached = self.client.get(url)
+        self.assertEqual(get_response_cache_stats()['snippet-detail']['hits'], 1)
+        self.assertEqual(dict(cached.items()), dict(response.items()))
+
+        Snippet.objects.filter(pk=self.snippet.pk).update(version=2)
+        self.assertNotEqual(self.client.get(url)['ETag'], response['ETag'])
+
+    def test_owner_list_invalidation(self):
+        """
+        Snippet 이 수정되면 owner 로 필터링된 목록 중 해당 owner 의 목록만 무효화되는지 확인
+        :return:
+        """
+        other = Snippet.objects.create(code='c = 1', owner=User.objects.create_user('other'))
+        owner_url = f'{self.LIST_URL}?owner={self.user.pk}'
+        other_url = f'{self.LIST_URL}?owner={other.owner_id}'
+        for url in (owner_url, other_url):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.snippet.title = 'SnippetTitle'
+            self.snippet.save()
+
+        self.assertIn('SnippetTitle', self.client.get(owner_url).content.decode())
+        self.client.get(other_url)
+        self.assertEqual(get_response_cache_stats()['snippet-list']['hits'], 1)
+
+    def test_snippet_invalidation(self):
+        """
+        Snippet 수정시 해당 Snippet 상세와 목록만 무효화되는지 확인
+        :return:
+        """
+        detail_url = self.detail_url(self.snippet)
+        other_url = self.detail_url(self.other)
+        for url in (self.LIST_URL, detail_url, other_url):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.snippet.title = 'SnippetTitle'
+            self.snippet.save()
+
+        self.assertEqual(self.client.get(detail_url).json()['title'], 'SnippetTitle')
+        self.assertIn('SnippetTitle', self.client.get(self.LIST_URL).content.decode())
+        self.client.get(other_url)
+        stats = get_response_cache_stats()
+        self.assertEqual(stats['snippet-detail']['hits'], 1)
+        self.assertEqual(stats['snippet-list']['hits'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.snippet.delete()
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(len(self.client.get(self.LIST_URL).json()['results']), 1)
+
+    def test_user_invalidation(self):
+        """
+        User 의 username 이 바뀌면 User 응답과 owner 로 포함된 Snippet 응답이 무효화되고,
+        응답에 포함되지 않는 필드만 저장하면 무효화되지 않는지 확인
+        :return:
+        """
+        user_url = f'{self.USER_LIST_URL}{self.user.pk}/'
+        detail_url = self.detail_url(self.snippet)
+        for url in (self.USER_LIST_URL, user_url, self.LIST_URL, detail_url):
+            self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.user.save(update_fields=['last_login'])
+        self.assertEqual(callbacks, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = 'renamed'
+            self.user.save()
+
+        self.assertEqual(self.client.get(user_url).json()['username'], 'renamed')
+        self.assertEqual(self.client.get(detail_url).json()['owner']['username'], 'renamed')
+        self.assertIn('renamed', self.client.get(self.USER_LIST_URL).content.decode())
+        self.assertIn('renamed', self.client.get(self.LIST_URL).content.decode())
+
+    def test_browsable_api_not_cached(self):
+        """
+        로그인 여부에 따라 달라지는 HTML 응답은 캐시하지 않는지 확인
+        :return:
+        """
+        self.client.get(self.LIST_URL, HTTP_ACCEPT='text/html')
+        self.client.get(self.LIST_URL, HTTP_ACCEPT='text/html')
+        self.assertEqual(get_response_cache_stats()['snippet-list']['hits'], 0)
+
+    def test_file_based_cache(self):
+        """
+        settings 의 공유 캐시(파일 기반 캐시 backend)에서 캐시와 무효화가 동작하는지 확인
+        :return:
+        """
+        self.assertTrue(is_response_cache_enabled())
+        url = self.detail_url(self.snippet)
+        self.client.get(url)
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.snippet.title = 'SnippetTitle'
+            self.snippet.save()
+        self.assertEqual(self.client.get(url).json()['title'], 'SnippetTitle')
+        self.assertEqual(get_response_cache_stats()['snippet-detail'],
+                         {'hits': 1, 'misses': 2, 'hit_rate': 1 / 3})
+
+    @override_settings(SNIPPETS_RESPONSE_CACHE={'CACHE_ALIAS': 'default'})
+    def test_process_local_cache(self):
+        """
+        다른 프로세스의 무효화를 볼 수 없는 LocMemCache 이면 응답을 캐시하지 않고, 통계 명령은 실패하는지 확인
+        :return:
+        """
+        self.assertFalse(is_response_cache_enabled())
+        url = self.detail_url(self.snippet)
+        self.client.get(url)
+        # signal 을 거치지 않고 수정해도 캐시하지 않았으므로 새 값을 리턴
+        Snippet.objects.filter(pk=self.snippet.pk).update(title='SnippetTitle')
+        self.assertEqual(self.client.get(url).json()['title'], 'SnippetTitle')
+        with self.assertRaisesMessage(CommandError, 'process-local'):
+            call_command('response_cache_stats', stdout=io.StringIO())
+
+
+class SnippetBulkTest(SnippetAPITestCase):
+    """
+    여러 Snippet 을 한 번에 생성, 수정, 삭제하는 bulk API 테스트
+    """
+    URL = '/snippets/viewsets_router/snippets/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create(self):
+        """
+        항목별 결과를 입력 순서대로 리턴하고, 잘못된 항목만 생성되지 않는지,
+        save() 와 같은 하이라이트 결과가 저장되는지 확인
+        :return:
+        """
+        response = self.client.post(self.URL, [
+            {'code': 'a = 1', 'language': 'python', 'linenos': True},
+            {'title': 'no code'},
+            {'code': 'b = 2', 'style': 'monokai'},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()
+        self.assertEqual([item['status'] for item in results], [201, 400, 201])
+        self.assertIn('code', results[1]['errors'])
+
+        snippet = Snippet.objects.get(pk=results[0]['data']['pk'])
+        self.assertEqual(snippet.owner, self.user)
+        self.assertEqual(snippet.highlighted, render_highlight('a = 1', 'python', True))
+        self.assertEqual(snippet.highlight_status, Snippet.HIGHLIGHT_DONE)
+        self.assertEqual(Snippet.objects.count(), 2)
+
+    def test_bulk_create_ndjson(self):
+        """
+        NDJSON 요청을 처리하고, 생성 후 캐시된 개수가 다시 계산되는지 확인
+        :return:
+        """
+        self.assertEqual(get_snippet_count(self.user.pk), 0)
+        body = '\n'.join(json.dumps({'code': f'a = {i}'}) for i in range(3)) + '\n'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.URL, body, content_type='application/x-ndjson')
+        self.assertEqual([item['status'] for item in response.json()], [201] * 3)
+        self.assertEqual(get_snippet_count(self.user.pk), 3)
+
+        response = self.client.post(self.URL, '{"code": "a"}\n{', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_query_count(self):
+        """
+        생성할 항목 수와 관계없이 트랜잭션(BATCH_SIZE)당 일정한 수의 쿼리를 실행하는지 확인
+        :return:
+        """
+        counts = []
+        for size in (2, 20):
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(self.URL, [{'code': f'a = {i}'} for i in range(size)], format='json')
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    @override_settings(SNIPPETS_BULK={'WORKERS': 1, 'MIN_PARALLEL': 2})
+    def test_bulk_create_shared_executor(self):
+        """
+        MIN_PARALLEL 개 이상을 렌더링하는 요청들은 요청마다 프로세스 풀을 만들지 않고 같은 풀을 사용하는지,
+        적은 항목은 현재 프로세스에서 처리하는지 확인
+        :return:
+        """
+        executor = get_shared_executor()
+        with mock.patch('snippets.worker.get_shared_executor', return_value=executor) as get_executor, \
+                mock.patch('snippets.worker.ProcessPoolExecutor') as pool:
+            for codes in (['a = 1', 'b = 2'], ['c = 3', 'd = 4'], ['e = 5']):
+                response = self.client.post(self.URL, [{'code': code} for code in codes], format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pool.assert_not_called()
+        self.assertEqual(get_executor.call_count, 2)
+        self.assertIs(get_shared_executor(), executor)
+        self.assertEqual(
+            Snippet.objects.get(code='c = 3').highlighted,
+            render_highlight('c = 3', 'python', False),
+        )
+
+    @override_settings(SNIPPETS_BULK={'WORKERS': 1, 'MIN_PARALLEL': 2})
+    def test_bulk_create_broken_executor(self):
+        """
+        공유 프로세스 풀의 워커 프로세스가 종료되어 풀이 깨져도 다음 요청은 새 풀로 처리되는지 확인
+        :return:
+        """
+        executor = get_shared_executor()
+        executor.submit(int).result(timeout=30)
+        for pid in list(executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        with self.assertRaises(BrokenProcessPool):
+            executor.submit(int).result(timeout=30)
+
+        response = self.client.post(self.URL, [{'code': 'a = 1'}, {'code': 'b = 2'}], format='json')
+        self.assertEqual([item['status'] for item in response.json()], [201, 201])
+        self.assertEqual(
+            Snippet.objects.get(code='b = 2').highlighted,
+            render_highlight('b = 2', 'python', False),
+        )
+        self.assertIsNot(get_shared_executor(), executor)
+
+    def test_bulk_update(self):
+        """
+        하이라이트 입력이 바뀐 항목만 다시 하이라이트하고 version 이 증가하는지,
+        다른 User 의 Snippet 은 수정되지 않는지 확인
+        :return:
+        """
+        snippet = Snippet.objects.create(code='a = 1', owner=self.user)
+        titled = Snippet.objects.create(code='b = 1', owner=self.user)
+        other = Snippet.objects.create(code='c = 1', owner=User.objects.create_user('other'))
+
+        response = self.client.patch(self.URL, [
+            {'pk': snippet.pk, 'code': 'a = 2'},
+            {'pk': titled.pk, 'title': 'SnippetTitle'},
+            {'pk': other.pk, 'title': 'SnippetTitle'},
+            {'title': 'no pk'},
+        ], format='json')
+        self.assertEqual([item['status'] for item in response.json()], [200, 200, 404, 400])
+
+        snippet.refresh_from_db()
+        self.assertEqual(snippet.highlighted, render_highlight('a = 2', 'python', False))
+        self.assertEqual(snippet.version, 2)
+        titled.refresh_from_db()
+        self.assertEqual(titled.title, 'SnippetTitle')
+        self.assertEqual(titled.highlighted, render_highlight('b = 1', 'python', False))
+        other.refresh_from_db()
+        self.assertEqual(other.title, '')
+
+    def test_bulk_delete(self):
+        """
+        자신의 Snippet 만 삭제되는지 확인
+        :return:
+        """
+        snippet = Snippet.objects.create(code='a = 1', owner=self.user)
+        other = Snippet.objects.create(code='c = 1', owner=User.objects.create_user('other'))
+        response = self.client.delete(self.URL, [snippet.pk, {'pk': other.pk}, 'x'], format='json')
+        self.assertEqual([item['status'] for item in response.json()], [204, 404, 400])
+        self.assertEqual(list(Snippet.objects.values_list('pk', flat=True)), [other.pk])
+
+    def test_bulk_requires_authentication(self):
+        """
+        로그인하지 않은 요청은 거부되는지 확인
+        :return:
+        """
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.URL, [{'code': 'a = 1'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class SnippetExportTest(SnippetAPITestCase):
+    """
+    NDJSON, CSV 스트리밍 내보내기 테스트
+    """
+    URL = '/snippets/export/snippets.'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.other = User.objects.create_user('other')
+        self.snippets = [
+            Snippet.objects.create(code='a = 1\nb = "\u00e9"', owner=self.user),
+            Snippet.objects.create(code='int a;', language='c', owner=self.user),
+            Snippet.objects.create(code='c = 3', owner=self.other),
+        ]
+
+    def test_export_ndjson(self):
+        """
+        모든 Snippet 을 pk 순서로 스트리밍하고, 행 수와 관계없이 쿼리를 한 번만 실행하는지 확인
+        :return:
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.URL + 'ndjson')
+            self.assertTrue(response.streaming)
+            content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        items = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([item['pk'] for item in items], [snippet.pk for snippet in self.snippets])
+        self.assertEqual(items[0]['code'], self.snippets[0].code)
+        self.assertEqual(items[0]['owner'], DUMMY_USER_USERNAME)
+
+    def test_export_csv(self):
+        """
+        CSV 는 header 와 줄바꿈이 포함된 code 를 올바르게 출력하는지 확인
+        :return:
+        """
+        response = self.client.get(self.URL + 'csv')
+        content = b''.join(response.streaming_content).decode('utf-8')
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['code'], self.snippets[0].code)
+
+    def test_export_filters(self):
+        """
+        owner, language, created 범위 필터와 잘못된 값 처리 확인
+        :return:
+        """
+        def exported_pks(params):
+            response = self.client.get(self.URL + 'ndjson', params)
+            return [json.loads(line)['pk'] for line in b''.join(response.streaming_content).splitlines()]
+
+        first, second, third = self.snippets
+        self.assertEqual(exported_pks({'owner': self.user.pk}), [first.pk, second.pk])
+        self.assertEqual(exported_pks({'owner': self.user.pk, 'language': 'c'}), [second.pk])
+        self.assertEqual(exported_pks({'created_after': second.created.isoformat()}), [second.pk, third.pk])
+        self.assertEqual(exported_pks({'created_before': second.created.isoformat()}), [first.pk])
+        self.assertEqual(exported_pks({'created_before': '2000-01-01'}), [])
+
+        self.assertEqual(self.client.get(self.URL + 'ndjson', {'owner': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.URL + 'ndjson', {'created_after': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.URL + 'xml').status_code, 404)
+
+    def test_export_command(self):
+        """
+        export_snippets 명령이 API 와 같은 내용을 출력하는지 확인
+        :return:
+        """
+        stdout = io.StringIO()
+        call_command('export_snippets', format='csv', owner='other', stdout=stdout)
+        response = self.client.get(self.URL + 'csv', {'owner': self.other.pk})
+        self.assertEqual(stdout.getvalue(), b''.join(response.streaming_content).decode('utf-8'))
+
+
+class SnippetImportTest(SnippetAPITestCase):
+    """
+    import_snippets 명령 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'snippets.ndjson')
+
+    def tearDown(self):
+        self.directory.cleanup()
+        super().tearDown()
+
+    def write_lines(self, lines):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def import_snippets(self, *args, **options):
+        stdout = io.StringIO()
+        call_command('import_snippets', self.path, *args, stdout=stdout, stderr=io.StringIO(), **options)
+        return stdout.getvalue()
+
+    def test_import_same_as_save(self):
+        """
+        export_snippets 출력을 가져오면 save() 로 저장한 것과 같은 내용과 하이라이트 결과,
+        원래의 created 로 저장되는지 확인
+        :return:
+        """
+        originals = [
+            Snippet.objects.create(title='t', code='a = 1', linenos=True, owner=self.user),
+            Snippet.objects.create(code='int a;', language='c', style='monokai', owner=self.user),
+        ]
+        call_command('export_snippets', output=self.path)
+        Snippet.objects.all().delete()
+
+        output = self.import_snippets(workers=0)
+        self.assertIn('2 imported, 0 skipped', output)
+        fields = ('title', 'code', 'linenos', 'language', 'style', 'owner_id', 'highlighted', 'created')
+        imported = list(Snippet.objects.order_by('pk').values_list(*fields))
+        self.assertEqual(imported, [tuple(getattr(s, f) for f in fields) for s in originals])
+
+    def test_import_process_pool(self):
+        """
+        프로세스 풀과 여러 batch, window 를 사용해도 입력 순서대로 모두 저장되는지 확인
+        :return:
+        """
+        self.write_lines(
+            json.dumps({'code': f'a = {i}', 'owner': DUMMY_USER_USERNAME}) for i in range(7)
+        )
+        self.import_snippets(workers=2, batch_size=2, window=2)
+        codes = list(Snippet.objects.order_by('pk').values_list('code', 'highlighted'))
+        self.assertEqual(codes, [(f'a = {i}', render_highlight(f'a = {i}', 'python', False)) for i in range(7)])
+
+    def test_import_skips_invalid_rows(self):
+        """
+        잘못된 행과 없는 owner 는 건너뛰고, owner 조회는 username 당 한 번만 실행되는지 확인
+        :return:
+        """
+        self.write_lines([
+            json.dumps({'code': 'a = 1', 'owner': DUMMY_USER_USERNAME}),
+            '{',
+            json.dumps({'code': 'a = 2', 'owner': 'nobody'}),
+            json.dumps({'code': 'a = 3', 'owner': DUMMY_USER_USERNAME, 'language': 'x'}),
+            json.dumps({'code': 'a = 4', 'owner': DUMMY_USER_USERNAME}),
+        ])
+        with CaptureQueriesContext(connection) as context:
+            output = self.import_snippets(workers=0)
+        self.assertIn('2 imported, 3 skipped', output)
+        owner_queries = [q for q in context.captured_queries if 'FROM "auth_user"' in q['sql']]
+        self.assertEqual(len(owner_queries), 2)
+
+        self.import_snippets(workers=0, create_owners=True)
+        self.assertTrue(Snippet.objects.filter(owner__username='nobody').exists())
+
+    def test_import_resume_from_checkpoint(self):
+        """
+        checkpoint 에 기록된 행 이후부터 가져오는지 확인
+        :return:
+        """
+        self.write_lines(
+            json.dumps({'code': f'a = {i}', 'owner': DUMMY_USER_USERNAME}) for i in range(5)
+        )
+        checkpoint = os.path.join(self.directory.name, 'checkpoint')
+        with open(checkpoint, 'w') as f:
+            f.write('3')
+        self.import_snippets(workers=0, batch_size=1, checkpoint=checkpoint)
+        self.assertEqual(list(Snippet.objects.order_by('pk').values_list('code', flat=True)), ['a = 3', 'a = 4'])
+        with open(checkpoint) as f:
+            self.assertEqual(f.read(), '5')
+
+
+class SnippetSearchTest(SnippetAPITestCase):
+    """
+    title, code 전문 검색 테스트
+    """
+    URL = '/snippets/viewsets_router/snippets/search/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.other = User.objects.create_user('other')
+        self.in_code = Snippet.objects.create(code='def highlight_code(): pass', owner=self.user)
+        self.in_title = Snippet.objects.create(
+            title='highlight_code example', code='x = 1', language='c', owner=self.other,
+        )
+        Snippet.objects.create(code='print(1)', owner=self.user)
+
+    def search(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def pks(self, **params):
+        return [item['pk'] for item in self.search(**params)['results']]
+
+    def test_search_ranked(self):
+        """
+        title 에 일치하는 Snippet 이 먼저 나오고, '_' 를 포함한 식별자와 prefix 로 검색되는지 확인
+        :return:
+        """
+        self.assertEqual(self.pks(q='highlight_code'), [self.in_title.pk, self.in_code.pk])
+        self.assertEqual(self.pks(q='highlight*'), [self.in_title.pk, self.in_code.pk])
+        self.assertEqual(self.pks(q='highlight'), [])
+        self.assertEqual(self.pks(q='highlight_code pass'), [self.in_code.pk])
+        self.assertEqual(self.pks(q=''), [])
+        # FTS5 문법으로 해석되지 않음
+        self.assertEqual(self.pks(q='"OR NEAR('), [])
+
+    def test_search_filters_and_pagination(self):
+        """
+        language, owner 필터와 페이지네이션 확인
+        :return:
+        """
+        self.assertEqual(self.pks(q='highlight_code', language='c'), [self.in_title.pk])
+        self.assertEqual(self.pks(q='highlight_code', owner=self.user.pk), [self.in_code.pk])
+
+        data = self.search(q='highlight_code', page_size=1)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([item['pk'] for item in data['results']], [self.in_title.pk])
+        self.assertEqual(self.pks(q='highlight_code', page_size=1, page=2), [self.in_code.pk])
+
+    def test_index_updated(self):
+        """
+        저장, 삭제, bulk 생성시 인덱스가 갱신되고, rebuild 결과가 같은지 확인
+        :return:
+        """
+        self.in_code.code = 'def render_document(): pass'
+        self.in_code.save()
+        self.assertEqual(self.pks(q='highlight_code'), [self.in_title.pk])
+        self.assertEqual(self.pks(q='render_document'), [self.in_code.pk])
+
+        self.in_title.delete()
+        self.assertEqual(self.pks(q='highlight_code'), [])
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post('/snippets/viewsets_router/snippets/bulk/', [{'code': 'bulk_created = 1'}], format='json')
+        self.assertEqual(len(self.pks(q='bulk_created')), 1)
+
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.pks(q='render_document'), [self.in_code.pk])
+        self.assertEqual(len(self.pks(q='bulk_created')), 1)
+
+    def test_index_only_when_text_changed(self):
+        """
+        title, code 가 바뀐 경우에만 다시 색인하는지 확인 (linenos, style 만 바뀐 저장은 인덱스를 쓰지 않음)
+        :return:
+        """
+        snippet = Snippet.objects.get(pk=self.in_code.pk)
+        for field, value, indexed in (('linenos', True, False), ('style', 'monokai', False),
+                                      ('title', 'SnippetTitle', True), ('code', 'b = 1', True)):
+            with self.subTest(field=field):
+                setattr(snippet, field, value)
+                with CaptureQueriesContext(connection) as context:
+                    snippet.save()
+                sql = ' '.join(query['sql'] for query in context.captured_queries)
+                self.assertEqual('snippets_snippet_fts' in sql, indexed)
+        self.assertEqual(self.pks(q='SnippetTitle'), [snippet.pk])
+
+    @override_settings(SNIPPETS_SEARCH={'BACKEND': 'database'})
+    def test_database_backend(self):
+        """
+        인덱스가 없는 DB 용 backend 도 같은 조건으로 검색하는지 확인
+        :return:
+        """
+        self.assertEqual(type(get_search_backend()).__name__, 'DatabaseSearchBackend')
+        self.assertEqual(set(self.pks(q='highlight_code')), {self.in_title.pk, self.in_code.pk})
+        self.assertEqual(self.pks(q='highlight_code', language='c'), [self.in_title.pk])
+
+
+class SnippetFilterTest(QueryCountTestMixin, SnippetAPITestCase):
+    """
+    목록 필터와 필터 조건별 인덱스 사용 테스트
+    """
+    FLAVORS = (
+        'django_view',
+        'api_view',
+        'mixins_view',
+        'generic_cbv',
+        'viewsets_router',
+    )
+    # 목록 view 들의 정렬 (Meta.ordering, SnippetCursorPagination)
+    ORDERINGS = (
+        ('-created',),
+        ('-created', '-pk'),
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.other = User.objects.create_user('other')
+        self.python = Snippet.objects.create(code='a = 1', owner=self.user)
+        self.c = Snippet.objects.create(
+            code='int a;', language='c', style='monokai', linenos=True, owner=self.other,
+        )
+
+    def get_pks(self, flavor, params):
+        response = self.client.get(f'/snippets/{flavor}/snippets/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        results = data['results'] if isinstance(data, dict) else data
+        return {item['pk'] for item in results}
+
+    def test_filters(self):
+        """
+        모든 목록 view 에서 각 필터가 동작하고, 잘못된 값은 400을 리턴하는지 확인
+        :return:
+        """
+        cases = (
+            ({'language': 'c'}, {self.c.pk}),
+            ({'style': 'monokai'}, {self.c.pk}),
+            ({'owner': self.user.pk}, {self.python.pk}),
+            ({'linenos': 'true'}, {self.c.pk}),
+            ({'linenos': '0'}, {self.python.pk}),
+            ({'created_after': self.c.created.isoformat()}, {self.c.pk}),
+            ({'created_before': self.c.created.isoformat()}, {self.python.pk}),
+            ({'language': 'c', 'owner': self.user.pk}, set()),
+        )
+        for flavor in self.FLAVORS:
+            for params, expected in cases:
+                with self.subTest(flavor=flavor, params=params):
+                    self.assertEqual(self.get_pks(flavor, params), expected)
+            for params in ({'owner': 'x'}, {'linenos': 'x'}, {'created_after': 'x'}):
+                with self.subTest(flavor=flavor, params=params):
+                    response = self.client.get(f'/snippets/{flavor}/snippets/', params)
+                    self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_owner_filter_uses_cached_count(self):
+        """
+        owner 로만 필터링된 목록은 COUNT(*) 대신 owner 별 캐시된 개수를 사용하는지 확인
+        :return:
+        """
+        url = '/snippets/generic_cbv/snippets/'
+        self.assertEqual(self.client.get(url, {'owner': self.user.pk}).json()['count'], 1)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, {'owner': self.user.pk})
+        # 목록 ETag 를 위한 COUNT, MAX 조회는 제외
+        self.assertFalse(any('COUNT(' in query['sql'] and 'MAX(' not in query['sql']
+                             for query in context.captured_queries))
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertIn('USING', plan)
+        self.assertNotRegex(plan, r'SCAN snippets_snippet(\n|$)')
+        self.assertNotIn('TEMP B-TREE', plan)
+        return plan
+
+    def test_query_plan(self):
+        """
+        각 필터와 정렬 조합의 쿼리가 전체 테이블 scan, 정렬용 임시 B-tree 없이 인덱스를 사용하는지 확인
+        (EXPLAIN QUERY PLAN)
+        :return:
+        """
+        created = self.c.created.isoformat()
+        cases = (
+            ({}, 'snippets_created_id_idx'),
+            ({'language': 'c'}, 'snippets_language_created_idx'),
+            ({'style': 'monokai'}, 'snippets_style_created_idx'),
+            ({'owner': self.user.pk}, 'snippets_owner_created_idx'),
+            ({'linenos': 'true'}, 'snippets_linenos_created_idx'),
+            ({'created_after': created}, 'snippets_created_id_idx'),
+            ({'created_before': created}, 'snippets_created_id_idx'),
+            ({'language': 'c', 'created_after': created}, 'snippets_language_created_idx'),
+            ({'owner': self.user.pk, 'created_before': created}, 'snippets_owner_created_idx'),
+        )
+        for params, index in cases:
+            for ordering in self.ORDERINGS:
+                with self.subTest(params=params, ordering=ordering):
+                    queryset = filter_snippets(
+                        Snippet.objects.for_serializer(SnippetListSerializer), params,
+                    ).order_by(*ordering)
+                    self.assertIn(index, self.assertUsesIndex(queryset))
+
+
+class SnippetFieldSelectionTest(SnippetAPITestCase):
+    """
+    ?fields=, ?expand= 테스트
+    """
+    LIST_URL = '/snippets/viewsets_router/snippets/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.snippet = Snippet.objects.create(title='t', code='a = 1\n' * 100, owner=self.user)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # 조건부 GET 을 위한 ETag 조회 쿼리를 제외한 Snippet, User 조회 쿼리
+        queries = [query['sql'] for query in context.captured_queries
+                   if '"title"' in query['sql'] or '"username"' in query['sql']]
+        return response, queries
+
+    def test_sparse_fields(self):
+        """
+        선택한 필드만 출력하고, 선택하지 않은 컬럼과 owner 를 DB 에서 조회하지 않는지 확인
+        :return:
+        """
+        flavors = ('django_view', 'api_view', 'mixins_view', 'generic_cbv', 'viewsets_router')
+        for flavor in flavors:
+            for url in (f'/snippets/{flavor}/snippets/', f'/snippets/{flavor}/snippets/{self.snippet.pk}/'):
+                with self.subTest(url=url):
+                    full, queries = self.get(url)
+                    self.assertTrue(any('auth_user' in sql for sql in queries))
+
+                    sparse, queries = self.get(url, {'fields': 'pk,title,language'})
+                    data = sparse.json()
+                    item = data if 'pk' in data else (data['results'] if isinstance(data, dict) else data)[0]
+                    self.assertEqual(set(item), {'pk', 'title', 'language'})
+                    self.assertTrue(queries)
+                    for sql in queries:
+                        self.assertNotIn('auth_user', sql)
+                        self.assertNotIn('"style"', sql)
+                        self.assertNotIn('"code"', sql)
+                    self.assertLess(len(sparse.content), len(full.content))
+
+    def test_expand_owner(self):
+        """
+        fields 에 owner 가 있으면 expand=owner 인 경우에만 중첩된 객체로 출력하고 JOIN 하는지 확인
+        :return:
+        """
+        url = f'{self.LIST_URL}{self.snippet.pk}/'
+        response, queries = self.get(url, {'fields': 'pk,owner'})
+        self.assertEqual(response.json(), {'pk': self.snippet.pk, 'owner': self.user.pk})
+        self.assertFalse(any('auth_user' in sql for sql in queries))
+
+        response, queries = self.get(url, {'fields': 'pk,owner', 'expand': 'owner'})
+        self.assertEqual(response.json()['owner'], {'pk': self.user.pk, 'username': DUMMY_USER_USERNAME})
+        self.assertTrue(any('auth_user' in sql for sql in queries))
+
+    def test_user_fields(self):
+        """
+        User 목록, 상세도 선택한 필드만 조회하는지 확인
+        :return:
+        """
+        for url in ('/snippets/viewsets_router/users/', '/snippets/generic_cbv/users/'):
+            with self.subTest(url=url):
+                response, queries = self.get(url, {'fields': 'username'})
+                self.assertEqual(response.json()[0], {'username': DUMMY_USER_USERNAME})
+                self.assertFalse(any('"password"' in sql for sql in queries))
+
+    def test_invalid_fields(self):
+        """
+        없는 필드를 선택하거나 펼칠 수 없는 필드를 expand 하면 400을 리턴하는지 확인
+        :return:
+        """
+        for url in ('/snippets/django_view/snippets/', '/snippets/api_view/snippets/',
+                    '/snippets/generic_cbv/snippets/', f'{self.LIST_URL}{self.snippet.pk}/',
+                    '/snippets/viewsets_router/users/'):
+            for params in ({'fields': 'pk,nope'}, {'expand': 'title'}):
+                with self.subTest(url=url, params=params):
+                    self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_size_and_query_count(self):
+        """
+        100개의 Snippet 목록에서 pk,title,language 만 선택하면 응답 크기가 줄어들고 쿼리 수는 같은지 확인
+        :return:
+        """
+        Snippet.objects.bulk_create(
+            Snippet(title=f'title {i}', code='a = 1', highlighted='', owner=self.user) for i in range(99)
+        )
+
+        def measure(params):
+            get_response_cache().clear()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(self.LIST_URL, dict(params, page_size=100))
+            self.assertEqual(len(response.json()['results']), 100)
+            return len(response.content), len(context.captured_queries)
+
+        full_size, full_queries = measure({})
+        sparse_size, sparse_queries = measure({'fields': 'pk,title,language'})
+        self.assertLess(sparse_size, full_size * 0.6)
+        self.assertEqual(sparse_queries, full_queries)
+
+
+class SnippetValuesSerializerTest(SnippetAPITestCase):
+    """
+    ValuesListSerializer 의 출력이 DRF 필드 방식의 출력과 같은지 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        other = User.objects.create_user(username='other')
+        for i, (language, owner) in enumerate([('python', self.user), ('c', other), ('js', self.user)]):
+            Snippet.objects.create(
+                title=f'title {i}', code=f'a = {i}', linenos=i % 2 == 0, language=language, owner=owner,
+            )
+
+    def assertSameOutput(self, serializer_class, queryset, **options):
+        expected = serializers.ListSerializer(
+            queryset.select_related(*(['owner'] if queryset.model is Snippet else [])),
+            child=serializer_class(**options),
+        ).data
+        self.assertTrue(expected)
+        for data in (queryset, list(queryset), list(values_for_serializer(queryset, serializer_class, **options))):
+            with self.subTest(options=options, data=type(data).__name__):
+                self.assertEqual(serializer_class(data, many=True, **options).data, expected)
+
+    def test_same_output(self):
+        """
+        queryset, 모델 인스턴스, values() 행 모두 DRF 필드 방식과 같은 결과를 출력하는지 확인
+        :return:
+        """
+        queryset = Snippet.objects.order_by('pk')
+        self.assertSameOutput(SnippetListSerializer, queryset)
+        self.assertSameOutput(SnippetListSerializer, queryset, fields=('owner', 'pk', 'title'))
+        self.assertSameOutput(SnippetListSerializer, queryset, fields=('language', 'owner'), expand=('owner',))
+        self.assertSameOutput(UserListSerializer, User.objects.order_by('pk'))
+        self.assertSameOutput(UserListSerializer, User.objects.order_by('pk'), fields=('username',))
+
+    def test_queryset_values(self):
+        """
+        queryset 을 전달하면 모델 인스턴스 대신 필요한 컬럼만 values() 로 한 번에 조회하는지 확인
+        :return:
+        """
+        with CaptureQueriesContext(connection) as context:
+            data = SnippetListSerializer(Snippet.objects.all(), many=True).data
+        self.assertEqual(len(data), 3)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('"code"', context.captured_queries[0]['sql'])
+
+    def test_fallback(self):
+        """
+        모델 필드가 아닌 값을 출력하는 serializer 는 기존 방식으로 처리하는지 확인
+        :return:
+        """
+        class TitleLengthSerializer(SnippetListSerializer):
+            title_length = serializers.SerializerMethodField()
+
+            class Meta(SnippetListSerializer.Meta):
+                fields = SnippetListSerializer.Meta.fields + ('title_length',)
+
+            def get_title_length(self, obj):
+                return len(obj.title)
+
+        self.assertIsNone(get_value_reader(TitleLengthSerializer))
+        queryset = Snippet.objects.order_by('pk')
+        self.assertIs(values_for_serializer(queryset, TitleLengthSerializer), queryset)
+        data = TitleLengthSerializer(queryset, many=True).data
+        self.assertEqual([item['title_length'] for item in data], [7, 7, 7])
+        self.assertEqual(data[0]['owner'], {'pk': self.user.pk, 'username': DUMMY_USER_USERNAME})
+
+    def test_cursor_pagination(self):
+        """
+        values() 행으로 조회한 페이지에서도 커서로 다음 페이지를 조회할 수 있는지 확인
+        :return:
+        """
+        url = '/snippets/viewsets_router/snippets/?page_size=2'
+        pks = []
+        while url:
+            data = self.client.get(url).json()
+            pks += [item['pk'] for item in data['results']]
+            url = data['next']
+        self.assertEqual(pks, list(Snippet.objects.order_by('-created', '-pk').values_list('pk', flat=True)))
+
+
+class SnippetJSONTest(SnippetAPITestCase):
+    """
+    FastJSONRenderer, FastJSONParser 의 결과가 JSONRenderer, JSONParser 와 같은지 테스트
+    """
+    VALUES = [
+        {'pk': 1, 'title': '한글 "따옴표" \\ \n\t \u2028 \u2029 <>&', 'linenos': True, 'owner': None},
+        [{'code': 'x' * 100000}, (1, -2, 2 ** 63 - 1), []],
+        {'float': 1e16, 'small': 1e-7, 'zero': 0.0},
+        {'big': 2 ** 64},
+        {1: 'int key'},
+        {'created': datetime.datetime(2020, 1, 1, 12, 30, tzinfo=datetime.timezone.utc),
+         'decimal': decimal.Decimal('1.50'), 'date': datetime.date(2020, 1, 1)},
+        'text',
+        0,
+    ]
+
+    def test_render(self):
+        """
+        float, datetime, 64bit 를 넘는 정수, 문자열이 아닌 키 등을 포함해도 JSONRenderer 와 같은 결과를 출력하는지 확인
+        :return:
+        """
+        for data in self.VALUES:
+            with self.subTest(data=repr(data)[:50]):
+                self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+        data = self.VALUES[0]
+        self.assertEqual(
+            renderers.FastJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+        with self.assertRaises(ValueError):
+            renderers.FastJSONRenderer().render({'nan': float('nan')})
+
+    def test_parse(self):
+        """
+        JSONParser 와 같은 값을 리턴하고, 잘못된 요청은 같은 오류 메시지로 실패하는지 확인
+        :return:
+        """
+        for body in [JSONRenderer().render(data) for data in self.VALUES[:4]] + [b'{"big": 123456789012345678901234567890}']:
+            with self.subTest(body=body[:50]):
+                self.assertEqual(
+                    parsers.FastJSONParser().parse(io.BytesIO(body)),
+                    JSONParser().parse(io.BytesIO(body)),
+                )
+        for body in (b'{"a": ', b'{"a": NaN}', b'\xef\xbb\xbf{}'):
+            with self.subTest(body=body):
+                with self.assertRaises(parsers.ParseError) as expected:
+                    JSONParser().parse(io.BytesIO(body))
+                with self.assertRaises(parsers.ParseError) as context:
+                    parsers.FastJSONParser().parse(io.BytesIO(body))
+                self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_without_orjson(self):
+        """
+        orjson 이 설치되지 않은 환경에서는 JSONRenderer, JSONParser 로 처리하는지 확인
+        :return:
+        """
+        body = JSONRenderer().render(self.VALUES[0])
+        with mock.patch.object(renderers, 'orjson', None), mock.patch.object(parsers, 'orjson', None):
+            self.assertEqual(renderers.FastJSONRenderer().render(self.VALUES[0]), body)
+            self.assertEqual(parsers.FastJSONParser().parse(io.BytesIO(body)), self.VALUES[0])
+
+    def test_views(self):
+        """
+        모든 view 에서 설정된 renderer, parser 를 사용하고, 응답이 JSONRenderer 의 출력과 같은지 확인
+        :return:
+        """
+        user = get_dummy_user()
+        self.client.force_authenticate(user)
+        snippet = Snippet.objects.create(code='a = 1', owner=user)
+        code = 'print("한글 \u2028")\n' * 5000
+        for flavor in ('django_view', 'api_view', 'mixins_view', 'generic_cbv', 'viewsets_router'):
+            with self.subTest(flavor=flavor):
+                url = f'/snippets/{flavor}/snippets/'
+                with mock.patch.object(
+                    parsers.FastJSONParser, 'parse', autospec=True, side_effect=parsers.FastJSONParser.parse,
+                ) as parse:
+                    response = self.client.put(f'{url}{snippet.pk}/', {'code': code, 'title': flavor}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                parse.assert_called_once()
+                self.assertEqual(Snippet.objects.get(pk=snippet.pk).title, flavor)
+
+                for path in (url, f'{url}{snippet.pk}/'):
+                    with mock.patch.object(
+                        renderers.FastJSONRenderer, 'render', autospec=True,
+                        side_effect=renderers.FastJSONRenderer.render,
+                    ) as render:
+                        response = self.client.get(path)
+                    render.assert_called()
+                    self.assertEqual(response.content, JSONRenderer().render(response.json()))
+
+
+class SnippetHighlightDocumentTest(SnippetAPITestCase):
+    """
+    SnippetViewSet.highlight (하이라이트된 HTML 문서) 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.snippet = Snippet.objects.create(
+            title='<문서>', code='def f(x):\n    return x * 2\n' * 100, style='monokai', owner=self.user,
+        )
+        self.url = f'/snippets/viewsets_router/snippets/{self.snippet.pk}/highlight/'
+        self.document = self.snippet.render_document().encode('utf-8')
+
+    def test_document(self):
+        """
+        text/html 문서와 강한 ETag 를 리턴하고, If-None-Match 가 일치하면 304 를 리턴하는지 확인
+        :return:
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertEqual(response.content, self.document)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        self.assertEqual(self.client.get('/snippets/viewsets_router/snippets/0/highlight/').status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_encodings(self):
+        """
+        Accept-Encoding 에 따라 압축된 문서를 리턴하고, 압축 방식마다 ETag 가 다른지 확인
+        :return:
+        """
+        fake_brotli = mock.Mock()
+        fake_brotli.compress.side_effect = lambda content, quality: b'br:' + gzip.compress(content, mtime=0)[:100]
+        with mock.patch.object(documents, 'brotli', fake_brotli):
+            responses = {
+                accept_encoding: self.client.get(self.url, HTTP_ACCEPT_ENCODING=accept_encoding)
+                for accept_encoding in ('', 'gzip', 'gzip, deflate, br', 'br;q=0, gzip', 'gzip;q=0', '*')
+            }
+        self.assertEqual(
+            {key: response.get('Content-Encoding') for key, response in responses.items()},
+            {'': None, 'gzip': 'gzip', 'gzip, deflate, br': 'br', 'br;q=0, gzip': 'gzip',
+             'gzip;q=0': None, '*': 'br'},
+        )
+        self.assertEqual(gzip.decompress(responses['gzip'].content), self.document)
+        self.assertTrue(responses['*'].content.startswith(b'br:'))
+        self.assertEqual(len({response['ETag'] for response in responses.values()}), 3)
+        # 문서는 처음 요청에서 한 번만 압축됨
+        fake_brotli.compress.assert_called_once()
+
+    def test_cached(self):
+        """
+        두 번째 요청부터는 캐시된 문서를 사용하고, Snippet 이 수정되면 새 문서를 만드는지 확인
+        :return:
+        """
+        first = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        with mock.patch.object(Snippet, 'render_document') as render_document, \
+                mock.patch.object(documents.gzip, 'compress') as compress:
+            with CaptureQueriesContext(connection) as context:
+                second = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        render_document.assert_not_called()
+        compress.assert_not_called()
+        # snippet_condition 의 (version, modified) 조회 한 번
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(second.content, first.content)
+
+        self.snippet.title = 'changed'
+        self.snippet.save()
+        third = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotEqual(third['ETag'], first['ETag'])
+        self.assertIn(b'<title>changed</title>', gzip.decompress(third.content))
+
+
+@override_settings(SNIPPETS_PERFORMANCE={'ENABLED': True, 'CACHE_ALIAS': 'shared', 'FLUSH_INTERVAL': 60 * 60})
+class SnippetPerformanceTest(SnippetAPITestCase):
+    """
+    PerformanceMiddleware (Server-Timing 헤더, route 별 히스토그램) 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        reset_performance_stats()
+        self.user = get_dummy_user()
+        self.snippets = [
+            Snippet.objects.create(code=f'a = {i}', owner=self.user)
+            for i in range(3)
+        ]
+
+    def parse_server_timing(self, response):
+        metrics = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, *params = metric.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    def test_server_timing(self):
+        """
+        응답의 Server-Timing 헤더에 전체, DB 쿼리, serializer, renderer 시간과 쿼리 수가 포함되는지 확인
+        :return:
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/snippets/viewsets_router/snippets/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = self.parse_server_timing(response)
+        self.assertEqual(list(metrics), ['total', 'db', 'serializer', 'render'])
+        self.assertEqual(metrics['db']['desc'], f'"{len(context.captured_queries)} queries"')
+        self.assertLessEqual(float(metrics['serializer']['dur']), float(metrics['total']['dur']))
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post('/snippets/viewsets_router/snippets/', {'code': 'print("performance")'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('highlight', self.parse_server_timing(response))
+
+    def test_stats(self):
+        """
+        URL 의 pk 가 달라도 같은 route 의 히스토그램에 합산되고,
+        stats.json (관리자만 조회 가능)과 performance_stats 명령으로 조회, 초기화할 수 있는지 확인
+        :return:
+        """
+        for snippet in self.snippets:
+            self.client.get(f'/snippets/generic_cbv/snippets/{snippet.pk}/')
+        self.client.get('/snippets/generic_cbv/snippets/')
+
+        self.assertEqual(self.client.get('/snippets/performance/stats.json').status_code,
+                         status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=User.objects.create_superuser(username='admin'))
+        stats = self.client.get('/snippets/performance/stats.json').json()
+        detail = stats['GET /snippets/generic_cbv/snippets/<int:pk>/']
+        self.assertEqual(detail['requests'], 3)
+        self.assertEqual(detail['metrics']['total']['count'], 3)
+        self.assertEqual(sum(detail['metrics']['total']['histogram'].values()), 3)
+        self.assertGreater(detail['queries'], 0)
+        self.assertIsNotNone(detail['metrics']['db']['p99'])
+        self.assertEqual(stats['GET /snippets/generic_cbv/snippets/']['requests'], 1)
+
+        out = io.StringIO()
+        call_command('performance_stats', '--reset', stdout=out)
+        self.assertIn('GET /snippets/generic_cbv/snippets/<int:pk>/  requests: 3', out.getvalue())
+        out = io.StringIO()
+        call_command('performance_stats', '--json', stdout=out)
+        self.assertEqual(json.loads(out.getvalue()), {})
+
+    def test_process_local_cache(self):
+        """
+        통계를 프로세스별 캐시(LocMemCache)에 합산하도록 설정하면 performance_stats 명령이 실패하는지 확인
+        :return:
+        """
+        with override_settings(SNIPPETS_PERFORMANCE={'ENABLED': True, 'CACHE_ALIAS': 'default'}):
+            with self.assertRaisesMessage(CommandError, 'process-local'):
+                call_command('performance_stats', stdout=io.StringIO())
+
+    def test_hooks(self):
+        """
+        request_timed signal 이 전송되고, 같은 이름의 중첩된 구간은 한 번만 기록되는지 확인
+        :return:
+        """
+        received = []
+
+        def receiver(sender, route, timings, **kwargs):
+            received.append((route, timings))
+
+        request_timed.connect(receiver)
+        self.addCleanup(request_timed.disconnect, receiver)
+        self.client.get(f'/snippets/django_view/snippets/{self.snippets[0].pk}/')
+        self.assertEqual(len(received), 1)
+        route, timings = received[0]
+        self.assertEqual(route, 'GET /snippets/django_view/snippets/<int:pk>/')
+        self.assertIn('render', timings.durations)
+
+        timings = RequestTimings()
+        with timings.section('serializer'):
+            with timings.section('serializer'):
+                time.sleep(0.01)
+        self.assertEqual(list(timings.durations), ['serializer'])
+        self.assertGreaterEqual(timings.durations['serializer'], 0.01)
+
+    @override_settings(SNIPPETS_PERFORMANCE={'ENABLED': False})
+    def test_disabled(self):
+        """
+        측정하지 않으면 Server-Timing 헤더가 없고, 구간은 기록 없이 실행되는지 확인
+        :return:
+        """
+        response = self.client.get('/snippets/viewsets_router/snippets/')
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertIsNone(get_request_timings())
+        with timing('serializer'):
+            self.assertIsNone(get_request_timings())
+
+
+
+class SnippetBenchTest(SnippetAPITestCase):
+    """
+    manage.py bench (view flavor 별 부하 측정) 테스트
+    """
+
+    def setUp(self):
+        super().setUp()
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def bench(self, **options):
+        call_command(
+            'bench', users=2, snippets=10, requests=3, warmup=1, flavors=['generic_cbv', 'viewsets_router'],
+            stdout=io.StringIO(), stderr=io.StringIO(), **options
+        )
+
+    def test_report(self):
+        """
+        flavor, operation 별 응답 시간, 처리량, 쿼리 수를 JSON 으로 저장하고 생성한 데이터는 rollback 되는지 확인
+        :return:
+        """
+        self.bench(output=self.path)
+        with open(self.path) as f:
+            report = json.load(f)
+        self.assertEqual(report['config']['snippets'], 10)
+        self.assertEqual(list(report['results']), ['generic_cbv', 'viewsets_router'])
+        for operations in report['results'].values():
+            self.assertEqual(list(operations), ['list', 'detail', 'create', 'update', 'delete'])
+            for result in operations.values():
+                self.assertEqual(result['requests'], 3)
+                self.assertEqual(result['errors'], 0)
+                self.assertLessEqual(result['p50'], result['p95'])
+                self.assertLessEqual(result['p95'], result['p99'])
+                self.assertGreater(result['throughput'], 0)
+                self.assertGreater(result['queries'], 0)
+        self.assertFalse(Snippet.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+    def test_baseline(self):
+        """
+        baseline 보다 쿼리 수가 늘어나면 실패하고, 허용 범위 안이면 성공하는지 확인
+        :return:
+        """
+        self.bench(output=self.path)
+        self.bench(baseline=self.path, tolerance=100, min_delta=1000)
+
+        with open(self.path) as f:
+            report = json.load(f)
+        report['results']['viewsets_router']['detail']['queries'] -= 1
+        with open(self.path, 'w') as f:
+            json.dump(report, f)
+        with self.assertRaisesMessage(CommandError, 'viewsets_router detail: queries'):
+            self.bench(baseline=self.path, tolerance=100, min_delta=1000)
+
+    def test_startup(self):
+        """
+        bench_startup 은 eager/lazy choices 의 import 시간을 출력하고, 사용 중인 choices 캐시 파일은 건드리지 않는지 확인
+        :return:
+        """
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                override_settings(SNIPPETS_CHOICES_CACHE_DIR=cache_dir):
+            path = get_choices_cache_path()
+            with open(path, 'w') as f:
+                f.write('{}')
+            out = io.StringIO()
+            call_command('bench_startup', repeat=1, stdout=out)
+            with open(path) as f:
+                self.assertEqual(f.read(), '{}')
+        self.assertIn('eager choices', out.getvalue())
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+
+
+class SnippetOwnerTest(SnippetAPITestCase):
+    """
+    User 의 Snippet 개수(SnippetOwnerStats)와 User 별 Snippet 목록(users/<owner_pk>/snippets/) 테스트
+    """
+    FLAVORS = (
+        'generic_cbv',
+        'viewsets_router',
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.other = User.objects.create_user('other')
+        self.client.force_authenticate(self.user)
+
+    def get_snippet_counts(self, flavor):
+        response = self.client.get(f'/snippets/{flavor}/users/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {item['pk']: item['snippet_count'] for item in response.json()}
+
+    def test_snippet_count(self):
+        """
+        User 목록, 상세의 snippet_count 가 Snippet 생성, 삭제 후 바로 갱신되는지 확인 (캐시된 응답도 무효화)
+        :return:
+        """
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                self.assertEqual(self.get_snippet_counts(flavor), {self.user.pk: 0, self.other.pk: 0})
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet = Snippet.objects.create(code='a = 1', owner=self.user)
+            Snippet.objects.create(code='a = 2', owner=self.user)
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                self.assertEqual(self.get_snippet_counts(flavor), {self.user.pk: 2, self.other.pk: 0})
+                response = self.client.get(f'/snippets/{flavor}/users/{self.user.pk}/')
+                self.assertEqual(response.json()['snippet_count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            snippet.delete()
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                self.assertEqual(self.get_snippet_counts(flavor)[self.user.pk], 1)
+                response = self.client.get(f'/snippets/{flavor}/users/{self.user.pk}/')
+                self.assertEqual(response.json()['snippet_count'], 1)
+
+    def test_snippet_count_bulk(self):
+        """
+        bulk 생성, 삭제 후에도 snippet_count 가 실제 개수와 같은지 확인
+        :return:
+        """
+        url = '/snippets/viewsets_router/snippets/bulk/'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, [{'code': f'a = {i}'} for i in range(3)], format='json')
+        pks = [item['data']['pk'] for item in response.json()]
+        self.assertEqual(SnippetOwnerStats.objects.get(owner=self.user).snippet_count, 3)
+        self.assertEqual(self.get_snippet_counts('viewsets_router')[self.user.pk], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(url, pks[:2], format='json')
+        self.assertEqual(SnippetOwnerStats.objects.get(owner=self.user).snippet_count, 1)
+        self.assertEqual(self.get_snippet_counts('viewsets_router')[self.user.pk], 1)
+
+        self.user.delete()
+        self.assertFalse(SnippetOwnerStats.objects.filter(owner_id=self.user.pk).exists())
+
+    def test_user_list_query(self):
+        """
+        User 목록은 User 수와 관계없이 COUNT 없이 쿼리 하나로 snippet_count 를 읽는지 확인
+        :return:
+        """
+        Snippet.objects.create(code='a = 1', owner=self.user)
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                for cache in caches.all():
+                    cache.clear()
+                with CaptureQueriesContext(connection) as context:
+                    self.client.get(f'/snippets/{flavor}/users/')
+                self.assertEqual(len(context.captured_queries), 1)
+                self.assertNotIn('COUNT(', context.captured_queries[0]['sql'])
+
+    def test_owner_snippet_list(self):
+        """
+        User 별 Snippet 목록이 해당 User 의 Snippet 만 최신순으로 cursor 페이지마다 리턴하는지,
+        Snippet 이 없는 User 는 빈 목록, 없는 User 는 404 를 리턴하는지 확인
+        :return:
+        """
+        pks = [Snippet.objects.create(code=f'a = {i}', owner=self.user).pk for i in range(3)]
+        Snippet.objects.create(code='b = 1', owner=self.other)
+        for flavor in self.FLAVORS:
+            with self.subTest(flavor=flavor):
+                url = f'/snippets/{flavor}/users/{self.user.pk}/snippets/?page_size=2'
+                results = []
+                while url:
+                    with CaptureQueriesContext(connection) as context:
+                        data = self.client.get(url).json()
+                    self.assertEqual(len(context.captured_queries), 1)
+                    results += data['results']
+                    url = data['next']
+                self.assertEqual([item['pk'] for item in results], pks[::-1])
+                self.assertEqual({item['owner']['pk'] for item in results}, {self.user.pk})
+
+                User.objects.create_user(f'empty_{flavor}')
+                response = self.client.get(f'/snippets/{flavor}/users/{User.objects.latest("pk").pk}/snippets/')
+                self.assertEqual(response.json()['results'], [])
+                for owner_pk in (0, 'x'):
+                    response = self.client.get(f'/snippets/{flavor}/users/{owner_pk}/snippets/')
+                    self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_owner_snippet_list_query_plan(self):
+        """
+        User 별 Snippet 목록이 (owner, created) 인덱스 순서대로 읽는지 확인 (EXPLAIN QUERY PLAN)
+        :return:
+        """
+        plan = Snippet.objects.filter(owner_id=self.user.pk).order_by('-created', '-pk').explain()
+        self.assertIn('snippets_owner_created_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class SnippetOwnerWriteTest(SnippetAPITestCase):
+    """
+    IsOwnerOrReadOnly 를 사용하는 SnippetViewSet 의 수정, 삭제 요청 쿼리 테스트
+    """
+    URL = '/snippets/viewsets_router/snippets/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.other = User.objects.create_user('other')
+        self.snippet = Snippet.objects.create(code='a = 1', owner=self.user)
+
+    def request(self, user, method, data=None, pk=None):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(f'{self.URL}{pk or self.snippet.pk}/', data, format='json')
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_permission_uses_owner_id(self):
+        """
+        owner 를 조회하지 않고 owner_id 로 권한을 확인하는지 확인
+        :return:
+        """
+        snippet = Snippet.objects.only('owner').get(pk=self.snippet.pk)
+        request = mock.Mock(method='PATCH', user=self.user)
+        permission = IsOwnerOrReadOnly()
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_object_permission(request, None, snippet))
+            request.user = self.other
+            self.assertFalse(permission.has_object_permission(request, None, snippet))
+
+    def test_update(self):
+        """
+        수정 요청은 owner_id 조건으로 owner JOIN 과 highlighted 없이 Snippet 을 한 번만 조회하고,
+        하이라이트 입력이 바뀌면 highlighted 도 저장하는지 확인
+        :return:
+        """
+        response, queries = self.request(self.user, 'patch', {'title': 'SnippetTitle'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['owner'], {'pk': self.user.pk, 'username': self.user.username})
+        # SELECT, UPDATE, 검색 인덱스 갱신 (DELETE, INSERT)
+        self.assertEqual(len(queries), 4)
+        self.assertIn('"snippets_snippet"."owner_id" = ', queries[0])
+        self.assertNotIn('auth_user', queries[0])
+        self.assertFalse(any('"highlighted"' in sql for sql in queries))
+        self.assertEqual(Snippet.objects.get(pk=self.snippet.pk).title, 'SnippetTitle')
+
+        # title, code 가 그대로면 검색 인덱스는 갱신하지 않음 (SELECT, UPDATE)
+        response, queries = self.request(self.user, 'patch', {'linenos': True})
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"highlighted"', queries[1])
+        self.snippet.refresh_from_db()
+        self.assertEqual(self.snippet.highlighted, render_highlight('a = 1', 'python', True))
+        self.assertEqual(self.snippet.version, 3)
+
+    def test_destroy(self):
+        """
+        삭제 요청은 Snippet 의 pk, owner_id 만 조회하는지 확인
+        :return:
+        """
+        response, queries = self.request(self.user, 'delete')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        # SELECT, DELETE, owner 별 개수 갱신, 검색 인덱스 삭제
+        self.assertEqual(len(queries), 4)
+        self.assertIn('SELECT "snippets_snippet"."id", "snippets_snippet"."owner_id" FROM', queries[0])
+        self.assertFalse(Snippet.objects.filter(pk=self.snippet.pk).exists())
+        self.assertEqual(SnippetOwnerStats.objects.get(owner=self.user).snippet_count, 0)
+
+    def test_reject_non_owner(self):
+        """
+        owner 가 아닌 User 의 수정, 삭제 요청은 Snippet 을 읽지 않고 pk, owner_id 만 조회해서 거부되고,
+        없는 Snippet 은 404 를 리턴하는지 확인
+        :return:
+        """
+        for method, data in (('put', {'title': 'SnippetTitle'}), ('patch', {'title': 'SnippetTitle'}),
+                             ('delete', None)):
+            with self.subTest(method=method):
+                # owner_id 조건으로 조회한 Snippet 이 없으므로 pk, owner_id 만 다시 조회
+                response, queries = self.request(self.other, method, data)
+                self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+                self.assertEqual(len(queries), 2)
+                self.assertIn('SELECT "snippets_snippet"."id", "snippets_snippet"."owner_id" FROM', queries[1])
+
+                response, queries = self.request(self.user, method, data, pk=self.snippet.pk + 100)
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+                self.assertEqual(len(queries), 2)
+        self.snippet.refresh_from_db()
+        self.assertEqual((self.snippet.title, self.snippet.version), ('', 1))
+
+
+class SnippetAsyncViewTest(SnippetAPITestCase):
+    """
+    async_view (ASGI 로 실행할 async 목록, 상세 view) 테스트
+    """
+    URL = '/snippets/async_view/snippets/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = get_dummy_user()
+        self.other = User.objects.create_user('other')
+        self.python = Snippet.objects.create(code='a = 1', title='SnippetTitle', owner=self.user)
+        self.c = Snippet.objects.create(code='int a;', language='c', linenos=True, owner=self.other)
+
+    async def test_same_as_django_view(self):
+        """
+        목록, 상세 응답이 django_view 의 GET 응답과 같은지 확인
+        :return:
+        """
+        cases = (
+            ('snippets/', {}),
+            ('snippets/', {'language': 'c'}),
+            ('snippets/', {'owner': self.user.pk, 'fields': 'pk,title,owner'}),
+            ('snippets/', {'fields': 'pk,owner', 'expand': 'owner'}),
+            (f'snippets/{self.python.pk}/', {}),
+            (f'snippets/{self.c.pk}/', {'fields': 'pk,language'}),
+        )
+        for path, params in cases:
+            with self.subTest(path=path, params=params):
+                expected = await self.async_client.get(f'/snippets/django_view/{path}', params)
+                response = await self.async_client.get(f'/snippets/async_view/{path}', params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(response.content, expected.content)
+
+    async def test_errors(self):
+        """
+        없는 Snippet 은 404, 잘못된 필터와 필드는 400, 읽기가 아닌 요청은 405 를 리턴하는지 확인
+        :return:
+        """
+        response = await self.async_client.get(f'{self.URL}{self.c.pk + 100}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        for params in ({'owner': 'x'}, {'fields': 'unknown'}):
+            with self.subTest(params=params):
+                response = await self.async_client.get(self.URL, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = await self.async_client.get(f'{self.URL}{self.c.pk}/', {'fields': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = await self.async_client.post(self.URL, {'code': 'a'})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_render_in_thread_pool(self):
+        """
+        serializer 와 JSON 렌더링은 이벤트 루프 스레드가 아닌 스레드에서 실행되는지 확인
+        :return:
+        """
+        threads = []
+        original = async_view.render_snippets
+
+        def render_snippets(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return original(*args, **kwargs)
+
+        with mock.patch.object(async_view, 'render_snippets', render_snippets):
+            await self.async_client.get(self.URL)
+            await self.async_client.get(f'{self.URL}{self.c.pk}/')
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_asgi_application(self):
+        """
+        config.asgi 의 application 이 ASGI 로 요청을 처리하는지 확인
+        :return:
+        """
+        from django.core.handlers.asgi import ASGIHandler
+
+        from config.asgi import application
+
+        self.assertIsInstance(application, ASGIHandler)
+
+
+class SnippetBenchASGITest(SnippetAPITestCase):
+    """
+    manage.py bench_asgi (WSGI, ASGI 서버 비교) 의 부하 생성 테스트
+    """
+
+    async def serve(self, reader, writer):
+        # Content-Length 가 있는 keep-alive 응답을 보내는 HTTP 서버
+        try:
+            while True:
+                await reader.readuntil(b'\r\n\r\n')
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n[]')
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def test_run_load(self):
+        """
+        동시 연결로 요청을 반복하고, 느린 연결이 있어도 요청 수, 처리량을 집계하는지 확인
+        :return:
+        """
+        async def run():
+            server = await asyncio.start_server(self.serve, bench_asgi.HOST, 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await bench_asgi.run_load(port, ['/a/', '/b/'], 2, 0.2, slow_clients=1, timeout=1)
+
+        result = asyncio.run(run())
+        self.assertGreater(result['requests'], 0)
+        self.assertEqual(result['errors'], 0)
+        self.assertLessEqual(result['p50'], result['p99'])
+        self.assertGreater(result['throughput'], 0)
+
+    def test_missing_server(self):
+        """
+        gunicorn, uvicorn 이 설치되지 않았으면 데이터를 만들지 않고 실패하는지 확인
+        :return:
+        """
+        with mock.patch.object(bench_asgi.importlib.util, 'find_spec', return_value=None):
+            with self.assertRaisesMessage(CommandError, 'gunicorn, uvicorn is not installed'):
+                call_command('bench_asgi', stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertFalse(User.objects.exists())
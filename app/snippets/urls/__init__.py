@@ -1,5 +1,8 @@
 from django.urls import path, include
-from . import django_view, api_view, mixins, generic_cbv, viewsets_router
+from . import django_view, api_view, mixins, generic_cbv, viewsets_router, async_view
+from ..views.export import snippet_export
+from ..views.performance import performance_stats
+from ..views.styles import style_sheet
 
 app_name = 'snippets'
 
@@ -8,6 +11,9 @@ urlpatterns = [
     path('api_view/', include(api_view)),
     path('mixins_view/', include(mixins)),
     path('generic_cbv/', include(generic_cbv)),
-    path('viewsets_router/', include(viewsets_router))
-
+    path('viewsets_router/', include(viewsets_router)),
+    path('async_view/', include(async_view)),
+    path('styles/<str:style>.css', style_sheet, name='style-sheet'),
+    path('export/snippets.<str:export_format>', snippet_export, name='snippet-export'),
+    path('performance/stats.json', performance_stats, name='performance-stats'),
 ]
@@ -0,0 +1,7 @@
+from django.urls import path
+from ..views import async_view as views
+
+urlpatterns = [
+    path('snippets/', views.snippet_list, name='snippet-list'),
+    path('snippets/<int:pk>/', views.snippet_detail, name='snippet-detail'),
+]
@@ -8,6 +8,7 @@ urlpatterns = [
     path('snippets/<int:pk>/', views.SnippetDetail.as_view(), name='snippet-detail'),
     path('users/', views.UserList.as_view(), name='user-List'),
     path('users/<int:pk>/', views.UserDetail.as_view(), name='user-detail'),
+    path('users/<int:owner_pk>/snippets/', views.UserSnippetList.as_view(), name='user-snippet-list'),
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
 ]
 
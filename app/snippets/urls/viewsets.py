@@ -10,6 +10,12 @@ snippet_list = SnippetViewSet.as_view({
     'post': 'create',
 })
 
+snippet_bulk = SnippetViewSet.as_view({
+    'post': 'bulk',
+    'patch': 'bulk',
+    'delete': 'bulk',
+})
+
 snippet_detail = SnippetViewSet.as_view({
     'get': 'retrieve',
     'put': 'update',
@@ -29,6 +35,9 @@ urlpatterns = [
     path('snippets/',
          snippet_list,
          name='snippet-list'),
+    path('snippets/bulk/',
+         snippet_bulk,
+         name='snippet-bulk'),
     path('snippets/<int:pk>/',
          snippet_detail,
          name='snippet-detail'),
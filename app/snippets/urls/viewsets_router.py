@@ -6,6 +6,7 @@ router = SimpleRouter()
 
 router.register(r'snippets', views.SnippetViewSet)
 router.register(r'users', views.UserViewSet)
+router.register(r'users/(?P<owner_pk>[^/.]+)/snippets', views.UserSnippetViewSet, basename='user-snippet')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,10 +1,13 @@
 from django.http import Http404
+from django.utils.decorators import method_decorator
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..conditional import snippet_condition
+from ..filters import filter_snippets
 from ..models import Snippet
-from ..serializers import SnippetListSerializer
+from ..serializers import SnippetListSerializer, get_field_options
 
 __all__ = (
     'SnippetList',
@@ -12,14 +15,18 @@ __all__ = (
 )
 
 
+@method_decorator(snippet_condition, name='dispatch')
 class SnippetList(APIView):
     """
     코드 조각을 모두 보여주거나 새 코드 조각을 만듭니다.
     """
 
     def get(self, request, format=None):
-        snippets = Snippet.objects.all()
-        serializer = SnippetListSerializer(snippets, many=True)
+        options = get_field_options(request.query_params)
+        snippets = filter_snippets(
+            Snippet.objects.for_serializer(SnippetListSerializer, **options), request.query_params,
+        )
+        serializer = SnippetListSerializer(snippets, many=True, **options)
         return Response(serializer.data)
 
     def post(self, request, format=None):
@@ -30,20 +37,24 @@ class SnippetList(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@method_decorator(snippet_condition, name='dispatch')
 class SnippetDetail(APIView):
     """
     코드 조각 조회, 업데이트, 삭제
     """
 
-    def get_object(self, pk):
+    def get_object(self, pk, queryset=None):
+        if queryset is None:
+            queryset = Snippet.objects.select_related('owner')
         try:
-            return Snippet.objects.get(pk=pk)
+            return queryset.get(pk=pk)
         except Snippet.DoesNotExist:
             raise Http404
 
     def get(self, request, pk, format=None):
-        snippet = self.get_object(pk)
-        serializer = SnippetListSerializer(snippet)
+        options = get_field_options(request.query_params)
+        snippet = self.get_object(pk, Snippet.objects.for_serializer(SnippetListSerializer, **options))
+        serializer = SnippetListSerializer(snippet, **options)
         return Response(serializer.data)
 
     def put(self, request, pk, format=None):
@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import ValidationError
+
+from utils.renderers import get_json_renderer
+from ..filters import filter_snippets
+from ..models import Snippet
+from ..serializers import SnippetListSerializer, get_field_options, values_for_serializer
+from .django_view import JSONResponse
+
+__all__ = (
+    'snippet_list',
+    'snippet_detail',
+)
+
+
+def render_snippets(data, many=False, **options):
+    """
+    serializer 로 출력을 만들고 JSON 으로 렌더링 (CPU 작업)
+    """
+    serializer = SnippetListSerializer(data, many=many, **options)
+    return get_json_renderer().render(serializer.data)
+
+
+async def render_in_pool(data, many=False, **options):
+    # serializer, renderer 는 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+    # (thread_sensitive=False: DB 작업용 스레드가 아닌 별도의 스레드를 사용)
+    return await sync_to_async(render_snippets, thread_sensitive=False)(data, many=many, **options)
+
+
+@require_safe
+async def snippet_list(request):
+    """
+    django_view.snippet_list 의 GET 과 같은 응답을 만드는 async view (ASGI 로 실행할 때 워커 스레드를 점유하지 않음)
+        필요한 컬럼만 async ORM 으로 조회하고, serializer 와 JSON 렌더링은 스레드 풀에서 실행
+    """
+    try:
+        options = get_field_options(request.GET)
+        snippets = values_for_serializer(
+            filter_snippets(
+                Snippet.objects.for_serializer(SnippetListSerializer, **options).order_by('-created'),
+                request.GET,
+            ),
+            SnippetListSerializer, **options
+        )
+    except ValidationError as exc:
+        return JSONResponse(exc.detail, status=400)
+    rows = [row async for row in snippets]
+    content = await render_in_pool(rows, many=True, **options)
+    return HttpResponse(content, content_type='application/json')
+
+
+@require_safe
+async def snippet_detail(request, pk):
+    """
+    django_view.snippet_detail 의 GET 과 같은 응답을 만드는 async view
+    """
+    try:
+        options = get_field_options(request.GET)
+        snippet = await Snippet.objects.for_serializer(SnippetListSerializer, **options).aget(pk=pk)
+    except ValidationError as exc:
+        return JSONResponse(exc.detail, status=400)
+    except Snippet.DoesNotExist:
+        return HttpResponse(status=404)
+    content = await render_in_pool(snippet, **options)
+    return HttpResponse(content, content_type='application/json')
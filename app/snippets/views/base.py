@@ -0,0 +1,136 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.http import Http404
+from rest_framework import permissions
+from rest_framework.generics import get_object_or_404
+
+from utils.paginations import SnippetCursorPagination
+from ..filters import get_filter_params
+from ..models import Snippet
+from ..querysets import select_serializer_fields
+from ..serializers import SnippetListSerializer, get_field_options, values_for_serializer
+
+User = get_user_model()
+
+__all__ = (
+    'FieldSelectionMixin',
+    'SnippetQuerySetMixin',
+    'SnippetOwnerWriteMixin',
+    'OwnerSnippetListMixin',
+)
+
+
+class FieldSelectionMixin:
+    """
+    GET 요청의 ?fields=, ?expand= 를 serializer 와 queryset 에 함께 적용
+        선택되지 않은 컬럼과 펼치지 않은 관계는 serializer 에서 제외될 뿐 아니라 DB 에서 조회하지도 않음
+    """
+    # serializer 가 모델 필드가 아닌 값을 출력해서 컬럼을 선택할 수 없을 때 JOIN 할 관계
+    default_related = ()
+
+    def get_field_options(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return get_field_options(self.request.query_params)
+        return {}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_field_options())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in permissions.SAFE_METHODS:
+            return select_serializer_fields(
+                queryset, self.get_serializer_class(),
+                default_related=self.default_related, **self.get_field_options()
+            )
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        # 목록 serializer 가 values() 행을 지원하면 모델 인스턴스를 만들지 않고 필요한 값만 조회
+        if isinstance(queryset, QuerySet) and self.request.method in permissions.SAFE_METHODS:
+            queryset = values_for_serializer(queryset, self.get_serializer_class(), **self.get_field_options())
+        return super().paginate_queryset(queryset)
+
+
+class SnippetQuerySetMixin(FieldSelectionMixin):
+    """
+    GenericAPIView 의 queryset 을 serializer 가 출력하는 컬럼만 조회하도록 최적화
+    """
+    default_related = ('owner',)
+
+    def get_queryset(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return super().get_queryset()
+        return self.get_write_queryset(super().get_queryset())
+
+    def get_write_queryset(self, queryset):
+        # 쓰기 요청은 save() 에서 모든 컬럼을 사용하므로 owner JOIN 만 추가
+        return queryset.select_related('owner')
+
+    def get_count_owner(self):
+        """
+        owner 로만 필터링된 목록이면 owner 의 pk (SnippetCachedCountPagination 이 owner 별 캐시된 개수를 사용)
+        """
+        params = get_filter_params(self.request.query_params)
+        if list(params) == ['owner_id']:
+            return params['owner_id']
+        return None
+
+
+class SnippetOwnerWriteMixin(SnippetQuerySetMixin):
+    """
+    IsOwnerOrReadOnly 로 owner 만 수정, 삭제할 수 있는 view 에서 Snippet 조회와 권한 확인을 쿼리 하나로 처리
+        쓰기 요청은 요청한 User 가 owner 인 Snippet 만 조회하고, 없을 때만 pk, owner_id 를 조회해서 404, 403 을 구분하므로
+        owner 가 아닌 User 의 요청은 Snippet 의 내용을 읽지 않고 거부됨
+        수정은 저장된 HTML 조각(highlighted)을 조회하지 않고 (deferred 필드는 save() 에서 저장하지 않음),
+        삭제는 owner_id 만 조회함, 확인 후에는 요청한 User 를 owner 로 사용함
+    """
+
+    def get_write_queryset(self, queryset):
+        if self.request.method == 'DELETE':
+            return queryset.only('owner')
+        return queryset.defer('highlighted')
+
+    def get_object(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return super().get_object()
+
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = get_object_or_404(queryset.filter(owner_id=self.request.user.pk), **filter_kwargs)
+        except Http404:
+            obj = get_object_or_404(queryset.only('owner'), **filter_kwargs)
+        self.check_object_permissions(self.request, obj)
+        # check_object_permissions() 를 통과했으므로 owner 는 요청한 User
+        obj.owner = self.request.user
+        return obj
+
+
+class OwnerSnippetListMixin(SnippetQuerySetMixin):
+    """
+    URL 의 User(owner_pk) 가 만든 Snippet 목록 (users/<owner_pk>/snippets/)
+        (owner, created) 인덱스 순서대로 읽는 키셋 페이지네이션을 사용하므로 뒤쪽 페이지도 같은 비용으로 조회되고,
+        User 가 있는지는 조회된 Snippet 이 없을 때만 확인함
+    """
+    queryset = Snippet.objects.all()
+    serializer_class = SnippetListSerializer
+    pagination_class = SnippetCursorPagination
+    owner_url_kwarg = 'owner_pk'
+
+    def get_owner_id(self):
+        try:
+            return int(self.kwargs[self.owner_url_kwarg])
+        except ValueError:
+            raise Http404
+
+    def get_queryset(self):
+        return super().get_queryset().filter(owner_id=self.get_owner_id())
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page and not User.objects.filter(pk=self.get_owner_id()).exists():
+            raise Http404
+        return page
@@ -1,10 +1,13 @@
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework.parsers import JSONParser
-from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import ValidationError
 
+from utils.parsers import get_json_parser
+from utils.renderers import get_json_renderer
+from ..conditional import snippet_condition
+from ..filters import filter_snippets
 from ..models import Snippet
-from ..serializers import SnippetListSerializer
+from ..serializers import SnippetListSerializer, get_field_options
 
 __all__ = (
     'snippet_list',
@@ -14,21 +17,29 @@ __all__ = (
 
 class JSONResponse(HttpResponse):
     def __init__(self, data, **kwargs):
-        content = JSONRenderer().render(data)
+        content = get_json_renderer().render(data)
         kwargs['content_type'] = 'application/json'
         super().__init__(content, **kwargs)
 
 
 @csrf_exempt
+@snippet_condition
 def snippet_list(request):
     if request.method == 'GET':
-        snippets = Snippet.objects.order_by('-created')
-        serializer = SnippetListSerializer(snippets, many=True)
-        json_data = JSONRenderer().render(serializer.data)
+        options = get_field_options(request.GET)
+        try:
+            snippets = filter_snippets(
+                Snippet.objects.for_serializer(SnippetListSerializer, **options).order_by('-created'),
+                request.GET,
+            )
+            serializer = SnippetListSerializer(snippets, many=True, **options)
+            json_data = get_json_renderer().render(serializer.data)
+        except ValidationError as exc:
+            return JSONResponse(exc.detail, status=400)
         return HttpResponse(json_data, content_type='application/json')
 
     elif request.method == 'POST':
-        data = JSONParser().parse(request)
+        data = get_json_parser().parse(request)
         serializer = SnippetListSerializer(data=data)
         if serializer.is_valid():
             serializer.save()
@@ -37,18 +48,25 @@ def snippet_list(request):
 
 
 @csrf_exempt
+@snippet_condition
 def snippet_detail(request, pk):
+    options = get_field_options(request.GET) if request.method == 'GET' else {}
     try:
-        snippet = Snippet.objects.get(pk=pk)
+        if options:
+            snippet = Snippet.objects.for_serializer(SnippetListSerializer, **options).get(pk=pk)
+        else:
+            snippet = Snippet.objects.select_related('owner').get(pk=pk)
+    except ValidationError as exc:
+        return JSONResponse(exc.detail, status=400)
     except Snippet.DoesNotExist:
         return HttpResponse(status=404)
 
     if request.method == 'GET':
-        serializer = SnippetListSerializer(snippet)
+        serializer = SnippetListSerializer(snippet, **options)
         return JSONResponse(serializer.data)
 
     elif request.method == 'PUT':
-        data = JSONParser().parse(request)
+        data = get_json_parser().parse(request)
         serializer = SnippetListSerializer(snippet, data=data)
         if serializer.is_valid():
             serializer.save()
@@ -56,7 +74,7 @@ def snippet_detail(request, pk):
         return JSONResponse(serializer.errors, status=400)
 
     elif request.method == 'PATCH':
-        data = JSONParser().parse(request)
+        data = get_json_parser().parse(request)
         serializer = SnippetListSerializer(snippet, data=data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -0,0 +1,40 @@
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+
+from ..export import EXPORT_FORMATS, get_export_queryset, iter_export
+from ..filters import parse_created
+
+__all__ = (
+    'snippet_export',
+)
+
+
+@require_safe
+def snippet_export(request, export_format):
+    """
+    Snippet 전체를 NDJSON 또는 CSV 로 스트리밍
+        ?owner=<User pk>&language=<language>&created_after=<ISO 8601>&created_before=<ISO 8601>
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise Http404
+
+    filters = {'language': request.GET.get('language')}
+    owner = request.GET.get('owner')
+    if owner is not None:
+        try:
+            filters['owner'] = int(owner)
+        except ValueError:
+            return HttpResponseBadRequest('owner must be an integer')
+    for name in ('created_after', 'created_before'):
+        value = request.GET.get(name)
+        if value is not None:
+            filters[name] = parse_created(value)
+            if filters[name] is None:
+                return HttpResponseBadRequest(f'{name} must be an ISO 8601 date or datetime')
+
+    response = StreamingHttpResponse(
+        iter_export(get_export_queryset(**filters), export_format),
+        content_type=EXPORT_FORMATS[export_format][1],
+    )
+    response['Content-Disposition'] = f'attachment; filename="snippets.{export_format}"'
+    return response
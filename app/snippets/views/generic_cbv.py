@@ -1,13 +1,17 @@
 from django.contrib.auth import get_user_model
+from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions
 
-from utils.paginations import SnippetListPagination
+from utils.paginations import SnippetCachedCountPagination
+from .base import FieldSelectionMixin, OwnerSnippetListMixin, SnippetQuerySetMixin
+from ..filters import SnippetFilterBackend
+from ..conditional import snippet_condition
 from ..models import Snippet
 from ..serializers import (
     SnippetDetailSerializer,
     SnippetListSerializer,
 )
-from ..serializers.users import UserListSerializer
+from ..serializers.users import UserDetailSerializer
 
 User = get_user_model()
 
@@ -16,13 +20,16 @@ __all__ = (
     'SnippetDetail',
     'UserList',
     'UserDetail',
+    'UserSnippetList',
 )
 
 
-class SnippetList(generics.ListCreateAPIView):
+@method_decorator(snippet_condition, name='dispatch')
+class SnippetList(SnippetQuerySetMixin, generics.ListCreateAPIView):
     queryset = Snippet.objects.all()
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
-    pagination_class = SnippetListPagination
+    pagination_class = SnippetCachedCountPagination
+    filter_backends = (SnippetFilterBackend,)
 
     def get_serializer_class(self):
         # GET, POST요청 (List, Create)시마다 다른 Serializer를 쓰도록
@@ -39,7 +46,8 @@ class SnippetList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class SnippetDetail(generics.RetrieveUpdateDestroyAPIView):
+@method_decorator(snippet_condition, name='dispatch')
+class SnippetDetail(SnippetQuerySetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Snippet.objects.all()
     serializer_class = SnippetDetailSerializer
     permission_classes = (
@@ -48,11 +56,15 @@ class SnippetDetail(generics.RetrieveUpdateDestroyAPIView):
     )
 
 
-class UserList(generics.ListAPIView):
+class UserList(FieldSelectionMixin, generics.ListAPIView):
     queryset = User.objects.all()
-    serializer_class = UserListSerializer
+    serializer_class = UserDetailSerializer
 
 
-class UserDetail(generics.RetrieveAPIView):
+class UserDetail(FieldSelectionMixin, generics.RetrieveAPIView):
     queryset = User.objects.all()
-    serializer_class = UserListSerializer
+    serializer_class = UserDetailSerializer
+
+
+class UserSnippetList(OwnerSnippetListMixin, generics.ListAPIView):
+    pass
@@ -1,5 +1,9 @@
+from django.utils.decorators import method_decorator
 from rest_framework import mixins, generics
 
+from .base import SnippetQuerySetMixin
+from ..filters import SnippetFilterBackend
+from ..conditional import snippet_condition
 from ..models import Snippet
 from ..serializers import SnippetListSerializer
 
@@ -9,11 +13,14 @@ __all__ = (
 )
 
 
-class SnippetList(mixins.ListModelMixin,
+@method_decorator(snippet_condition, name='dispatch')
+class SnippetList(SnippetQuerySetMixin,
+                  mixins.ListModelMixin,
                   mixins.CreateModelMixin,
                   generics.GenericAPIView):
     queryset = Snippet.objects.all()
     serializer_class = SnippetListSerializer
+    filter_backends = (SnippetFilterBackend,)
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
@@ -22,7 +29,9 @@ class SnippetList(mixins.ListModelMixin,
         return self.create(request, *args, **kwargs)
 
 
-class SnippetDetail(mixins.RetrieveModelMixin,
+@method_decorator(snippet_condition, name='dispatch')
+class SnippetDetail(SnippetQuerySetMixin,
+                    mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
                     mixins.DestroyModelMixin,
                     generics.GenericAPIView):
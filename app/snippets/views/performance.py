@@ -0,0 +1,18 @@
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from ..performance import get_performance_stats
+
+__all__ = (
+    'performance_stats',
+)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def performance_stats(request):
+    """
+    route 별 요청 처리 시간 히스토그램 (SNIPPETS_PERFORMANCE['ENABLED'] 가 True 일 때 수집됨)
+    """
+    return Response(get_performance_stats())
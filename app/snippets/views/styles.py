@@ -0,0 +1,28 @@
+from django.http import Http404, HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+
+from ..highlight import get_style_sheets
+
+__all__ = (
+    'style_sheet',
+)
+
+
+def style_sheet_etag(request, style):
+    style_sheet = get_style_sheets().get(style)
+    return style_sheet[1] if style_sheet else None
+
+
+@require_safe
+@cache_control(public=True, max_age=60 * 60 * 24)
+@condition(etag_func=style_sheet_etag)
+def style_sheet(request, style):
+    """
+    HTML 조각(Snippet.highlighted)에 적용할 style 별 CSS
+    """
+    try:
+        css = get_style_sheets()[style][0]
+    except KeyError:
+        raise Http404
+    return HttpResponse(css, content_type='text/css')
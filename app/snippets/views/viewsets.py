@@ -1,25 +1,178 @@
 from django.contrib.auth import get_user_model
-from rest_framework import viewsets, permissions
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.decorators import method_decorator
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.renderers import StaticHTMLRenderer
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
 from snippets.permissions import IsOwnerOrReadOnly
+from utils.paginations import SnippetCursorPagination, SnippetSearchPagination
+from utils.parsers import FastJSONParser, NDJSONParser
+from .base import FieldSelectionMixin, OwnerSnippetListMixin, SnippetOwnerWriteMixin
+from ..bulk import bulk_create_snippets, bulk_delete_snippets, bulk_update_snippets, get_bulk_options
+from ..conditional import get_snippet_state, snippet_condition
+from ..documents import get_document_variants, select_encoding
 from ..models import Snippet
-from ..serializers import UserListSerializer, SnippetListSerializer
+from ..filters import SnippetFilterBackend, get_filter_params
+from ..response_cache import CachedResponseMixin, get_snippet_list_scope
+from ..search import get_search_backend
+from ..serializers import (
+    UserDetailSerializer,
+    SnippetBulkSerializer,
+    SnippetDetailSerializer,
+    SnippetListSerializer,
+)
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(CachedResponseMixin, FieldSelectionMixin, viewsets.ReadOnlyModelViewSet):
+    response_cache_scope = 'user'
     queryset = User.objects.all()
-    serializer_class = UserListSerializer
+    serializer_class = UserDetailSerializer
 
 
-class SnippetViewSet(viewsets.ModelViewSet):
+class UserSnippetViewSet(OwnerSnippetListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    pass
+
+
+@method_decorator(snippet_condition, name='dispatch')
+class SnippetViewSet(CachedResponseMixin, SnippetOwnerWriteMixin, viewsets.ModelViewSet):
+    response_cache_scope = 'snippet'
     queryset = Snippet.objects.all()
     serializer_class = SnippetListSerializer
+    pagination_class = SnippetCursorPagination
+    filter_backends = (SnippetFilterBackend,)
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsOwnerOrReadOnly,
     )
 
+    def get_list_cache_scopes(self):
+        # 잘못된 필터 값은 400 을 리턴하므로 (캐시하지 않음) 전체 목록의 scope 를 사용
+        try:
+            owner_id = get_filter_params(self.request.query_params).get('owner_id')
+        except ValidationError:
+            owner_id = None
+        return [get_snippet_list_scope(owner_id)]
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
+
+    @action(detail=True, renderer_classes=(StaticHTMLRenderer,))
+    def highlight(self, request, *args, **kwargs):
+        """
+        하이라이트된 HTML 문서 (text/html)
+            Accept-Encoding 에 따라 미리 압축해서 캐시한 gzip, br 문서를 리턴하므로 요청마다 압축하지 않음
+            표현(압축 방식)별 강한 ETag 로 If-None-Match 조건부 GET 을 지원
+        """
+        # snippet_condition 에서 조회한 (version, modified) 를 다시 사용
+        state = get_snippet_state(request._request, kwargs[self.lookup_field])
+        variants = None if state is None else get_document_variants(int(kwargs[self.lookup_field]), *state)
+        if variants is None:
+            raise Http404
+
+        encoding = select_encoding(request.META.get('HTTP_ACCEPT_ENCODING'), variants)
+        content, etag = variants[encoding]
+        response = HttpResponse(content, content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return get_conditional_response(request._request, etag=etag, response=response)
+
+    @action(detail=False, pagination_class=SnippetSearchPagination)
+    def search(self, request, *args, **kwargs):
+        """
+        title, code 전문 검색 (관련도 순)
+            ?q=<검색어>&language=<language>&owner=<User pk>&page=<페이지>&page_size=<페이지 크기>
+            검색어는 공백으로 구분한 모든 단어를 포함하는 Snippet 을 찾고, 끝에 * 를 붙이면 prefix 검색
+        """
+        owner = request.query_params.get('owner')
+        if owner is not None:
+            try:
+                owner = int(owner)
+            except ValueError:
+                raise ValidationError({'owner': ['A valid integer is required.']})
+        results = get_search_backend().search(
+            request.query_params.get('q', ''),
+            self.get_queryset(),
+            language=request.query_params.get('language'),
+            owner=owner,
+        )
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post', 'patch', 'delete'],
+            parser_classes=(FastJSONParser, NDJSONParser))
+    def bulk(self, request, *args, **kwargs):
+        """
+        JSON 배열 또는 NDJSON 으로 여러 Snippet 을 한 번에 생성(POST), 수정(PATCH), 삭제(DELETE)
+            PATCH 항목에는 pk 가 있어야 하며, DELETE 는 pk 또는 {"pk": ...} 의 배열
+            항목별 결과({"status": ..., "data" 또는 "errors"})를 입력 순서대로 리턴
+        """
+        max_items = get_bulk_options()['MAX_ITEMS']
+        if request.method == 'DELETE':
+            return self.bulk_destroy(request, max_items)
+
+        partial = request.method == 'PATCH'
+        serializer = SnippetBulkSerializer(
+            child=SnippetDetailSerializer(),
+            data=request.data,
+            partial=partial,
+            max_length=max_items,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+        valid = [item for item in items if 'errors' not in item]
+
+        if partial:
+            updated = bulk_update_snippets(
+                [(item['pk'], item['data']) for item in valid], request.user,
+            )
+            instances = [updated.get(item.get('pk')) for item in items]
+            success_status = status.HTTP_200_OK
+        else:
+            created = iter(bulk_create_snippets([item['data'] for item in valid], request.user))
+            instances = [None if 'errors' in item else next(created) for item in items]
+            success_status = status.HTTP_201_CREATED
+
+        # 항목마다 serializer 를 만들면 필드(language, style 의 choices) 생성 비용이 반복되므로 한 번에 직렬화
+        data = iter(SnippetDetailSerializer(
+            [instance for instance in instances if instance is not None], many=True,
+        ).data)
+        results = []
+        for item, instance in zip(items, instances):
+            if 'errors' in item:
+                results.append({'status': status.HTTP_400_BAD_REQUEST, 'errors': item['errors']})
+            elif instance is None:
+                results.append({'status': status.HTTP_404_NOT_FOUND, 'pk': item['pk']})
+            else:
+                results.append({'status': success_status, 'data': next(data)})
+        return Response(results)
+
+    def bulk_destroy(self, request, max_items):
+        data = request.data
+        if not isinstance(data, list):
+            raise ValidationError('Expected a list of pks.')
+        if len(data) > max_items:
+            raise ValidationError(f'Ensure this field has no more than {max_items} elements.')
+        pks = [item.get('pk') if isinstance(item, dict) else item for item in data]
+        valid_pks = [pk for pk in pks if isinstance(pk, int) and not isinstance(pk, bool)]
+        deleted = bulk_delete_snippets(valid_pks, request.user)
+
+        results = []
+        for pk in pks:
+            if pk not in valid_pks:
+                results.append({'status': status.HTTP_400_BAD_REQUEST,
+                                'errors': {'pk': ['A valid integer is required.']}})
+            elif pk in deleted:
+                results.append({'status': status.HTTP_204_NO_CONTENT, 'pk': pk})
+            else:
+                results.append({'status': status.HTTP_404_NOT_FOUND, 'pk': pk})
+        return Response(results)
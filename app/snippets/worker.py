@@ -0,0 +1,153 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import django
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .highlight import get_highlight_cache, highlight_key, render_highlight
+from .models import Snippet
+from .response_cache import invalidate_snippet
+
+__all__ = (
+    'get_shared_executor',
+    'highlight_many',
+    'highlight_shared',
+    'highlight_pending',
+)
+
+# 하이라이트 결과에 영향을 주는 필드
+HIGHLIGHT_INPUT_FIELDS = Snippet.HIGHLIGHT_INPUT_FIELDS
+
+
+def _render(row):
+    """
+    프로세스 풀에서 실행되는 함수, (html, 실패여부)를 리턴
+    """
+    try:
+        return render_highlight(**row), False
+    except Exception:
+        return '', True
+
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor(max_workers=None):
+    """
+    웹 프로세스에서 함께 사용하는 프로세스 풀 (처음 사용할 때 한 번만 만들고, 크기는 그때의 max_workers 로 정해짐)
+        요청을 처리하는 스레드가 있는 프로세스를 fork 하지 않도록 forkserver 로 워커 프로세스를 만듦
+        (fork 하지 않은 워커 프로세스는 _render 를 import 하기 전에 Django 설정을 먼저 읽어야 함)
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context('forkserver'),
+                    initializer=django.setup,
+                )
+    return _shared_executor
+
+
+def reset_shared_executor(executor):
+    """
+    워커 프로세스가 비정상 종료되어 더이상 사용할 수 없는 풀을 버림 (다음 get_shared_executor() 에서 새로 만듦)
+    """
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is executor:
+            _shared_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def highlight_shared(inputs, max_workers=None, min_parallel=1):
+    """
+    웹 프로세스에서 함께 사용하는 프로세스 풀로 highlight_many()
+        워커 프로세스가 종료되어(메모리 부족, lexer 의 segfault 등) 풀이 깨졌으면 새 풀로 한 번 다시 실행하고,
+        다시 실패하면 그 풀도 버리고 예외를 그대로 발생시킴 (다음 요청은 새 풀을 사용)
+    """
+    executor = get_shared_executor(max_workers)
+    try:
+        return highlight_many(inputs, executor=executor, min_parallel=min_parallel)
+    except BrokenProcessPool:
+        reset_shared_executor(executor)
+    executor = get_shared_executor(max_workers)
+    try:
+        return highlight_many(inputs, executor=executor, min_parallel=min_parallel)
+    except BrokenProcessPool:
+        reset_shared_executor(executor)
+        raise
+
+
+def highlight_many(inputs, executor=None, min_parallel=1):
+    """
+    여러 입력(code, language, linenos)을 하이라이트
+        캐시에 있는 결과는 재사용하고, 없는 항목만 executor(프로세스 풀)에서 렌더링한 후 캐시에 저장
+        executor 가 None 이거나 렌더링할 항목이 min_parallel 개보다 적으면 현재 프로세스에서 처리
+        (Snippet.save() 와 같은 render_highlight() 를 사용하므로 결과가 같음)
+    :return: 입력과 같은 순서의 (html, 실패여부) list
+    """
+    cache = get_highlight_cache()
+    keys = [highlight_key(**item) for item in inputs]
+    results = [cache.get(key) for key in keys]
+    results = [(html, False) if html is not None else None for html in results]
+
+    # 캐시에 없는 항목만 렌더링
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        jobs = [inputs[index] for index in missing]
+        if executor is None or len(jobs) < min_parallel:
+            rendered = map(_render, jobs)
+        else:
+            rendered = executor.map(_render, jobs)
+        for index, result in zip(missing, rendered):
+            if not result[1]:
+                cache.set(keys[index], result[0])
+            results[index] = result
+    return results
+
+
+def highlight_pending(batch_size=100, executor=None):
+    """
+    highlight_status 가 pending 인 Snippet 을 하이라이트하고 결과를 기록
+        DB의 pending 행들이 작업 큐 역할을 함
+        executor 가 None 이면 프로세스 풀 없이 현재 프로세스에서 처리
+    :return: 결과를 기록한 Snippet 수
+    """
+    rows = list(
+        Snippet.objects
+        .filter(highlight_status=Snippet.HIGHLIGHT_PENDING)
+        .order_by('pk')
+        .values('pk', 'owner_id', *HIGHLIGHT_INPUT_FIELDS)[:batch_size]
+    )
+    if not rows:
+        return 0
+
+    inputs = [{field: row[field] for field in HIGHLIGHT_INPUT_FIELDS} for row in rows]
+    results = highlight_many(inputs, executor=executor)
+
+    written = 0
+    for row, item, (html, failed) in zip(rows, inputs, results):
+        # 작업 도중 내용이 수정된 경우에는 기록하지 않음 (다음 작업에서 다시 처리됨)
+        updated = Snippet.objects.filter(
+            pk=row['pk'],
+            highlight_status=Snippet.HIGHLIGHT_PENDING,
+            **item
+        ).update(
+            highlighted=html,
+            highlight_status=Snippet.HIGHLIGHT_FAILED if failed else Snippet.HIGHLIGHT_DONE,
+            version=F('version') + 1,
+            modified=timezone.now(),
+        )
+        if updated:
+            # update() 는 signal 을 발생시키지 않으므로 캐시된 응답을 직접 무효화
+            transaction.on_commit(partial(invalidate_snippet, row['pk'], row['owner_id']))
+        written += updated
+    return written
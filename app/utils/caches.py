@@ -0,0 +1,14 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+__all__ = (
+    'is_process_local',
+)
+
+
+def is_process_local(alias):
+    """
+    alias 의 캐시가 프로세스마다 따로 저장되는 캐시(LocMemCache)인지 여부
+        여러 워커 프로세스나 management 명령과 값을 공유해야 하는 기능(무효화, 통계)에는 사용할 수 없음
+    """
+    return isinstance(caches[alias], LocMemCache)
@@ -1,5 +1,181 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from urllib import parse
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from snippets.counters import estimate_snippet_count, get_snippet_count
 
 
 class SnippetListPagination(PageNumberPagination):
     page_size = 3
+
+
+class SnippetSearchPagination(SnippetListPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CountedPaginator(DjangoPaginator):
+    """
+    count 를 미리 알고 있으면 COUNT(*) 를 실행하지 않는 Paginator
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            # cached_property 인 count 를 전달받은 값으로 대체
+            self.count = count
+
+
+class SnippetCachedCountPagination(SnippetListPagination):
+    """
+    count 를 COUNT(*) 대신 캐시된 개수로 제공하는 페이지네이션
+        ?count=exact     : COUNT(*) 로 정확한 개수
+        ?count=estimated : DB 통계로 추정한 개수 (전체 목록에만 적용)
+        (지정하지 않음)  : Snippet 생성/삭제 signal 로 유지되는 전체/owner 별 개수
+    queryset 이 owner 로만 필터링된 경우 view 의 get_count_owner() 가 owner 의 pk 를 리턴해야 하며,
+    그 외의 조건으로 필터링된 queryset 은 정확한 개수를 사용
+    """
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = self.get_count(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(queryset, page_size, count=self.count)
+
+    def get_count(self, queryset, request, view=None):
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'exact':
+            return None
+
+        get_count_owner = getattr(view, 'get_count_owner', None)
+        owner_id = get_count_owner() if get_count_owner else None
+        if owner_id is not None:
+            return get_snippet_count(owner_id)
+        if queryset.query.has_filters():
+            return None
+        if mode == 'estimated':
+            return estimate_snippet_count()
+        return get_snippet_count()
+
+
+class SnippetCursorPagination(BasePagination):
+    """
+    (created, pk) 키셋 기반 커서 페이지네이션
+        COUNT(*) 와 OFFSET 없이 마지막으로 전달한 행의 (created, pk) 이후부터 조회하므로
+        뒤쪽 페이지도 첫 페이지와 같은 비용으로 조회됨 (Snippet.Meta.indexes 의 (created, id) 인덱스 사용)
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    page_size = 3
+    # 클라이언트가 page_size 를 지정할 수 있지만 max_page_size 를 넘을 수 없음
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            created, pk, reverse = None, None, False
+        else:
+            created, pk, reverse = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by('created', 'pk')
+            if created is not None:
+                queryset = queryset.filter(created__gte=created).filter(
+                    Q(created__gt=created) | Q(created=created, pk__gt=pk)
+                )
+        else:
+            queryset = queryset.order_by('-created', '-pk')
+            if created is not None:
+                # created__lte 는 인덱스 범위 검색을 위해 추가한 조건
+                queryset = queryset.filter(created__lte=created).filter(
+                    Q(created__lt=created) | Q(created=created, pk__lt=pk)
+                )
+
+        # only() 로 created 컬럼이 제외된 queryset 에서도 커서를 만들 수 있도록 함께 조회
+        queryset = queryset.annotate(cursor_created=F('created'))
+
+        # 다음 페이지가 있는지 알기 위해 한 개를 더 조회
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = self.cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+                if page_size > 0:
+                    return min(page_size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            created = parse_datetime(tokens['c'][0])
+            pk = int(tokens['p'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if created is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created, pk, reverse
+
+    def encode_cursor(self, instance, reverse):
+        # values() 로 조회한 페이지는 행이 dict
+        if isinstance(instance, dict):
+            created, pk = instance['cursor_created'], instance['pk']
+        else:
+            created, pk = instance.cursor_created, instance.pk
+        tokens = {'c': created.isoformat(), 'p': pk}
+        if reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
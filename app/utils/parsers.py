@@ -0,0 +1,82 @@
+import codecs
+import io
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser, get_encoding
+from rest_framework.settings import api_settings
+
+from .renderers import is_plain
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = (
+    'FastJSONParser',
+    'NDJSONParser',
+    'get_json_parser',
+)
+
+
+class FastJSONParser(JSONParser):
+    """
+    orjson 이 설치되어 있으면 orjson 으로 JSON 요청을 읽는 JSONParser (없으면 JSONParser 와 같음)
+        orjson 이 읽을 수 없는 요청(잘못된 JSON 등)과 float 가 있는 요청(orjson 은 64bit 를 넘는 정수를 float 로 읽음)은
+        JSONParser 로 다시 읽으므로 결과와 오류 메시지는 JSONParser 와 같음
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if (orjson is None or not self.strict
+                or codecs.lookup(get_encoding(parser_context)).name != 'utf-8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            data = None
+        else:
+            if is_plain(data):
+                return data
+        return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class NDJSONParser(BaseParser):
+    """
+    한 줄에 하나의 JSON 값이 있는 NDJSON 요청을 list 로 변환 (빈 줄은 무시)
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line.decode(encoding)))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error - line {number}: {exc}')
+        return items
+
+
+@lru_cache(maxsize=None)
+def get_parser(parser_class):
+    return parser_class()
+
+
+def get_json_parser():
+    """
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] 의 JSON parser (APIView 를 사용하지 않는 view 용)
+    """
+    for parser_class in api_settings.DEFAULT_PARSER_CLASSES:
+        if parser_class.media_type == 'application/json':
+            return get_parser(parser_class)
+    return get_parser(JSONParser)
@@ -0,0 +1,87 @@
+from functools import lru_cache
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from snippets.performance import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = (
+    'FastJSONRenderer',
+    'get_json_renderer',
+)
+
+
+def is_plain(data):
+    """
+    data 가 str, int, bool, None 과 이를 담은 dict, list, tuple 로만 이루어졌는지 확인
+        orjson 과 json 모듈은 float 의 표현(1e16 / 1e+16)과 NaN 처리가 다르고,
+        그 외의 값(datetime, Decimal 등)은 encoder_class 가 float 로 변환할 수 있으므로 json 모듈로 처리해야 함
+        문자열의 길이와 관계없이 값의 개수에만 비례하는 비용으로 확인함
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is str or value_type is int or value_type is bool or value is None:
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif not isinstance(value, (str, int)):
+            return False
+    return True
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson 이 설치되어 있으면 orjson 으로 JSON 을 만드는 JSONRenderer (없으면 JSONRenderer 와 같음)
+        출력은 JSONRenderer 와 byte 단위로 같음
+        - str, int, bool, None 과 dict, list 로만 이루어진 값만 orjson 으로 처리하고,
+          float, datetime 등 다른 값이 있거나 기본 설정(compact, UTF-8, strict)이 아니면 JSONRenderer 로 처리
+        - orjson 이 처리할 수 없는 값(64bit 를 넘는 정수, 문자열이 아닌 dict 키 등)도 JSONRenderer 로 처리
+    """
+    # JSONRenderer 와 같이 JavaScript 에서 줄바꿈으로 처리되는 U+2028, U+2029 를 escape 함
+    line_separator_replacements = (
+        ('\u2028'.encode('utf-8'), b'\\u2028'),
+        ('\u2029'.encode('utf-8'), b'\\u2029'),
+    )
+
+    @timed('render')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if (self.get_indent(accepted_media_type, renderer_context) is not None
+                or self.ensure_ascii or not self.compact or not self.strict
+                or not is_plain(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for value, escaped in self.line_separator_replacements:
+            ret = ret.replace(value, escaped)
+        return ret
+
+
+@lru_cache(maxsize=None)
+def get_renderer(renderer_class):
+    return renderer_class()
+
+
+def get_json_renderer():
+    """
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] 의 JSON renderer (APIView 를 사용하지 않는 view 용)
+        renderer 는 상태가 없으므로 응답마다 새로 만들지 않음
+    """
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if renderer_class.format == 'json':
+            return get_renderer(renderer_class)
+    return get_renderer(JSONRenderer)